@@ -0,0 +1,25 @@
+# Generated by Django 4.2.17 on 2026-10-17 03:11
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0001_initial'),
+        ('accounts', '0010_emailverificationtoken'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='city_ref',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='locations.city'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='district_ref',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='locations.district'),
+        ),
+    ]
@@ -95,6 +95,9 @@ class User(AbstractBaseUser, PermissionsMixin):
     profile_image = models.ImageField(upload_to='profiles/', null=True, blank=True)
     city = models.CharField(max_length=100, blank=True, default='')
     district = models.CharField(max_length=100, blank=True, default='')
+    # Canonical location resolved from city/district (see apps.locations)
+    city_ref = models.ForeignKey('locations.City', on_delete=models.SET_NULL, null=True, blank=True, editable=False, related_name='+')
+    district_ref = models.ForeignKey('locations.District', on_delete=models.SET_NULL, null=True, blank=True, editable=False, related_name='+')
 
     is_staff = models.BooleanField(default=False)
     is_active = models.BooleanField(default=True)
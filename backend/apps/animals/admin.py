@@ -3,7 +3,8 @@ Admin configuration for animals app.
 """
 
 from django.contrib import admin
-from .models import AnimalListing, AnimalImage
+from .models import AnimalListing, AnimalImage, ArchivedListing
+from .archive import restore_listings
 
 
 @admin.register(AnimalListing)
@@ -83,3 +84,25 @@ class AnimalImageAdmin(admin.ModelAdmin):
     search_fields = ('listing__breed', 'listing__location')
     ordering = ('-created_at',)
     readonly_fields = ('created_at',)
+
+
+@admin.register(ArchivedListing)
+class ArchivedListingAdmin(admin.ModelAdmin):
+    """
+    Admin interface for archived listings; the snapshots are read-only.
+    """
+    
+    list_display = ('id', 'seller', 'created_at', 'archived_at')
+    list_filter = ('created_at', 'archived_at')
+    search_fields = ('seller__username', 'seller__email')
+    ordering = ('-created_at',)
+    readonly_fields = ('id', 'seller', 'created_at', 'archived_at', 'listing', 'images', 'related')
+    actions = ['restore']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    @admin.action(description='Seçili ilanları geri yükle')
+    def restore(self, request, queryset):
+        restored = restore_listings(queryset.values_list('pk', flat=True))
+        self.message_user(request, f"{restored} ilan geri yüklendi.")
@@ -0,0 +1,235 @@
+"""
+Archiving of old listings out of the live AnimalListing table.
+
+Listings created before a cutoff (LISTING_ARCHIVE_AFTER_DAYS, one Bayram
+season by default) are moved to ArchivedListing together with their
+images, favorites and interactions. Rows are stored in Django's
+serialization format, and their search documents are dropped. The live
+table and its indexes then only hold current seasons.
+
+Listings with conversations stay live: deleting the listing would cascade
+to the chat, and buyers and sellers keep their inbox history.
+
+Archived ids still resolve: listing detail and image list requests fall
+back to the archive (read-only). restore_listings() puts every row back
+under its original id. Appointments and partnerships pointing at the
+listing are relinked on restore, and the search document is rebuilt.
+Image files are never released by either move.
+
+Postgres table partitioning was considered instead. Django can't declare
+partitioned tables or foreign keys into them, and development runs on
+SQLite, so the archive is a plain table.
+"""
+
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import serializers
+from django.db import transaction
+from django.utils import timezone
+
+from apps.butchers.models import Appointment
+from apps.favorites.models import Favorite
+from apps.messages.models import Conversation, Message
+from apps.partnerships.models import PartnershipListing
+from apps.recommendations.models import ListingInteraction
+from .models import AnimalImage, AnimalListing, ArchivedListing
+from .signals import keep_image_files
+
+ARCHIVE_CHUNK_SIZE = 200
+
+
+def archive_cutoff(days: Optional[int] = None):
+    """Listings created before this are archived (default: LISTING_ARCHIVE_AFTER_DAYS ago)."""
+    if days is None:
+        days = settings.LISTING_ARCHIVE_AFTER_DAYS
+    return timezone.now() - timedelta(days=days)
+
+
+def archivable_listings(before, inactive_only: bool = False):
+    """
+    Live listings created before `before` that nobody has messaged about;
+    only soft-deleted ones with inactive_only.
+    """
+    queryset = AnimalListing.objects.filter(created_at__lt=before, conversations__isnull=True)
+    if inactive_only:
+        queryset = queryset.filter(is_active=False)
+    return queryset
+
+
+def _snapshots(queryset, key: str) -> Dict[int, List[dict]]:
+    """Serialized rows of `queryset` grouped by the value of field `key`."""
+    grouped: Dict[int, List[dict]] = {}
+    for row in serializers.serialize('python', queryset.order_by('pk')):
+        grouped.setdefault(row['fields'][key], []).append(row)
+    return grouped
+
+
+def _linked_ids(queryset, key: str) -> Dict[int, List[int]]:
+    grouped: Dict[int, List[int]] = {}
+    for listing_id, pk in queryset.order_by('pk').values_list(key, 'pk'):
+        grouped.setdefault(listing_id, []).append(pk)
+    return grouped
+
+
+def archive_listings(ids: Iterable[int]) -> int:
+    """
+    Move the listings with `ids` and their related rows to the archive.
+
+    Listings with conversations are skipped (see the module docstring).
+    One transaction; buffered views should be flushed first (see the
+    archive_listings command). Returns the number of listings archived.
+    """
+    ids = list(ids)
+    with transaction.atomic():
+        listings = serializers.serialize('python', AnimalListing.objects.filter(
+            pk__in=ids, conversations__isnull=True
+        ).order_by('pk'))
+        ids = [row['pk'] for row in listings]
+        if not ids:
+            return 0
+
+        images = _snapshots(AnimalImage.objects.filter(listing_id__in=ids), 'listing')
+        favorites = _snapshots(Favorite.objects.filter(animal_id__in=ids), 'animal')
+        interactions = _snapshots(ListingInteraction.objects.filter(listing_id__in=ids), 'listing')
+        appointments = _linked_ids(Appointment.objects.filter(listing_id__in=ids), 'listing_id')
+        partnerships = _linked_ids(PartnershipListing.objects.filter(animal_id__in=ids), 'animal_id')
+
+        ArchivedListing.objects.bulk_create([
+            ArchivedListing(
+                id=row['pk'],
+                seller_id=row['fields']['seller'],
+                created_at=row['fields']['created_at'],
+                listing=row,
+                images=images.get(row['pk'], []),
+                related={
+                    'favorites': favorites.get(row['pk'], []),
+                    'interactions': interactions.get(row['pk'], []),
+                    'appointments': appointments.get(row['pk'], []),
+                    'partnerships': partnerships.get(row['pk'], []),
+                },
+            )
+            for row in listings
+        ])
+        # Cascades to images, search documents, favorites and interactions;
+        # appointments/partnerships are unlinked (SET_NULL)
+        with keep_image_files():
+            AnimalListing.objects.filter(pk__in=ids).delete()
+    return len(ids)
+
+
+def _restorable(objects, user_ids) -> list:
+    """
+    Deserialized rows minus those whose users were deleted meanwhile.
+
+    Nullable user references are cleared instead (e.g. an interaction's
+    user); messages of dropped conversations are dropped too.
+    """
+    dropped_conversations = set()
+    kept = []
+    for obj in objects:
+        instance = obj.object
+        if isinstance(instance, Message) and instance.conversation_id in dropped_conversations:
+            continue
+        missing = [
+            field for field in instance._meta.concrete_fields
+            if field.is_relation and field.related_model is get_user_model()
+            and getattr(instance, field.attname) is not None
+            and getattr(instance, field.attname) not in user_ids
+        ]
+        if any(not field.null for field in missing):
+            if isinstance(instance, Conversation):
+                dropped_conversations.add(instance.pk)
+            continue
+        for field in missing:
+            setattr(instance, field.attname, None)
+        kept.append(obj)
+    return kept
+
+
+def restore_listing(archived: ArchivedListing) -> None:
+    """
+    Recreate an archived listing and its rows (caller deletes the archive row).
+
+    Conversations and messages are only present in listings archived before
+    listings with conversations were skipped.
+    """
+    related = archived.related
+    rows = [
+        archived.listing,
+        *archived.images,
+        *related.get('favorites', []),
+        *related.get('interactions', []),
+        *related.get('conversations', []),
+        *related.get('messages', []),
+    ]
+    objects = list(serializers.deserialize('python', rows))
+    user_ids = set(get_user_model().objects.filter(
+        pk__in={
+            getattr(obj.object, field.attname)
+            for obj in objects
+            for field in obj.object._meta.concrete_fields
+            if field.is_relation and field.related_model is get_user_model()
+        }
+    ).values_list('pk', flat=True))
+
+    # Raw saves, like loaddata: timestamps are kept and no notifications
+    # go out; the listing's post_save rebuilds its search document
+    for obj in _restorable(objects, user_ids):
+        obj.save()
+
+    Appointment.objects.filter(
+        pk__in=related.get('appointments', []), listing__isnull=True
+    ).update(listing_id=archived.pk)
+    PartnershipListing.objects.filter(
+        pk__in=related.get('partnerships', []), animal__isnull=True
+    ).update(animal_id=archived.pk)
+
+
+def restore_listings(ids: Iterable[int]) -> int:
+    """Move archived listings back to the live table; returns how many were restored."""
+    with transaction.atomic():
+        archived = list(ArchivedListing.objects.filter(pk__in=list(ids)).order_by('pk'))
+        for listing in archived:
+            restore_listing(listing)
+        # The restored images own the files again
+        with keep_image_files():
+            ArchivedListing.objects.filter(pk__in=[listing.pk for listing in archived]).delete()
+    return len(archived)
+
+
+def find_archived(pk) -> Optional[ArchivedListing]:
+    """The archived listing with id `pk`, if any (non-numeric ids match nothing)."""
+    try:
+        pk = int(pk)
+    except (TypeError, ValueError):
+        return None
+    return ArchivedListing.objects.filter(pk=pk).first()
+
+
+def _deserialize(row: dict):
+    return next(serializers.deserialize('python', [row])).object
+
+
+def archived_listing_instance(archived: ArchivedListing) -> AnimalListing:
+    """
+    Unsaved AnimalListing with the archived values, for serializing.
+
+    It carries the with_image_summary() attributes, so serializers don't
+    query images, and is_active is False: archived listings are read-only.
+    """
+    listing = _deserialize(archived.listing)
+    images = archived_image_instances(archived)
+    primary = min(images, key=lambda image: not image.is_primary, default=None)
+    listing.primary_image_variants = primary.variants if primary else None
+    listing.image_count = len(images)
+    listing.is_active = False
+    return listing
+
+
+def archived_image_instances(archived: ArchivedListing) -> List[AnimalImage]:
+    """Unsaved AnimalImage objects of an archived listing, in display order."""
+    images = [_deserialize(row) for row in archived.images]
+    return sorted(images, key=lambda image: (image.order, image.created_at))
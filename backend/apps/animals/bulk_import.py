@@ -0,0 +1,291 @@
+"""
+Bulk listing import for sellers with many animals.
+
+Uploads are CSV (header row of field names, ',' or ';' separated) or a
+JSON array of objects with the same keys AnimalListingSerializer takes.
+Both are parsed incrementally, CSV line by line and JSON one array element
+at a time, so a 10k-row file is never held in memory.
+
+Rows are handled in chunks of IMPORT_CHUNK_SIZE:
+- field validation with one AnimalListingImportSerializer reused for
+  every row
+- one ear_tag_no IN (...) query for the whole chunk, plus a set of the
+  tags already seen in the file
+- one bulk_create for the listings and one for their search documents,
+  with location refs resolved in memory
+- saved-search notifications matched for the whole chunk at once
+
+Invalid rows are reported by row number and don't stop the import.
+"""
+
+import codecs
+import csv
+import json
+import re
+from itertools import chain, islice
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+from django.db import IntegrityError, transaction
+from rest_framework import serializers
+
+from apps.locations.lookup import location_index
+from .models import AnimalListing, ListingSearchDocument
+from .saved_searches import notify_saved_search_matches_bulk
+from .search import build_document_fields
+from .serializers import AnimalListingImportSerializer
+
+IMPORT_CHUNK_SIZE = 500
+MAX_IMPORT_ROWS = 10000
+MAX_REPORTED_ERRORS = 500
+READ_SIZE = 64 * 1024
+
+CSV = 'csv'
+JSON = 'json'
+
+DUPLICATE_EAR_TAG = "Bu kulak numarası zaten kullanılıyor."
+
+_WHITESPACE = re.compile(r'\s*')
+
+
+class ImportFormatError(Exception):
+    """The upload can't be read as CSV or a JSON array."""
+
+
+def iter_csv_rows(stream) -> Iterator[dict]:
+    """Rows of a UTF-8 CSV file as dicts; empty cells are left out."""
+    reader = codecs.getreader('utf-8-sig')(stream)
+    try:
+        header = reader.readline()
+        if not header.strip():
+            return
+        delimiter = ';' if header.count(';') > header.count(',') else ','
+        rows = csv.reader(chain([header], reader), delimiter=delimiter)
+        names = [name.strip() for name in next(rows)]
+        for values in rows:
+            if not any(value.strip() for value in values):
+                continue
+            yield {
+                name: value.strip()
+                for name, value in zip(names, values)
+                if name and value.strip()
+            }
+    except (csv.Error, UnicodeDecodeError) as e:
+        raise ImportFormatError(f"CSV okunamadı: {e}")
+
+
+def iter_json_objects(stream, read_size: int = READ_SIZE) -> Iterator:
+    """
+    Elements of a top-level JSON array, decoded one at a time.
+
+    Reads `read_size` bytes at a time and runs raw_decode at the current
+    position, so only the unparsed tail of the input is buffered.
+    """
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder('utf-8-sig')()
+    buffer, pos, eof = '', 0, False
+
+    def read_more():
+        nonlocal buffer, pos, eof
+        if eof:
+            raise ImportFormatError("JSON dosyası beklenmedik şekilde bitti.")
+        chunk = stream.read(read_size)
+        eof = not chunk
+        try:
+            buffer = buffer[pos:] + text.decode(chunk or b'', final=eof)
+        except UnicodeDecodeError as e:
+            raise ImportFormatError(f"JSON okunamadı: {e}")
+        pos = 0
+
+    def next_char() -> str:
+        nonlocal pos
+        while True:
+            pos = _WHITESPACE.match(buffer, pos).end()
+            if pos < len(buffer):
+                return buffer[pos]
+            read_more()
+
+    if next_char() != '[':
+        raise ImportFormatError("JSON verisi bir dizi olmalıdır.")
+    pos += 1
+    if next_char() == ']':
+        return
+
+    while True:
+        next_char()
+        try:
+            value, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError as e:
+            if eof:
+                raise ImportFormatError(f"JSON okunamadı: {e}")
+            # Most likely an element cut at the end of the buffer
+            read_more()
+            continue
+        if end == len(buffer) and not eof and not isinstance(value, (dict, list, str)):
+            # A number or literal touching the buffer end may continue in the next read
+            read_more()
+            continue
+        pos = end
+        yield value
+
+        separator = next_char()
+        pos += 1
+        if separator == ']':
+            return
+        if separator != ',':
+            raise ImportFormatError("JSON dizisi geçersiz.")
+
+
+def iter_import_rows(stream, format: str) -> Iterator:
+    if format == CSV:
+        return iter_csv_rows(stream)
+    if format == JSON:
+        return iter_json_objects(stream)
+    raise ImportFormatError("Desteklenen biçimler: csv, json")
+
+
+def detect_format(name: str = '', content_type: str = '') -> str:
+    """'csv' or 'json' from a file name or content type; '' if unknown."""
+    name, content_type = (name or '').lower(), (content_type or '').lower()
+    if name.endswith('.csv') or 'csv' in content_type:
+        return CSV
+    if name.endswith('.json') or 'json' in content_type:
+        return JSON
+    return ''
+
+
+class ImportReport:
+    """Counts and per-row errors of one import."""
+
+    def __init__(self):
+        self.created = 0
+        self.failed = 0
+        self.errors: List[dict] = []
+        self.truncated = False
+        self.format_error = None
+
+    def add_error(self, row: int, errors) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'row': row, 'errors': errors})
+
+    def as_dict(self, dry_run: bool = False) -> dict:
+        return {
+            'created': 0 if dry_run else self.created,
+            'valid': self.created,
+            'failed': self.failed,
+            'errors': self.errors,
+            'errors_truncated': self.failed > len(self.errors),
+            # More than MAX_IMPORT_ROWS rows: the rest of the file was not read
+            'rows_truncated': self.truncated,
+            # Unreadable input stops the import; earlier chunks stay created
+            'format_error': self.format_error,
+            'dry_run': dry_run,
+        }
+
+
+def _validate_chunk(validator, chunk, report) -> List[Tuple[int, dict]]:
+    valid = []
+    for number, row in chunk:
+        if not isinstance(row, dict):
+            report.add_error(number, {'non_field_errors': ["Her satır bir nesne olmalıdır."]})
+            continue
+        try:
+            valid.append((number, validator.run_validation(row)))
+        except serializers.ValidationError as e:
+            report.add_error(number, serializers.as_serializer_error(e))
+    return valid
+
+
+def _taken_ear_tags(tags: Iterable[str]) -> Set[str]:
+    return set(AnimalListing.objects.filter(ear_tag_no__in=list(tags)).values_list('ear_tag_no', flat=True))
+
+
+def _check_ear_tags(valid, seen_tags: Set[str], report) -> List[Tuple[int, dict]]:
+    """Drop rows whose ear tag exists already or repeats one earlier in the file."""
+    taken = _taken_ear_tags({data['ear_tag_no'] for _, data in valid if data.get('ear_tag_no')})
+    unique = []
+    for number, data in valid:
+        tag = data.get('ear_tag_no')
+        if tag and (tag in taken or tag in seen_tags):
+            report.add_error(number, {'ear_tag_no': [DUPLICATE_EAR_TAG]})
+            continue
+        if tag:
+            seen_tags.add(tag)
+        unique.append((number, data))
+    return unique
+
+
+def _build_listing(seller, data: dict) -> AnimalListing:
+    listing = AnimalListing(seller=seller, **data)
+    # bulk_create skips the pre_save signal that resolves these
+    listing.city_ref_id, listing.district_ref_id = location_index.resolve(listing.city, listing.district)
+    return listing
+
+
+def _insert_chunk(seller, valid, report) -> List[AnimalListing]:
+    """
+    Insert a validated chunk with its search documents.
+
+    A concurrent request can take an ear tag after the check; the chunk is
+    then rechecked once and retried without the conflicting rows.
+    """
+    for attempt in range(2):
+        listings = [_build_listing(seller, data) for _, data in valid]
+        try:
+            with transaction.atomic():
+                AnimalListing.objects.bulk_create(listings)
+                ListingSearchDocument.objects.bulk_create([
+                    ListingSearchDocument(listing=listing, **build_document_fields(listing))
+                    for listing in listings
+                ])
+        except IntegrityError:
+            if attempt:
+                for number, _ in valid:
+                    report.add_error(number, {'non_field_errors': ["Kayıt sırasında çakışma oluştu, tekrar deneyin."]})
+                return []
+            taken = _taken_ear_tags({data['ear_tag_no'] for _, data in valid if data.get('ear_tag_no')})
+            for number, data in valid:
+                if data.get('ear_tag_no') in taken:
+                    report.add_error(number, {'ear_tag_no': [DUPLICATE_EAR_TAG]})
+            valid = [(number, data) for number, data in valid if data.get('ear_tag_no') not in taken]
+            continue
+        report.created += len(listings)
+        return listings
+    return []
+
+
+def import_listings(seller, rows: Iterable, dry_run: bool = False,
+                    chunk_size: int = IMPORT_CHUNK_SIZE) -> Dict[str, object]:
+    """
+    Validate and create listings for `seller` from an iterable of row dicts.
+
+    Rows are numbered from 1; at most MAX_IMPORT_ROWS are read. With
+    dry_run nothing is written and `valid` tells how many rows would be
+    created. Returns the import report.
+    """
+    report = ImportReport()
+    validator = AnimalListingImportSerializer()
+    seen_tags: Set[str] = set()
+    # One row past the limit tells whether the file was longer
+    numbered = enumerate(islice(rows, MAX_IMPORT_ROWS + 1), start=1)
+
+    while report.format_error is None:
+        chunk = []
+        try:
+            chunk.extend(islice(numbered, chunk_size))
+        except ImportFormatError as e:
+            # Rows before the unreadable part are still imported
+            report.format_error = str(e)
+        if not chunk:
+            break
+        if chunk[-1][0] > MAX_IMPORT_ROWS:
+            chunk.pop()
+            report.truncated = True
+
+        valid = _check_ear_tags(_validate_chunk(validator, chunk, report), seen_tags, report)
+        if dry_run:
+            report.created += len(valid)
+            continue
+        notify_saved_search_matches_bulk(_insert_chunk(seller, valid, report))
+
+    return report.as_dict(dry_run=dry_run)
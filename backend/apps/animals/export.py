@@ -0,0 +1,228 @@
+"""
+Streaming CSV/XLSX export of listings with their statistics.
+
+Listings are read with .values_list().iterator(), EXPORT_CHUNK_SIZE rows at
+a time. Each chunk gets its favorite, conversation and message counts from
+one grouped query per table (plus the view counter's buffered views), so
+a seller with thousands of listings costs a handful of queries per chunk
+instead of several per row, and only one chunk is ever in memory.
+
+Listing columns use the model field names, the same keys the bulk import
+takes; the statistics columns are ignored there, so an edited export can
+be imported back.
+
+XLSX is written without a spreadsheet library: a single worksheet of
+inline strings, zipped by zipfile into a write-only buffer that is drained
+after every chunk.
+"""
+
+import csv
+import decimal
+import re
+import zipfile
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List
+from xml.sax.saxutils import escape
+
+from django.db.models import Count
+from django.utils import timezone
+
+from apps.favorites.models import Favorite
+from apps.messages.models import Conversation, Message
+from .view_counter import view_counter
+
+EXPORT_CHUNK_SIZE = 1000
+
+CSV = 'csv'
+XLSX = 'xlsx'
+
+LISTING_COLUMNS = [
+    'id', 'title', 'species', 'animal_type', 'breed', 'gender', 'age_months',
+    'weight', 'price', 'city', 'district', 'location', 'ear_tag_no', 'company',
+    'is_active', 'created_at', 'view_count',
+]
+STATISTIC_COLUMNS = ['favorite_count', 'conversation_count', 'message_count']
+EXPORT_COLUMNS = LISTING_COLUMNS + STATISTIC_COLUMNS
+
+CONTENT_TYPES = {
+    CSV: 'text/csv; charset=utf-8',
+    XLSX: 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+# Control characters that are not allowed anywhere in XML 1.0
+_XML_INVALID = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+def _counts(queryset, key: str) -> Dict[int, int]:
+    """Row count per `key` value in one GROUP BY query."""
+    return dict(queryset.order_by().values(key).annotate(n=Count('pk')).values_list(key, 'n'))
+
+
+def listing_statistics(ids: List[int]) -> Dict[str, Dict[int, int]]:
+    """Favorite, conversation and message counts plus buffered views for `ids`."""
+    return {
+        'favorite_count': _counts(Favorite.objects.filter(animal_id__in=ids), 'animal_id'),
+        'conversation_count': _counts(Conversation.objects.filter(listing_id__in=ids), 'listing_id'),
+        'message_count': _counts(
+            Message.objects.filter(conversation__listing_id__in=ids), 'conversation__listing_id'
+        ),
+        'pending_views': view_counter.pending_many(ids),
+    }
+
+
+def iter_export_rows(queryset, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[list]:
+    """Values of EXPORT_COLUMNS per listing of `queryset`, in id order."""
+    rows = queryset.order_by('pk').values_list(*LISTING_COLUMNS).iterator(chunk_size=chunk_size)
+    views = LISTING_COLUMNS.index('view_count')
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        stats = listing_statistics([row[0] for row in chunk])
+        pending = stats['pending_views']
+        for row in chunk:
+            row = list(row)
+            row[views] = (row[views] or 0) + pending.get(row[0], 0)
+            row.extend(stats[column].get(row[0], 0) for column in STATISTIC_COLUMNS)
+            yield row
+
+
+def _text(value) -> str:
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if hasattr(value, 'tzinfo'):
+        return timezone.localtime(value).strftime('%Y-%m-%d %H:%M:%S')
+    return str(value)
+
+
+class _Echo:
+    """File-like object whose write() returns the line for the caller to yield."""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(rows: Iterable[list], chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[bytes]:
+    """UTF-8 CSV with a header row; the BOM makes Excel read Turkish characters."""
+    writer = csv.writer(_Echo())
+    yield ('\ufeff' + writer.writerow(EXPORT_COLUMNS)).encode()
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        yield ''.join(writer.writerow([_text(value) for value in row]) for row in chunk).encode()
+
+
+_XLSX_PARTS = {
+    '[Content_Types].xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/workbook.xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="İlanlar" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        '</Relationships>'
+    ),
+}
+
+_SHEET_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+_SHEET_END = '</sheetData></worksheet>'
+
+
+def _xlsx_cell(value) -> str:
+    if value is None:
+        return '<c/>'
+    if isinstance(value, bool):
+        return f'<c t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float, decimal.Decimal)):
+        return f'<c><v>{value}</v></c>'
+    text = escape(_XML_INVALID.sub('', _text(value)))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _xlsx_row(values) -> str:
+    return '<row>' + ''.join(_xlsx_cell(value) for value in values) + '</row>'
+
+
+class _ZipBuffer:
+    """
+    Write-only target for zipfile, emptied by drain().
+
+    It has no tell()/seek(), so zipfile streams entries with data
+    descriptors instead of seeking back to patch headers.
+    """
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b''.join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def iter_xlsx(rows: Iterable[list], chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[bytes]:
+    """A one-sheet XLSX workbook with a header row, as compressed chunks."""
+    buffer = _ZipBuffer()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as workbook:
+        for name, content in _XLSX_PARTS.items():
+            workbook.writestr(name, content)
+        with workbook.open('xl/worksheets/sheet1.xml', 'w') as sheet:
+            sheet.write((_SHEET_START + _xlsx_row(EXPORT_COLUMNS)).encode())
+            rows = iter(rows)
+            while True:
+                chunk = list(islice(rows, chunk_size))
+                if not chunk:
+                    break
+                sheet.write(''.join(_xlsx_row(row) for row in chunk).encode())
+                yield buffer.drain()
+            sheet.write(_SHEET_END.encode())
+    yield buffer.drain()
+
+
+def export_listings(queryset, format: str, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[bytes]:
+    """`queryset` with statistics as CSV or XLSX bytes, chunk by chunk."""
+    rows = iter_export_rows(queryset, chunk_size)
+    if format == XLSX:
+        return iter_xlsx(rows, chunk_size)
+    if format == CSV:
+        return iter_csv(rows, chunk_size)
+    raise ValueError(f"Unknown export format: {format}")
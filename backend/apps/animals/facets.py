@@ -0,0 +1,137 @@
+"""
+Facet counts for the search sidebar.
+
+All facets come from one grouped aggregation over the filtered listing
+queryset: rows are grouped by (type group, city, district, gender, price
+bucket, age bucket) and the per-facet totals are summed in Python. The
+number of groups is bounded by the distinct combinations present, so the
+sidebar costs one query however many facet values there are.
+"""
+
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from django.db.models import Case, CharField, Count, QuerySet, Value, When
+
+# Type groups use the codes AnimalListingFilter.animal_type accepts
+ANIMAL_TYPE_GROUPS = {
+    'KUCUKBAS': ['SMALL', 'KUCUKBAS'],
+    'BUYUKBAS': ['LARGE', 'BUYUKBAS'],
+}
+
+# [low, high) in TL; None means unbounded
+PRICE_BUCKETS = [
+    (0, 5000),
+    (5000, 10000),
+    (10000, 25000),
+    (25000, 50000),
+    (50000, 100000),
+    (100000, None),
+]
+
+# [low, high) in months
+AGE_BUCKETS = [
+    (0, 6),
+    (6, 12),
+    (12, 24),
+    (24, 48),
+    (48, None),
+]
+
+FIELD_FACETS = ['city', 'gender']
+
+
+def bucket_label(low: int, high: Optional[int]) -> str:
+    return f'{low}-{high}' if high is not None else f'{low}+'
+
+
+def bucket_case(field: str, buckets: List[Tuple[int, Optional[int]]]) -> Case:
+    """SQL CASE mapping a numeric column to its bucket label (NULL if none)."""
+    whens = []
+    for low, high in buckets:
+        lookups = {f'{field}__gte': low}
+        if high is not None:
+            lookups[f'{field}__lt'] = high
+        whens.append(When(**lookups, then=Value(bucket_label(low, high))))
+    return Case(*whens, default=Value(None), output_field=CharField())
+
+
+def animal_type_case() -> Case:
+    return Case(
+        *[When(animal_type__in=codes, then=Value(group)) for group, codes in ANIMAL_TYPE_GROUPS.items()],
+        default='animal_type',
+        output_field=CharField()
+    )
+
+
+def _ranked(counter: Counter) -> List[dict]:
+    return [
+        {'value': value, 'count': count}
+        for value, count in sorted(counter.items(), key=lambda item: (-item[1], item[0]))
+    ]
+
+
+def _bucketed(counter: Counter, buckets, min_param: str, max_param: str) -> List[dict]:
+    """Every bucket in order, including empty ones, with its filter bounds."""
+    return [
+        {
+            'value': bucket_label(low, high),
+            min_param: low,
+            max_param: high,
+            'count': counter.get(bucket_label(low, high), 0),
+        }
+        for low, high in buckets
+    ]
+
+
+def listing_facets(queryset: QuerySet) -> Dict[str, object]:
+    """
+    Count listings per facet value for an already filtered queryset.
+
+    Returns:
+        {
+            "total": 42,
+            "animal_type": [{"value": "BUYUKBAS", "count": 30}, ...],
+            "city": [...], "gender": [...],
+            "district": [{"value": "Çankaya", "city": "Ankara", "count": 5}, ...],
+            "price": [{"value": "0-5000", "min_price": 0, "max_price": 5000, "count": 3}, ...],
+            "age": [{"value": "0-6", "min_age": 0, "max_age": 6, "count": 1}, ...]
+        }
+    Listings without a value for a facet only count towards "total".
+    """
+    rows = queryset.order_by().annotate(
+        facet_type=animal_type_case(),
+        facet_price=bucket_case('price', PRICE_BUCKETS),
+        facet_age=bucket_case('age_months', AGE_BUCKETS),
+    ).values(
+        'facet_type', 'city', 'district', 'gender', 'facet_price', 'facet_age'
+    ).annotate(count=Count('pk'))
+
+    total = 0
+    types, districts, prices, ages = Counter(), Counter(), Counter(), Counter()
+    fields = {name: Counter() for name in FIELD_FACETS}
+    for row in rows:
+        count = row['count']
+        total += count
+        types[row['facet_type']] += count
+        for name, counter in fields.items():
+            if row[name]:
+                counter[row[name]] += count
+        if row['district']:
+            districts[(row['city'], row['district'])] += count
+        if row['facet_price']:
+            prices[row['facet_price']] += count
+        if row['facet_age']:
+            ages[row['facet_age']] += count
+
+    return {
+        'total': total,
+        'animal_type': _ranked(types),
+        **{name: _ranked(counter) for name, counter in fields.items()},
+        'district': [
+            {'value': district, 'city': city, 'count': count}
+            for (city, district), count in sorted(districts.items(), key=lambda item: -item[1])
+        ],
+        'price': _bucketed(prices, PRICE_BUCKETS, 'min_price', 'max_price'),
+        'age': _bucketed(ages, AGE_BUCKETS, 'min_age', 'max_age'),
+    }
@@ -3,7 +3,10 @@ Filters for animals app.
 """
 
 import django_filters
+from rest_framework.filters import OrderingFilter, SearchFilter
+from apps.locations.lookup import filter_by_location
 from .models import AnimalListing
+from .search import search_listings
 
 
 class AnimalListingFilter(django_filters.FilterSet):
@@ -54,8 +57,35 @@ class AnimalListingFilter(django_filters.FilterSet):
     
     # New filters for Home Redesign
     gender = django_filters.CharFilter(lookup_expr='iexact')
-    city = django_filters.CharFilter(lookup_expr='icontains')
-    district = django_filters.CharFilter(lookup_expr='icontains')
+    city = django_filters.CharFilter(
+        method='filter_location',
+        help_text="Filter by city name (exact, via the canonical city table)"
+    )
+    district = django_filters.CharFilter(
+        method='filter_location',
+        help_text="Filter by district name (exact, within the city filter)"
+    )
+    city_id = django_filters.NumberFilter(
+        field_name='city_ref',
+        help_text="Filter by canonical city id"
+    )
+    district_id = django_filters.NumberFilter(
+        field_name='district_ref',
+        help_text="Filter by canonical district id"
+    )
+    
+    def filter_location(self, queryset, name, value):
+        """
+        Equality filter on the city_ref/district_ref foreign keys.
+        
+        District names are only unique within a city, so when both are
+        given the city filter resolves the pair.
+        """
+        if name == 'city':
+            return filter_by_location(queryset, city=value, district=self.data.get('district'))
+        if self.data.get('city'):
+            return queryset
+        return filter_by_location(queryset, district=value)
     
     date_posted = django_filters.CharFilter(method='filter_date_posted')
     
@@ -118,6 +148,47 @@ class AnimalListingFilter(django_filters.FilterSet):
         model = AnimalListing
         fields = [
             'animal_type', 'min_price', 'max_price', 'location', 
-            'city', 'district', 'gender', 'date_posted',
+            'city', 'district', 'city_id', 'district_id', 'gender', 'date_posted',
             'min_age', 'max_age', 'min_weight', 'max_weight'
         ]
+
+
+class ListingSearchFilter(SearchFilter):
+    """
+    Full-text search backend for the ?search= parameter.
+    
+    Searches title, breed, city, district, ear_tag_no and description
+    through the listing search index (see apps.animals.search) and orders
+    results by relevance instead of OR'ing icontains over every column.
+    """
+    
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '')
+        return search_listings(queryset, query)
+
+
+class ListingOrderingFilter(OrderingFilter):
+    """
+    Sorting for the ?ordering= parameter.
+    
+    Only orders backed by a partial index on active listings are accepted
+    (see AnimalListing.Meta.indexes); anything else falls back to the
+    default order. Each order is tie-broken on id by the cursor paginator,
+    so ?cursor= pages stay index range scans.
+    """
+    
+    # Direction matters: the paginator sorts NULLs last on nullable keys
+    # (weight, age_months), which only their ascending indexes provide
+    # without a sort step. NOT NULL keys get a plain ASC/DESC and are
+    # served by their index in either direction.
+    allowed_orderings = [
+        'created_at', '-created_at',
+        'price', '-price',
+        'weight',
+        '-view_count',
+        'age_months',
+    ]
+    ordering_fields = sorted({term.lstrip('-') for term in allowed_orderings})
+    
+    def remove_invalid_fields(self, queryset, fields, view, request):
+        return [term for term in fields if term in self.allowed_orderings]
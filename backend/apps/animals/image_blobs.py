@@ -0,0 +1,144 @@
+"""
+Shared image files and near-duplicate detection.
+
+Every upload is hashed before it is written (see storage.py); identical
+bytes map to one ImageBlob and one file. The blob's ref_count follows the
+AnimalImage rows pointing at it and the file (plus its variants) is only
+queued for deletion when the last one goes.
+
+Blobs also get a 64-bit difference hash (dHash) once the image has been
+decoded for variants. Photos that are resized, recompressed or slightly
+edited copies of each other differ in only a few bits. The hash is stored
+as four 16-bit bands: two hashes within Hamming distance 3 agree on at
+least one band, so find_similar_images() runs four indexed equality
+lookups and only compares the few candidates they return.
+"""
+
+import operator
+from functools import reduce
+from typing import List, Optional, Tuple
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from PIL import Image
+
+from .models import AnimalImage, ImageBlob
+from .storage import content_addressed_name, file_sha256
+
+PHASH_BANDS = 4
+PHASH_BAND_BITS = 16
+
+# Largest Hamming distance the band index is guaranteed to find
+SIMILARITY_THRESHOLD = PHASH_BANDS - 1
+
+
+def acquire_blob(image: AnimalImage) -> ImageBlob:
+    """
+    Attach the blob for a new upload on `image` and take a reference to it.
+
+    Called before the row is written (in AnimalImage.save()'s transaction),
+    so blob_id goes into the same INSERT and the reference is rolled back
+    with it. Concurrent uploads of the same bytes both end up on one blob:
+    the one that loses the INSERT race takes a reference to the winner's.
+    """
+    upload = image.image.file
+    sha256 = file_sha256(upload)
+    blob = None
+    if not ImageBlob.objects.filter(pk=sha256).update(ref_count=F('ref_count') + 1):
+        try:
+            with transaction.atomic():
+                blob = ImageBlob.objects.create(
+                    sha256=sha256,
+                    path=content_addressed_name(sha256, image.image.name),
+                    size=upload.size,
+                    ref_count=1
+                )
+        except IntegrityError:
+            ImageBlob.objects.filter(pk=sha256).update(ref_count=F('ref_count') + 1)
+    image.blob = blob or ImageBlob.objects.get(pk=sha256)
+    return image.blob
+
+
+def release_blob(blob_id: str) -> bool:
+    """
+    Drop one reference to a blob.
+
+    Returns True if it was the last one; the blob row is then removed and
+    the caller queues its file and variants for deletion.
+    """
+    ImageBlob.objects.filter(pk=blob_id).update(ref_count=F('ref_count') - 1)
+    released, _ = ImageBlob.objects.filter(pk=blob_id, ref_count__lte=0).delete()
+    return bool(released)
+
+
+def difference_hash(image: Image.Image) -> int:
+    """64-bit dHash: brightness gradient signs of a 9x8 grayscale thumbnail."""
+    pixels = list(image.convert('L').resize((9, 8), Image.LANCZOS).getdata())
+    value = 0
+    for row in range(8):
+        for column in range(8):
+            left = pixels[row * 9 + column]
+            right = pixels[row * 9 + column + 1]
+            value = (value << 1) | (left > right)
+    return value
+
+
+def phash_bands(value: int) -> List[int]:
+    mask = (1 << PHASH_BAND_BITS) - 1
+    return [(value >> (band * PHASH_BAND_BITS)) & mask for band in range(PHASH_BANDS)]
+
+
+def record_phash(blob_id: str, image: Image.Image) -> int:
+    """Compute and store the perceptual hash of a decoded blob image."""
+    value = difference_hash(image)
+    ImageBlob.objects.filter(pk=blob_id).update(
+        phash=f'{value:016x}',
+        **{f'phash_band_{band}': part for band, part in enumerate(phash_bands(value))}
+    )
+    return value
+
+
+def find_similar_blobs(phash: str, max_distance: int = SIMILARITY_THRESHOLD,
+                       exclude: Optional[str] = None) -> List[Tuple[ImageBlob, int]]:
+    """
+    Blobs whose perceptual hash is within `max_distance` bits of `phash`.
+
+    Returns [(blob, distance), ...] closest first. Distances above
+    SIMILARITY_THRESHOLD may be missed by the band lookup.
+    """
+    value = int(phash, 16)
+    candidates = ImageBlob.objects.filter(reduce(operator.or_, [
+        Q(**{f'phash_band_{band}': part}) for band, part in enumerate(phash_bands(value))
+    ]))
+    if exclude:
+        candidates = candidates.exclude(pk=exclude)
+
+    matches = []
+    for blob in candidates:
+        distance = bin(value ^ int(blob.phash, 16)).count('1')
+        if distance <= max_distance:
+            matches.append((blob, distance))
+    matches.sort(key=lambda match: match[1])
+    return matches
+
+
+def find_similar_images(image: AnimalImage,
+                        max_distance: int = SIMILARITY_THRESHOLD) -> List[AnimalImage]:
+    """
+    Images on other listings that are exact or near duplicates of `image`.
+
+    Exact duplicates share the blob; near duplicates come from the phash
+    index. Closest first; near duplicates need the image to be processed.
+    """
+    if image.blob_id is None:
+        return []
+
+    distances = {image.blob_id: 0}
+    if image.blob.phash:
+        for blob, distance in find_similar_blobs(image.blob.phash, max_distance, exclude=image.blob_id):
+            distances[blob.pk] = distance
+
+    images = AnimalImage.objects.filter(
+        blob_id__in=list(distances)
+    ).exclude(listing_id=image.listing_id).select_related('listing')
+    return sorted(images, key=lambda match: distances[match.blob_id])
@@ -0,0 +1,185 @@
+"""
+Resized WebP/JPEG derivatives for animal images.
+
+Uploads are stored as-is; a background worker pool then renders every
+size in VARIANT_SIZES in both formats, drops EXIF metadata (GPS etc.)
+and records the original dimensions on the AnimalImage row. Only the
+variants are served: the API never exposes the original's URL, and
+serializers queue images without variants (e.g. uploaded before variants
+existed) the first time they are shown (schedule_missing_variants).
+
+Derivatives live under animal_images/variants/<key>/<size>.<ext>, keyed
+by the image's blob hash so duplicate uploads share (and skip) the work;
+images from before content-addressed storage are keyed by id.
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from PIL import Image, ImageOps
+
+from .image_blobs import record_phash
+from .models import AnimalImage
+
+logger = logging.getLogger(__name__)
+
+VARIANT_DIR = 'animal_images/variants'
+
+# Bounding boxes; aspect ratio is preserved and images are never upscaled
+VARIANT_SIZES = {
+    'thumbnail': (400, 300),
+    'card': (800, 600),
+    'full': (1600, 1600),
+}
+
+# (extension, Pillow format, save options)
+VARIANT_FORMATS = [
+    ('webp', 'WEBP', {'quality': 80, 'method': 4}),
+    ('jpg', 'JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+]
+
+_executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, 'IMAGE_PROCESSING_WORKERS', 2),
+    thread_name_prefix='animal-image'
+)
+
+# Listings already queued by schedule_missing_variants() in this process
+_missing_scheduled = set()
+_missing_lock = threading.Lock()
+
+
+def variant_path(key, size: str, extension: str) -> str:
+    return f'{VARIANT_DIR}/{key}/{size}.{extension}'
+
+
+def _copy_shared_variants(image: AnimalImage) -> Optional[Dict[str, dict]]:
+    """Reuse the derivatives of another image with the same blob, if rendered."""
+    shared = AnimalImage.objects.filter(
+        blob_id=image.blob_id, width__isnull=False
+    ).exclude(variants={}).exclude(pk=image.pk).values('width', 'height', 'variants').first()
+    if shared is None:
+        return None
+    AnimalImage.objects.filter(pk=image.pk).update(**shared)
+    image.width, image.height, image.variants = shared['width'], shared['height'], shared['variants']
+    return image.variants
+
+
+def _load_rgb(image: AnimalImage) -> Image.Image:
+    """Open the upload, apply EXIF orientation and flatten to RGB."""
+    with image.image.open('rb') as source_file:
+        source = Image.open(source_file)
+        source.load()
+
+    source = ImageOps.exif_transpose(source)
+    if source.mode in ('RGBA', 'LA', 'P'):
+        source = source.convert('RGBA')
+        background = Image.new('RGB', source.size, (255, 255, 255))
+        background.paste(source, mask=source.getchannel('A'))
+        return background
+    return source.convert('RGB')
+
+
+def generate_variants(image: AnimalImage, force: bool = False) -> Dict[str, dict]:
+    """
+    Render all derivatives of an image and store them on the row.
+
+    Saved without EXIF: Pillow only writes metadata when passed explicitly.
+    Uses queryset.update() so the file-change signals don't fire.
+    Unless `force` is set, an already rendered duplicate is reused.
+    """
+    if image.blob_id and not force:
+        shared = _copy_shared_variants(image)
+        if shared is not None:
+            return shared
+
+    source = _load_rgb(image)
+    width, height = source.size
+    key = image.blob_id or image.pk
+    if image.blob_id:
+        record_phash(image.blob_id, source)
+
+    variants = {}
+    for size, box in VARIANT_SIZES.items():
+        resized = source.copy()
+        resized.thumbnail(box, Image.LANCZOS)
+        entry = {'width': resized.width, 'height': resized.height}
+
+        for extension, pil_format, options in VARIANT_FORMATS:
+            buffer = BytesIO()
+            resized.save(buffer, pil_format, **options)
+            path = variant_path(key, size, extension)
+            # Storage would rename on collision; variant names must stay stable
+            if default_storage.exists(path):
+                default_storage.delete(path)
+            entry[extension] = default_storage.save(path, ContentFile(buffer.getvalue()))
+
+        variants[size] = entry
+
+    AnimalImage.objects.filter(pk=image.pk).update(
+        width=width,
+        height=height,
+        variants=variants
+    )
+    image.width, image.height, image.variants = width, height, variants
+    return variants
+
+
+def variant_file_paths(variants: Optional[dict]) -> List[str]:
+    """Storage paths of the derivative files in an AnimalImage.variants value."""
+    return [
+        entry[extension]
+        for entry in (variants or {}).values()
+        for extension, _, _ in VARIANT_FORMATS
+        if entry.get(extension)
+    ]
+
+
+def _process_in_worker(image_id: int) -> None:
+    try:
+        image = AnimalImage.objects.get(pk=image_id)
+        generate_variants(image)
+    except AnimalImage.DoesNotExist:
+        pass
+    except Exception:
+        logger.exception("Image processing failed for AnimalImage %s", image_id)
+    finally:
+        # Worker threads get their own DB connection; don't leak it
+        connection.close()
+
+
+def _process_listing_in_worker(listing_id: int) -> None:
+    try:
+        for image in AnimalImage.objects.filter(listing_id=listing_id, variants={}):
+            try:
+                generate_variants(image)
+            except Exception:
+                logger.exception("Image processing failed for AnimalImage %s", image.pk)
+    finally:
+        connection.close()
+
+
+def schedule_missing_variants(listing_id: int) -> None:
+    """
+    Render the variants a listing's images lack, in the worker pool.
+
+    Called when a serializer finds no variant to show; queued at most once
+    per listing per process, so images that can't be rendered aren't retried
+    on every request (process_animal_images handles those).
+    """
+    with _missing_lock:
+        if listing_id in _missing_scheduled:
+            return
+        _missing_scheduled.add(listing_id)
+    _executor.submit(_process_listing_in_worker, listing_id)
+
+
+def schedule_variants(image_id: int) -> None:
+    """Generate derivatives in the worker pool once the upload is committed."""
+    transaction.on_commit(lambda: _executor.submit(_process_in_worker, image_id))
@@ -2,10 +2,27 @@
 Serializers for animal images.
 """
 
+from django.core.files.storage import default_storage
 from rest_framework import serializers
+from .image_processing import schedule_missing_variants
 from .models import AnimalImage, AnimalListing
 
 
+def variant_urls(variants, request=None) -> dict:
+    """Convert stored variant paths to (absolute) URLs."""
+    urls = {}
+    for size, entry in (variants or {}).items():
+        urls[size] = {
+            key: default_storage.url(value) if key in ('webp', 'jpg') else value
+            for key, value in entry.items()
+        }
+        if request:
+            for key in ('webp', 'jpg'):
+                if key in urls[size]:
+                    urls[size][key] = request.build_absolute_uri(urls[size][key])
+    return urls
+
+
 class AnimalImageSerializer(serializers.ModelSerializer):
     """
     Serializer for AnimalImage model.
@@ -14,11 +31,14 @@ class AnimalImageSerializer(serializers.ModelSerializer):
     """
     
     image_url = serializers.SerializerMethodField()
+    variants = serializers.SerializerMethodField()
     
     class Meta:
         model = AnimalImage
-        fields = ['id', 'listing', 'image', 'image_url', 'is_primary', 'order', 'created_at']
-        read_only_fields = ['id', 'listing', 'created_at']
+        fields = ['id', 'listing', 'image', 'image_url', 'variants', 'width', 'height', 'is_primary', 'order', 'created_at']
+        read_only_fields = ['id', 'listing', 'width', 'height', 'created_at']
+        # The original upload keeps its EXIF (GPS etc.); only processed variants are served
+        extra_kwargs = {'image': {'write_only': True}}
     
     def get_image_url(self, obj) -> str:
         """
@@ -28,12 +48,30 @@ class AnimalImageSerializer(serializers.ModelSerializer):
             obj: AnimalImage instance
             
         Returns:
-            Full URL to the image file
+            Full URL to the EXIF-free 'full' JPEG variant, empty until
+            background processing has finished (the original upload may
+            carry GPS metadata and is never exposed)
         """
+        full = (obj.variants or {}).get('full')
+        if not full or not full.get('jpg'):
+            schedule_missing_variants(obj.listing_id)
+            return ''
+        url = default_storage.url(full['jpg'])
         request = self.context.get('request')
-        if obj.image and request:
-            return request.build_absolute_uri(obj.image.url)
-        return ''
+        return request.build_absolute_uri(url) if request else url
+    
+    def get_variants(self, obj) -> dict:
+        """
+        Get URLs of the resized variants.
+        
+        Args:
+            obj: AnimalImage instance
+            
+        Returns:
+            {size: {'webp': url, 'jpg': url, 'width': w, 'height': h}},
+            empty until background processing has finished
+        """
+        return variant_urls(obj.variants, self.context.get('request'))
     
     def validate(self, attrs):
         """
@@ -55,3 +93,27 @@ class AnimalImageSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Cannot add images to inactive listing.")
         
         return attrs
+
+
+class ImageOrderSerializer(serializers.Serializer):
+    """One {"id", "order"} item of a reorder payload."""
+    
+    id = serializers.IntegerField()
+    order = serializers.IntegerField(min_value=0)
+
+
+class ImageBatchSerializer(serializers.Serializer):
+    """
+    Payload for batch image management on a listing.
+    
+    All keys are optional:
+        {
+            "orders": [{"id": 10, "order": 0}, ...],
+            "primary": 11,
+            "delete": [12, 13]
+        }
+    """
+    
+    orders = ImageOrderSerializer(many=True, required=False)
+    primary = serializers.IntegerField(required=False, allow_null=True)
+    delete = serializers.ListField(child=serializers.IntegerField(), required=False)
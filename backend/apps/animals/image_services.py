@@ -0,0 +1,79 @@
+"""
+Batch operations on the images of a single listing.
+
+Callers check ownership of the listing once; each operation then runs a
+constant number of queries regardless of how many images it touches.
+bulk_update()/update() don't send pre_save, so no per-image file-change
+lookups happen when only metadata changes.
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+from django.db import transaction
+from django.db.models import BooleanField, Case, Value, When
+
+from .models import AnimalImage, AnimalListing
+
+
+def reorder_images(listing: AnimalListing, orders: Iterable[Dict[str, int]]) -> int:
+    """
+    Apply {"id": ..., "order": ...} items with one SELECT and one UPDATE.
+
+    Ids that don't belong to the listing are ignored. Returns rows updated.
+    """
+    new_order = {item['id']: item['order'] for item in orders}
+    if not new_order:
+        return 0
+
+    images = list(
+        AnimalImage.objects.filter(listing=listing, pk__in=new_order).only('id', 'order')
+    )
+    for image in images:
+        image.order = new_order[image.pk]
+    return AnimalImage.objects.bulk_update(images, ['order'])
+
+
+def set_primary_image(listing: AnimalListing, image_id: int) -> bool:
+    """
+    Make one image primary and unset the rest with a single UPDATE.
+
+    Returns False (and changes nothing) if the image isn't on the listing.
+    """
+    images = AnimalImage.objects.filter(listing=listing)
+    if not images.filter(pk=image_id).exists():
+        return False
+    images.update(is_primary=Case(
+        When(pk=image_id, then=Value(True)),
+        default=Value(False),
+        output_field=BooleanField()
+    ))
+    return True
+
+
+def delete_images(listing: AnimalListing, image_ids: Iterable[int]) -> int:
+    """
+    Delete several images of the listing; files are queued for deletion by the post_delete signal.
+
+    Returns the number of images deleted.
+    """
+    deleted, _ = AnimalImage.objects.filter(listing=listing, pk__in=list(image_ids)).delete()
+    return deleted
+
+
+def apply_image_batch(listing: AnimalListing, orders: Optional[List[Dict[str, int]]] = None,
+                      primary: Optional[int] = None,
+                      delete: Optional[List[int]] = None) -> dict:
+    """
+    Apply deletes, reorder and primary change atomically.
+
+    Returns counts of what changed.
+    """
+    result = {'deleted': 0, 'reordered': 0, 'primary_set': False}
+    with transaction.atomic():
+        if delete:
+            result['deleted'] = delete_images(listing, delete)
+        if orders:
+            result['reordered'] = reorder_images(listing, orders)
+        if primary is not None:
+            result['primary_set'] = set_primary_image(listing, primary)
+    return result
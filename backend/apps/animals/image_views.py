@@ -8,7 +8,11 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from apps.accounts.permissions import IsOwner
 from .models import AnimalListing, AnimalImage
-from .image_serializers import AnimalImageSerializer
+from .image_serializers import AnimalImageSerializer, ImageBatchSerializer
+from .image_services import apply_image_batch, reorder_images
+from .image_processing import schedule_variants
+from .image_blobs import find_similar_images
+from .archive import archived_image_instances, find_archived
 
 
 from django.shortcuts import get_object_or_404
@@ -23,6 +27,7 @@ class AnimalImageViewSet(viewsets.ModelViewSet):
     Permissions:
         - list/retrieve: IsAuthenticated
         - create/destroy: IsOwner (via listing)
+        - similar: IsAuthenticated
     """
     serializer_class = AnimalImageSerializer
     queryset = AnimalImage.objects.all()
@@ -36,7 +41,7 @@ class AnimalImageViewSet(viewsets.ModelViewSet):
         if self.action in ['list']:
             # Public can view listing images
             return [AllowAny()]
-        elif self.action in ['create', 'destroy', 'reorder']:
+        elif self.action in ['create', 'destroy', 'reorder', 'batch']:
             # Only owner can manage images
             return [IsAuthenticated(), IsOwner()]
         else:
@@ -54,10 +59,23 @@ class AnimalImageViewSet(viewsets.ModelViewSet):
             return AnimalImage.objects.filter(listing_id=listing_id).select_related('listing')
         return AnimalImage.objects.select_related('listing')
     
+    def list(self, request, *args, **kwargs):
+        """List a listing's images; archived listings' images come from the archive."""
+        response = super().list(request, *args, **kwargs)
+        listing_id = self.kwargs.get('listing_pk')
+        if not response.data and listing_id:
+            archived = find_archived(listing_id)
+            if archived is not None:
+                response.data = self.get_serializer(archived_image_instances(archived), many=True).data
+        return response
+    
     def create(self, request, *args, **kwargs):
         """
         Upload image to listing.
         
+        Returns immediately; thumbnail/card/full variants appear in
+        `variants` once the background worker has processed the upload.
+        
         Returns:
             201 Created if successful
             403 Forbidden if not the seller
@@ -72,7 +90,10 @@ class AnimalImageViewSet(viewsets.ModelViewSet):
             # Create serializer with listing
             serializer = self.get_serializer(data=request.data)
             serializer.is_valid(raise_exception=True)
-            serializer.save(listing=listing)
+            image = serializer.save(listing=listing)
+            
+            # Resized WebP/JPEG variants are rendered in the background
+            schedule_variants(image.pk)
             
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         except Exception as e:
@@ -100,35 +121,87 @@ class AnimalImageViewSet(viewsets.ModelViewSet):
             200 OK with updated images list
             403 Forbidden if not the seller
         """
-        listing_id = self.kwargs.get('listing_pk')
-        listing = get_object_or_404(AnimalListing, pk=listing_id)
-        
-        # Check ownership
-        if listing.seller != request.user:
+        listing = self.get_owned_listing()
+        if listing is None:
             return Response(
                 {'detail': 'You do not have permission to reorder these images.'},
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        orders = request.data.get('orders', [])
-        
-        # Update each image's order
-        for item in orders:
-            image_id = item.get('id')
-            new_order = item.get('order')
-            
-            try:
-                image = AnimalImage.objects.get(id=image_id, listing=listing)
-                image.order = new_order
-                image.save()
-            except AnimalImage.DoesNotExist:
-                continue
+        serializer = ImageBatchSerializer(data={'orders': request.data.get('orders', [])})
+        serializer.is_valid(raise_exception=True)
+        reorder_images(listing, serializer.validated_data['orders'])
         
         # Return updated images
         images = AnimalImage.objects.filter(listing=listing)
         serializer = self.get_serializer(images, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
     
+    @action(methods=['post'], detail=False, url_path='batch')
+    def batch(self, request, *args, **kwargs):
+        """
+        Reorder, set primary and delete images in one transaction.
+        
+        Expected payload (all keys optional):
+            {
+                "orders": [{"id": 10, "order": 0}, ...],
+                "primary": 11,
+                "delete": [12, 13]
+            }
+        
+        Returns:
+            200 OK with updated images list
+            400 Bad Request if the payload is invalid
+            403 Forbidden if not the seller
+        """
+        listing = self.get_owned_listing()
+        if listing is None:
+            return Response(
+                {'detail': 'You do not have permission to manage these images.'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        serializer = ImageBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        apply_image_batch(listing, **serializer.validated_data)
+        
+        images = AnimalImage.objects.filter(listing=listing)
+        serializer = self.get_serializer(images, many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+    
+    @action(methods=['get'], detail=True, url_path='similar')
+    def similar(self, request, *args, **kwargs):
+        """
+        Find copies of an image on other listings.
+        
+        Exact duplicates share the stored file; near duplicates (resized,
+        recompressed) are matched by perceptual hash once processed.
+        
+        Returns:
+            200 OK with matching images, closest first
+        """
+        instance = self.get_object()
+        serializer = self.get_serializer(find_similar_images(instance), many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+    
+    def get_owned_listing(self):
+        """
+        Load the URL's listing and check ownership without fetching the seller.
+        
+        Returns:
+            The listing, or None if the requester is not its seller
+        
+        Raises:
+            Http404: If the listing does not exist
+        """
+        listing = get_object_or_404(
+            AnimalListing.objects.only('id', 'seller_id', 'is_active'),
+            pk=self.kwargs.get('listing_pk')
+        )
+        if listing.seller_id != self.request.user.pk:
+            return None
+        return listing
+    
     def destroy(self, request, *args, **kwargs):
         """
         Delete image.
@@ -140,14 +213,13 @@ class AnimalImageViewSet(viewsets.ModelViewSet):
         instance = self.get_object()
         
         # Check if user is the seller of the listing
-        if instance.listing.seller != request.user:
+        if instance.listing.seller_id != request.user.pk:
             return Response(
                 {'detail': 'You do not have permission to delete this image.'},
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        # Delete the file and database record
-        instance.image.delete(save=False)
+        # Files are queued for deletion by the post_delete signal
         instance.delete()
         
         return Response(status=status.HTTP_204_NO_CONTENT)
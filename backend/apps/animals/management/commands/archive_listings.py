@@ -0,0 +1,92 @@
+"""
+Move old listings to the archive table, or restore archived ones.
+
+Usage:
+    python manage.py archive_listings
+    python manage.py archive_listings --before 2025-06-01 --inactive-only --dry-run
+    python manage.py archive_listings --restore 12 15 18
+"""
+
+from datetime import datetime, time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.animals.archive import (
+    ARCHIVE_CHUNK_SIZE, archivable_listings, archive_cutoff, archive_listings, restore_listings
+)
+from apps.animals.view_counter import view_counter
+
+
+class Command(BaseCommand):
+    help = "Archive listings from previous seasons (or restore archived listings)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--before',
+            help="Archive listings created before this date, YYYY-MM-DD "
+                 "(default: LISTING_ARCHIVE_AFTER_DAYS ago)"
+        )
+        parser.add_argument(
+            '--days',
+            type=int,
+            help="Archive listings created more than this many days ago"
+        )
+        parser.add_argument(
+            '--inactive-only',
+            action='store_true',
+            help="Only archive soft-deleted (inactive) listings"
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help="Only count the listings that would be archived"
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=ARCHIVE_CHUNK_SIZE,
+            help=f"Listings moved per transaction (default: {ARCHIVE_CHUNK_SIZE})"
+        )
+        parser.add_argument(
+            '--restore',
+            nargs='+',
+            type=int,
+            metavar='ID',
+            help="Move these archived listings back to the live table"
+        )
+
+    def handle(self, *args, **options):
+        if options['restore']:
+            restored = restore_listings(options['restore'])
+            self.stdout.write(self.style.SUCCESS(f"Restored {restored} listings"))
+            return
+
+        if options['before']:
+            try:
+                day = datetime.strptime(options['before'], '%Y-%m-%d').date()
+            except ValueError:
+                raise CommandError("--before must be a date in YYYY-MM-DD format")
+            before = timezone.make_aware(datetime.combine(day, time.min))
+        else:
+            before = archive_cutoff(options['days'])
+
+        queryset = archivable_listings(before, inactive_only=options['inactive_only'])
+        if options['dry_run']:
+            self.stdout.write(f"{queryset.count()} listings created before {before:%Y-%m-%d} would be archived")
+            return
+
+        # Buffered views would otherwise be written to rows that are gone
+        view_counter.flush()
+
+        total, last_id = 0, 0
+        while True:
+            chunk = list(
+                queryset.filter(pk__gt=last_id).order_by('pk')
+                .values_list('pk', flat=True)[:options['chunk_size']]
+            )
+            if not chunk:
+                break
+            last_id = chunk[-1]
+            total += archive_listings(chunk)
+        self.stdout.write(self.style.SUCCESS(f"Archived {total} listings created before {before:%Y-%m-%d}"))
@@ -0,0 +1,96 @@
+"""
+Compare ModelSerializer and RowSerializer output and throughput.
+
+Renders the same rows through both paths (query + serialize + JSON
+render), fails if the JSON differs and reports rows per second.
+
+Usage:
+    python manage.py benchmark_serializers
+    python manage.py benchmark_serializers --rows 50 --repeat 100
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from apps.animals.models import AnimalListing
+from apps.animals.row_serializers import ListingRowSerializer
+from apps.animals.serializers import AnimalListingSerializer, restrict_listing_queryset
+from apps.favorites.models import Favorite
+from apps.favorites.serializers import FavoriteRowSerializer, FavoriteSerializer
+
+
+class Command(BaseCommand):
+    help = "Benchmark .values() row serializers against the DRF ModelSerializers"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=200,
+            help="Rows per serialization (default: 200)"
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=20,
+            help="Timed runs per path (default: 20)"
+        )
+
+    def handle(self, *args, **options):
+        rows, repeat = options['rows'], options['repeat']
+        renderer = JSONRenderer()
+
+        listings = restrict_listing_queryset(
+            AnimalListing.objects.filter(is_active=True), None
+        ).order_by('-created_at', '-id')
+        favorites = Favorite.objects.select_related('animal', 'user').order_by('-created_at', '-id')
+
+        cases = [
+            (
+                'listings',
+                lambda: AnimalListingSerializer(listings[:rows], many=True).data,
+                lambda: self.render_rows(ListingRowSerializer, listings, rows),
+            ),
+            (
+                'favorites',
+                lambda: FavoriteSerializer(favorites[:rows], many=True).data,
+                lambda: self.render_rows(FavoriteRowSerializer, favorites, rows),
+            ),
+        ]
+
+        for name, model_path, row_path in cases:
+            data = model_path()
+            expected = renderer.render(data)
+            if renderer.render(row_path()) != expected:
+                raise CommandError(f"{name}: row serializer output differs from the ModelSerializer")
+            count = len(data)
+            if not count:
+                self.stdout.write(f"{name}: no rows, skipped")
+                continue
+
+            model_time = self.time(lambda: renderer.render(model_path()), repeat)
+            row_time = self.time(lambda: renderer.render(row_path()), repeat)
+            self.stdout.write(
+                f"{name}: {len(expected)} identical bytes, "
+                f"ModelSerializer {count / model_time:,.0f} rows/s, "
+                f"RowSerializer {count / row_time:,.0f} rows/s "
+                f"({model_time / row_time:.1f}x)"
+            )
+
+        self.stdout.write(self.style.SUCCESS("Outputs are byte-identical"))
+
+    def render_rows(self, serializer_class, queryset, rows):
+        serializer = serializer_class.for_queryset(queryset)
+        return serializer.serialize(serializer.values(queryset)[:rows])
+
+    def time(self, func, repeat) -> float:
+        """Best time of `repeat` runs, in seconds."""
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best
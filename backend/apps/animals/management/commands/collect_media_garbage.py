@@ -0,0 +1,63 @@
+"""
+Delete media files queued by the image signals, optionally sweeping MEDIA_ROOT.
+
+Usage:
+    python manage.py collect_media_garbage                  # delete queued files
+    python manage.py collect_media_garbage --sweep          # also queue unreferenced files
+    python manage.py collect_media_garbage --sweep --dry-run
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.animals.media_gc import (
+    COLLECT_BATCH_SIZE,
+    SWEEP_MIN_AGE,
+    collect_orphaned_files,
+    find_unreferenced_files,
+    queue_orphaned_files,
+)
+
+
+class Command(BaseCommand):
+    help = "Delete orphaned media files in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=COLLECT_BATCH_SIZE,
+            help=f"Number of files per delete batch (default: {COLLECT_BATCH_SIZE})"
+        )
+        parser.add_argument(
+            '--sweep',
+            action='store_true',
+            help="Scan media directories for files no row references"
+        )
+        parser.add_argument(
+            '--min-age',
+            type=int,
+            default=SWEEP_MIN_AGE,
+            help=f"Sweep only files older than this many seconds (default: {SWEEP_MIN_AGE})"
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help="List unreferenced files found by --sweep without deleting anything"
+        )
+
+    def handle(self, *args, **options):
+        if options['sweep']:
+            orphans = find_unreferenced_files(min_age=options['min_age'])
+            if options['dry_run']:
+                for path in orphans:
+                    self.stdout.write(path)
+                self.stdout.write(self.style.SUCCESS(f"Found {len(orphans)} unreferenced files"))
+                return
+            queue_orphaned_files(orphans)
+            self.stdout.write(f"Queued {len(orphans)} unreferenced files")
+        elif options['dry_run']:
+            self.stderr.write("--dry-run only applies to --sweep")
+            return
+
+        deleted = collect_orphaned_files(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Collected {deleted} orphaned files"))
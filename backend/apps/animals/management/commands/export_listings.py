@@ -0,0 +1,60 @@
+"""
+Export listings with their statistics to a CSV or XLSX file.
+
+Rows are read and written chunk by chunk, so memory use stays flat for
+any number of listings.
+
+Usage:
+    python manage.py export_listings --output listings.csv
+    python manage.py export_listings --format xlsx --seller seller@example.com --output listings.xlsx
+"""
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.animals.export import CSV, EXPORT_CHUNK_SIZE, XLSX, export_listings
+from apps.animals.models import AnimalListing
+
+
+class Command(BaseCommand):
+    help = "Export animal listings with view, favorite and message counts"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            required=True,
+            help="File to write"
+        )
+        parser.add_argument(
+            '--format',
+            choices=[CSV, XLSX],
+            default=CSV,
+            help="File format (default: csv)"
+        )
+        parser.add_argument(
+            '--seller',
+            help="Only export listings of the seller with this email"
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=EXPORT_CHUNK_SIZE,
+            help=f"Listings read per query (default: {EXPORT_CHUNK_SIZE})"
+        )
+
+    def handle(self, *args, **options):
+        queryset = AnimalListing.objects.all()
+        if options['seller']:
+            try:
+                seller = get_user_model().objects.get(email=options['seller'])
+            except get_user_model().DoesNotExist:
+                raise CommandError(f"No user with email {options['seller']}")
+            queryset = queryset.filter(seller=seller)
+
+        size = 0
+        with open(options['output'], 'wb') as output:
+            for chunk in export_listings(queryset, options['format'], options['chunk_size']):
+                output.write(chunk)
+                size += len(chunk)
+
+        self.stdout.write(self.style.SUCCESS(f"Wrote {size:,} bytes to {options['output']}"))
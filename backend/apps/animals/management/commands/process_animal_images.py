@@ -0,0 +1,39 @@
+"""
+Render resized variants for animal images.
+
+Usage:
+    python manage.py process_animal_images          # only images without variants
+    python manage.py process_animal_images --all    # re-render everything
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.animals.models import AnimalImage
+from apps.animals.image_processing import generate_variants
+
+
+class Command(BaseCommand):
+    help = "Generate thumbnail/card/full WebP and JPEG variants for animal images"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help="Re-render images that already have variants"
+        )
+
+    def handle(self, *args, **options):
+        images = AnimalImage.objects.all()
+        if not options['all']:
+            images = images.filter(variants={})
+        
+        processed = failed = 0
+        for image in images.iterator():
+            try:
+                generate_variants(image, force=options['all'])
+                processed += 1
+            except Exception as e:
+                failed += 1
+                self.stderr.write(f"AnimalImage {image.pk}: {e}")
+        
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} images, {failed} failed"))
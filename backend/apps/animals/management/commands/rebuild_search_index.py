@@ -0,0 +1,44 @@
+"""
+Rebuild listing search documents from scratch.
+
+Usage:
+    python manage.py rebuild_search_index
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.animals.models import AnimalListing, ListingSearchDocument
+from apps.animals.search import build_document_fields
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search documents for all animal listings"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help="Number of listings per insert batch (default: 500)"
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        
+        with transaction.atomic():
+            ListingSearchDocument.objects.all().delete()
+            
+            batch = []
+            total = 0
+            for listing in AnimalListing.objects.iterator(chunk_size=batch_size):
+                batch.append(ListingSearchDocument(listing=listing, **build_document_fields(listing)))
+                if len(batch) >= batch_size:
+                    ListingSearchDocument.objects.bulk_create(batch)
+                    total += len(batch)
+                    batch = []
+            if batch:
+                ListingSearchDocument.objects.bulk_create(batch)
+                total += len(batch)
+        
+        self.stdout.write(self.style.SUCCESS(f"Indexed {total} listings"))
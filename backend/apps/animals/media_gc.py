@@ -0,0 +1,199 @@
+"""
+Deferred deletion of media files.
+
+Deleting an AnimalImage (or replacing its file) only records the freed
+paths in OrphanedMediaFile, inside the same transaction, so requests never
+block on filesystem I/O and a rolled-back delete never loses a file.
+Once the transaction commits, a single background worker removes queued
+files in batches. `manage.py collect_media_garbage` does the same from
+cron and can sweep MEDIA_ROOT for files no row references at all.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, List, Set
+
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+
+from .image_processing import VARIANT_DIR, variant_file_paths
+from .models import AnimalImage, ArchivedListing, ImageBlob, OrphanedMediaFile
+
+logger = logging.getLogger(__name__)
+
+COLLECT_BATCH_SIZE = 200
+
+# Upload directories covered by the sweep
+SWEEP_DIRS = ['animal_images', 'profiles']
+
+# Files younger than this are skipped by the sweep: their row may not be
+# committed yet (upload in flight, variants being rendered)
+SWEEP_MIN_AGE = 60 * 60
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='media-gc')
+_scheduled = False
+_scheduled_lock = threading.Lock()
+
+
+def queue_orphaned_files(paths: Iterable[str]) -> int:
+    """
+    Record files for deletion in the caller's transaction.
+
+    Returns the number of paths queued; already-queued paths are ignored.
+    """
+    unique_paths = list(dict.fromkeys(path for path in paths if path))
+    OrphanedMediaFile.objects.bulk_create(
+        [OrphanedMediaFile(path=path) for path in unique_paths],
+        batch_size=COLLECT_BATCH_SIZE,
+        ignore_conflicts=True
+    )
+    return len(unique_paths)
+
+
+def _variant_key(path: str) -> str:
+    """The <key> of animal_images/variants/<key>/<size>.<ext>, '' for other paths."""
+    prefix = f'{VARIANT_DIR}/'
+    if not path.startswith(prefix):
+        return ''
+    return path[len(prefix):].split('/', 1)[0]
+
+
+def referenced_variant_paths(paths: List[str]) -> Set[str]:
+    """
+    Variant files in `paths` that are still in use.
+
+    Variants are keyed by blob hash, so a photo re-uploaded after its last
+    image was deleted renders to the same paths: anything under a live
+    blob's directory is kept. Variants keyed by image id (images from
+    before deduplication) are kept while a row lists them.
+    """
+    keys = {key for key in map(_variant_key, paths) if key}
+    if not keys:
+        return set()
+    live_blobs = set(ImageBlob.objects.filter(pk__in=keys).values_list('pk', flat=True))
+    image_ids = [int(key) for key in keys if key.isdigit()]
+    listed = set()
+    for variants in AnimalImage.objects.filter(pk__in=image_ids).values_list('variants', flat=True):
+        listed.update(variant_file_paths(variants))
+    return {path for path in paths if _variant_key(path) in live_blobs or path in listed}
+
+
+def referenced_paths(paths: List[str]) -> Set[str]:
+    """Subset of `paths` that a row still points at (never deleted)."""
+    User = get_user_model()
+    referenced = set(AnimalImage.objects.filter(image__in=paths).values_list('image', flat=True))
+    # A blob row is created before its file is written: covers uploads in flight
+    referenced.update(ImageBlob.objects.filter(path__in=paths).values_list('path', flat=True))
+    referenced.update(User.objects.filter(profile_image__in=paths).values_list('profile_image', flat=True))
+    referenced.update(referenced_variant_paths(paths))
+    return referenced
+
+
+def collect_orphaned_files(batch_size: int = COLLECT_BATCH_SIZE) -> int:
+    """
+    Delete queued files in batches of `batch_size`.
+
+    Each batch is one SELECT, one reference check and one DELETE of the
+    queue rows. Files that fail to delete stay queued for the next run.
+    Returns the number of queue entries resolved.
+    """
+    resolved = 0
+    last_id = 0
+    while True:
+        batch = list(
+            OrphanedMediaFile.objects.filter(pk__gt=last_id)
+            .order_by('pk').values_list('pk', 'path')[:batch_size]
+        )
+        if not batch:
+            break
+        last_id = batch[-1][0]
+
+        still_used = referenced_paths([path for _, path in batch])
+        done = []
+        for pk, path in batch:
+            if path not in still_used:
+                try:
+                    default_storage.delete(path)
+                except Exception as e:
+                    logger.warning("Error deleting media file %s: %s", path, e)
+                    continue
+            done.append(pk)
+
+        OrphanedMediaFile.objects.filter(pk__in=done).delete()
+        resolved += len(done)
+    return resolved
+
+
+def _collect_in_worker() -> None:
+    global _scheduled
+    with _scheduled_lock:
+        # Reset first: files queued while this run is going get another one
+        _scheduled = False
+    try:
+        collect_orphaned_files()
+    except Exception:
+        logger.exception("Media garbage collection failed")
+    finally:
+        # Worker threads get their own DB connection; don't leak it
+        connection.close()
+
+
+def _submit_collection() -> None:
+    global _scheduled
+    with _scheduled_lock:
+        if _scheduled:
+            return
+        _scheduled = True
+    _executor.submit(_collect_in_worker)
+
+
+def schedule_collection() -> None:
+    """Collect queued files in the background once the transaction commits."""
+    transaction.on_commit(_submit_collection)
+
+
+def all_referenced_paths() -> Set[str]:
+    """Every media path referenced by a row, including image variants."""
+    User = get_user_model()
+    referenced = set()
+    for image, variants in AnimalImage.objects.values_list('image', 'variants').iterator():
+        referenced.add(image)
+        referenced.update(variant_file_paths(variants))
+    # Archived listings keep their image files for a restore
+    for images in ArchivedListing.objects.values_list('images', flat=True).iterator():
+        for image in images:
+            referenced.add(image['fields']['image'])
+            referenced.update(variant_file_paths(image['fields']['variants']))
+    referenced.update(
+        User.objects.exclude(profile_image='').exclude(profile_image__isnull=True)
+        .values_list('profile_image', flat=True).iterator()
+    )
+    return referenced
+
+
+def _walk_storage(directory: str) -> Iterator[str]:
+    if not default_storage.exists(directory):
+        return
+    directories, files = default_storage.listdir(directory)
+    for name in files:
+        yield f'{directory}/{name}'
+    for name in directories:
+        yield from _walk_storage(f'{directory}/{name}')
+
+
+def find_unreferenced_files(min_age: int = SWEEP_MIN_AGE) -> List[str]:
+    """Files under SWEEP_DIRS older than `min_age` seconds that no row references."""
+    referenced = all_referenced_paths()
+    cutoff = time.time() - min_age
+    orphans = []
+    for directory in SWEEP_DIRS:
+        for path in _walk_storage(directory):
+            if path in referenced:
+                continue
+            if default_storage.get_modified_time(path).timestamp() > cutoff:
+                continue
+            orphans.append(path)
+    return orphans
@@ -0,0 +1,142 @@
+# Generated by Django 4.2.17 on 2026-10-17 02:57
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# Frozen copy of apps.animals.search's folding as of this migration, so the
+# backfill doesn't change when that module does
+_TURKISH_LOWER = str.maketrans({'I': 'ı', 'İ': 'i'})
+_ASCII_FOLD = str.maketrans('çğıöşüâîû', 'cgiosuaiu')
+
+BACKFILL_BATCH_SIZE = 500
+
+
+POSTGRES_FORWARD = [
+    """
+    ALTER TABLE animals_listingsearchdocument ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', primary_text), 'A') ||
+        setweight(to_tsvector('simple', location_text), 'B') ||
+        setweight(to_tsvector('simple', body_text), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX animals_listingsearch_vector_gin ON animals_listingsearchdocument USING GIN (search_vector)",
+]
+
+POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS animals_listingsearch_vector_gin",
+    "ALTER TABLE animals_listingsearchdocument DROP COLUMN IF EXISTS search_vector",
+]
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE animals_listingsearchindex USING fts5(
+        primary_text, location_text, body_text,
+        content='animals_listingsearchdocument', content_rowid='listing_id'
+    )
+    """,
+    """
+    CREATE TRIGGER animals_listingsearchdocument_ai AFTER INSERT ON animals_listingsearchdocument BEGIN
+        INSERT INTO animals_listingsearchindex(rowid, primary_text, location_text, body_text)
+        VALUES (new.listing_id, new.primary_text, new.location_text, new.body_text);
+    END
+    """,
+    """
+    CREATE TRIGGER animals_listingsearchdocument_ad AFTER DELETE ON animals_listingsearchdocument BEGIN
+        INSERT INTO animals_listingsearchindex(animals_listingsearchindex, rowid, primary_text, location_text, body_text)
+        VALUES ('delete', old.listing_id, old.primary_text, old.location_text, old.body_text);
+    END
+    """,
+    """
+    CREATE TRIGGER animals_listingsearchdocument_au AFTER UPDATE ON animals_listingsearchdocument BEGIN
+        INSERT INTO animals_listingsearchindex(animals_listingsearchindex, rowid, primary_text, location_text, body_text)
+        VALUES ('delete', old.listing_id, old.primary_text, old.location_text, old.body_text);
+        INSERT INTO animals_listingsearchindex(rowid, primary_text, location_text, body_text)
+        VALUES (new.listing_id, new.primary_text, new.location_text, new.body_text);
+    END
+    """,
+]
+
+SQLITE_REVERSE = [
+    "DROP TRIGGER IF EXISTS animals_listingsearchdocument_ai",
+    "DROP TRIGGER IF EXISTS animals_listingsearchdocument_ad",
+    "DROP TRIGGER IF EXISTS animals_listingsearchdocument_au",
+    "DROP TABLE IF EXISTS animals_listingsearchindex",
+]
+
+
+def _run_vendor_sql(schema_editor, statements_by_vendor):
+    for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+def create_search_index(apps, schema_editor):
+    """Create the vendor-specific full-text index over search documents."""
+    _run_vendor_sql(schema_editor, {
+        'postgresql': POSTGRES_FORWARD,
+        'sqlite': SQLITE_FORWARD,
+    })
+
+
+def drop_search_index(apps, schema_editor):
+    _run_vendor_sql(schema_editor, {
+        'postgresql': POSTGRES_REVERSE,
+        'sqlite': SQLITE_REVERSE,
+    })
+
+
+def _fold(*parts):
+    text = ' '.join(p for p in parts if p)
+    return text.translate(_TURKISH_LOWER).lower().translate(_ASCII_FOLD)
+
+
+def backfill_search_documents(apps, schema_editor):
+    """Build search documents for existing listings, a batch at a time."""
+    AnimalListing = apps.get_model('animals', 'AnimalListing')
+    ListingSearchDocument = apps.get_model('animals', 'ListingSearchDocument')
+
+    listings = AnimalListing.objects.only(
+        'id', 'title', 'breed', 'city', 'district', 'ear_tag_no', 'description'
+    ).order_by('pk')
+    last_pk = 0
+    while True:
+        batch = list(listings.filter(pk__gt=last_pk)[:BACKFILL_BATCH_SIZE])
+        if not batch:
+            break
+        ListingSearchDocument.objects.bulk_create([
+            ListingSearchDocument(
+                listing_id=listing.pk,
+                primary_text=_fold(listing.title, listing.breed),
+                location_text=_fold(listing.city, listing.district, listing.ear_tag_no),
+                body_text=_fold(listing.description),
+            )
+            for listing in batch
+        ])
+        last_pk = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('animals', '0012_alter_animallisting_breed'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ListingSearchDocument',
+            fields=[
+                ('listing', models.OneToOneField(help_text='The listing this document indexes', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='animals.animallisting')),
+                ('primary_text', models.TextField(blank=True, default='', help_text='Folded title and breed (highest search weight)')),
+                ('location_text', models.TextField(blank=True, default='', help_text='Folded city, district and ear tag')),
+                ('body_text', models.TextField(blank=True, default='', help_text='Folded description (lowest search weight)')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'listing search document',
+                'verbose_name_plural': 'listing search documents',
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+        migrations.RunPython(backfill_search_documents, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.17 on 2026-10-17 02:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('animals', '0013_listingsearchdocument'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='animallisting',
+            index=models.Index(fields=['is_active', '-created_at', '-id'], name='animal_active_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='animallisting',
+            index=models.Index(fields=['seller', 'is_active', '-created_at', '-id'], name='animal_seller_created_idx'),
+        ),
+    ]
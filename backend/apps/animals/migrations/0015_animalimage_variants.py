@@ -0,0 +1,28 @@
+# Generated by Django 4.2.17 on 2026-10-17 03:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('animals', '0014_listing_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='animalimage',
+            name='height',
+            field=models.PositiveIntegerField(blank=True, help_text='Original image height in pixels (set after processing)', null=True),
+        ),
+        migrations.AddField(
+            model_name='animalimage',
+            name='variants',
+            field=models.JSONField(blank=True, default=dict, help_text="Resized derivatives: {size: {'webp': path, 'jpg': path, 'width': w, 'height': h}}"),
+        ),
+        migrations.AddField(
+            model_name='animalimage',
+            name='width',
+            field=models.PositiveIntegerField(blank=True, help_text='Original image width in pixels (set after processing)', null=True),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.17 on 2026-10-17 03:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('animals', '0015_animalimage_variants'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrphanedMediaFile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('path', models.CharField(help_text='Storage-relative path of the file to delete', max_length=500, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'orphaned media file',
+                'verbose_name_plural': 'orphaned media files',
+                'ordering': ['id'],
+            },
+        ),
+    ]
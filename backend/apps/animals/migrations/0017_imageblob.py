@@ -0,0 +1,44 @@
+# Generated by Django 4.2.17 on 2026-10-17 03:09
+
+import apps.animals.storage
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('animals', '0016_orphanedmediafile'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageBlob',
+            fields=[
+                ('sha256', models.CharField(help_text='Hex SHA-256 of the file contents', max_length=64, primary_key=True, serialize=False)),
+                ('path', models.CharField(help_text='Storage path of the file', max_length=255)),
+                ('size', models.PositiveIntegerField(default=0, help_text='File size in bytes')),
+                ('ref_count', models.PositiveIntegerField(default=0, help_text='Number of animal images using this file')),
+                ('phash', models.CharField(blank=True, default='', help_text='64-bit difference hash as hex (set after processing)', max_length=16)),
+                ('phash_band_0', models.PositiveIntegerField(blank=True, db_index=True, null=True)),
+                ('phash_band_1', models.PositiveIntegerField(blank=True, db_index=True, null=True)),
+                ('phash_band_2', models.PositiveIntegerField(blank=True, db_index=True, null=True)),
+                ('phash_band_3', models.PositiveIntegerField(blank=True, db_index=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'image blob',
+                'verbose_name_plural': 'image blobs',
+            },
+        ),
+        migrations.AlterField(
+            model_name='animalimage',
+            name='image',
+            field=models.ImageField(help_text='Image file', storage=apps.animals.storage.get_image_storage, upload_to=apps.animals.storage.content_addressed_upload_to),
+        ),
+        migrations.AddField(
+            model_name='animalimage',
+            name='blob',
+            field=models.ForeignKey(blank=True, help_text='Shared stored file (null for images uploaded before deduplication)', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='images', to='animals.imageblob'),
+        ),
+    ]
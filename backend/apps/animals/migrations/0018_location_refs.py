@@ -0,0 +1,29 @@
+# Generated by Django 4.2.17 on 2026-10-17 03:11
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0001_initial'),
+        ('animals', '0017_imageblob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='animallisting',
+            name='city_ref',
+            field=models.ForeignKey(blank=True, editable=False, help_text='Canonical city resolved from `city`', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='locations.city'),
+        ),
+        migrations.AddField(
+            model_name='animallisting',
+            name='district_ref',
+            field=models.ForeignKey(blank=True, editable=False, help_text='Canonical district resolved from `district`', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='locations.district'),
+        ),
+        migrations.AddIndex(
+            model_name='animallisting',
+            index=models.Index(fields=['city_ref', 'is_active', '-created_at', '-id'], name='animal_city_created_idx'),
+        ),
+    ]
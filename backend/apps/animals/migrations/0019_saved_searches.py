@@ -0,0 +1,60 @@
+# Generated by Django 4.2.17 on 2026-10-17 03:15
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0004_seed_city_coordinates'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('animals', '0018_location_refs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SavedSearch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(blank=True, default='', help_text='Display name (örn: Ankara kurbanlık koç)', max_length=100)),
+                ('animal_type', models.CharField(blank=True, default='', help_text='KUCUKBAS or BUYUKBAS; empty for any', max_length=10)),
+                ('city', models.CharField(blank=True, default='', max_length=100)),
+                ('district', models.CharField(blank=True, default='', max_length=100)),
+                ('gender', models.CharField(blank=True, default='', max_length=10)),
+                ('min_price', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('max_price', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('min_age', models.IntegerField(blank=True, help_text='Minimum age in months', null=True)),
+                ('max_age', models.IntegerField(blank=True, help_text='Maximum age in months', null=True)),
+                ('min_weight', models.DecimalField(blank=True, decimal_places=2, max_digits=6, null=True)),
+                ('max_weight', models.DecimalField(blank=True, decimal_places=2, max_digits=6, null=True)),
+                ('is_active', models.BooleanField(default=True, help_text='Whether new matching listings trigger notifications')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('city_ref', models.ForeignKey(blank=True, editable=False, help_text='Canonical city resolved from `city`', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='locations.city')),
+                ('district_ref', models.ForeignKey(blank=True, editable=False, help_text='Canonical district resolved from `district`', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='locations.district')),
+                ('user', models.ForeignKey(help_text='User who saved this search', on_delete=django.db.models.deletion.CASCADE, related_name='saved_searches', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'saved search',
+                'verbose_name_plural': 'saved searches',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SavedSearchIndexEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('animal_type', models.CharField(max_length=10)),
+                ('city_id', models.IntegerField()),
+                ('price_band', models.SmallIntegerField()),
+                ('age_band', models.SmallIntegerField()),
+                ('saved_search', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='index_entries', to='animals.savedsearch')),
+            ],
+            options={
+                'verbose_name': 'saved search index entry',
+                'verbose_name_plural': 'saved search index entries',
+                'indexes': [models.Index(fields=['animal_type', 'city_id', 'price_band', 'age_band'], name='saved_search_key_idx')],
+            },
+        ),
+    ]
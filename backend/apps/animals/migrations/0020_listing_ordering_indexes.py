@@ -0,0 +1,29 @@
+# Generated by Django 4.2.17 on 2026-10-17 03:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('animals', '0019_saved_searches'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='animallisting',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['price', 'id'], name='animal_active_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='animallisting',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['weight', 'id'], name='animal_active_weight_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='animallisting',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-view_count', '-id'], name='animal_active_views_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='animallisting',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['age_months', 'id'], name='animal_active_age_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.17 on 2026-10-17 03:33
+
+from django.conf import settings
+import django.core.serializers.json
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('animals', '0020_listing_ordering_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedListing',
+            fields=[
+                ('id', models.BigIntegerField(help_text='Id of the listing (kept on restore)', primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(help_text='When the listing was created')),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('listing', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder, help_text="The listing row, in Django's serialization format")),
+                ('images', models.JSONField(default=list, encoder=django.core.serializers.json.DjangoJSONEncoder, help_text='AnimalImage rows of the listing')),
+                ('related', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder, help_text='Favorite, interaction, conversation and message rows; linked appointment and partnership ids')),
+                ('seller', models.ForeignKey(help_text='The user who created the listing', on_delete=django.db.models.deletion.CASCADE, related_name='archived_listings', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'archived listing',
+                'verbose_name_plural': 'archived listings',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['seller', '-created_at'], name='archived_seller_created_idx')],
+            },
+        ),
+    ]
@@ -2,9 +2,41 @@
 Models for animals app.
 """
 
-from django.db import models
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.conf import settings
 
+from .storage import content_addressed_upload_to, get_image_storage
+
+
+class AnimalListingQuerySet(models.QuerySet):
+    """
+    QuerySet helpers for animal listings.
+    """
+    
+    def with_image_summary(self):
+        """
+        Annotate each listing with its card image data in the same query.
+        
+        - primary_image_variants: resized derivatives of the primary image
+          (first image by order if none is marked primary)
+        - image_count: number of images
+        """
+        images = AnimalImage.objects.filter(listing=OuterRef('pk'))
+        return self.annotate(
+            primary_image_variants=Subquery(
+                images.order_by('-is_primary', 'order', 'created_at').values('variants')[:1]
+            ),
+            image_count=Coalesce(
+                Subquery(
+                    images.order_by().values('listing').annotate(total=Count('pk')).values('total')
+                ),
+                0
+            ),
+        )
+
 
 class AnimalListing(models.Model):
     """
@@ -129,6 +161,26 @@ class AnimalListing(models.Model):
         help_text="İlçe (dropdown'dan seçilir)"
     )
     
+    city_ref = models.ForeignKey(
+        'locations.City',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name='+',
+        help_text="Canonical city resolved from `city`"
+    )
+    
+    district_ref = models.ForeignKey(
+        'locations.District',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name='+',
+        help_text="Canonical district resolved from `district`"
+    )
+    
     ear_tag_no = models.CharField(
         max_length=50,
         unique=True,
@@ -160,6 +212,8 @@ class AnimalListing(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
     
+    objects = AnimalListingQuerySet.as_manager()
+    
     def save(self, *args, **kwargs):
         """
         Save method override.
@@ -170,11 +224,73 @@ class AnimalListing(models.Model):
         verbose_name = 'animal listing'
         verbose_name_plural = 'animal listings'
         ordering = ['-created_at']
+        indexes = [
+            # Keyset pagination over the public feed and "my listings"
+            models.Index(fields=['is_active', '-created_at', '-id'], name='animal_active_created_idx'),
+            models.Index(fields=['seller', 'is_active', '-created_at', '-id'], name='animal_seller_created_idx'),
+            # City filter on the public feed
+            models.Index(fields=['city_ref', 'is_active', '-created_at', '-id'], name='animal_city_created_idx'),
+            # ?ordering= sorts on the public feed (see ListingOrderingFilter).
+            # Partial on active rows; -price scans animal_active_price_idx backwards.
+            # price and view_count are NOT NULL, so the cursor paginator orders
+            # them without NULLS FIRST/LAST and PostgreSQL can use these indexes.
+            models.Index(fields=['price', 'id'], name='animal_active_price_idx', condition=models.Q(is_active=True)),
+            models.Index(fields=['weight', 'id'], name='animal_active_weight_idx', condition=models.Q(is_active=True)),
+            models.Index(fields=['-view_count', '-id'], name='animal_active_views_idx', condition=models.Q(is_active=True)),
+            models.Index(fields=['age_months', 'id'], name='animal_active_age_idx', condition=models.Q(is_active=True)),
+        ]
     
     def __str__(self) -> str:
         return f"{self.animal_type} - {self.breed} by {self.seller.email}"
 
 
+class ImageBlob(models.Model):
+    """
+    One stored image file, shared by every AnimalImage with identical bytes.
+    
+    `ref_count` counts the images using the file; the file and its variants
+    are deleted when it drops to zero (see apps.animals.image_blobs).
+    The perceptual hash is split into four 16-bit bands so near-duplicate
+    lookups are indexed equality matches.
+    """
+    
+    sha256 = models.CharField(
+        max_length=64,
+        primary_key=True,
+        help_text="Hex SHA-256 of the file contents"
+    )
+    path = models.CharField(
+        max_length=255,
+        help_text="Storage path of the file"
+    )
+    size = models.PositiveIntegerField(
+        default=0,
+        help_text="File size in bytes"
+    )
+    ref_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of animal images using this file"
+    )
+    phash = models.CharField(
+        max_length=16,
+        blank=True,
+        default="",
+        help_text="64-bit difference hash as hex (set after processing)"
+    )
+    phash_band_0 = models.PositiveIntegerField(null=True, blank=True, db_index=True)
+    phash_band_1 = models.PositiveIntegerField(null=True, blank=True, db_index=True)
+    phash_band_2 = models.PositiveIntegerField(null=True, blank=True, db_index=True)
+    phash_band_3 = models.PositiveIntegerField(null=True, blank=True, db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = 'image blob'
+        verbose_name_plural = 'image blobs'
+    
+    def __str__(self) -> str:
+        return f"{self.path} ({self.ref_count} refs)"
+
+
 class AnimalImage(models.Model):
     """
     Represents an image for an animal listing.
@@ -190,9 +306,18 @@ class AnimalImage(models.Model):
         help_text="The animal listing this image belongs to"
     )
     image = models.ImageField(
-        upload_to='animal_images/',
+        upload_to=content_addressed_upload_to,
+        storage=get_image_storage,
         help_text="Image file"
     )
+    blob = models.ForeignKey(
+        ImageBlob,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='images',
+        help_text="Shared stored file (null for images uploaded before deduplication)"
+    )
     is_primary = models.BooleanField(
         default=False,
         help_text="Is this the primary image for the listing?"
@@ -201,6 +326,21 @@ class AnimalImage(models.Model):
         default=0,
         help_text="Display order of the image (0 = first)"
     )
+    width = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="Original image width in pixels (set after processing)"
+    )
+    height = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="Original image height in pixels (set after processing)"
+    )
+    variants = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Resized derivatives: {size: {'webp': path, 'jpg': path, 'width': w, 'height': h}}"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
@@ -218,12 +358,237 @@ class AnimalImage(models.Model):
         
         If this image is being set as primary, unset all other primary images
         for the same listing.
-        """
-        if self.is_primary:
-            # Unset other primary images for this listing
-            AnimalImage.objects.filter(
-                listing=self.listing,
-                is_primary=True
-            ).exclude(pk=self.pk).update(is_primary=False)
         
-        super().save(*args, **kwargs)
+        Runs in one transaction, which includes the pre_save signal that
+        takes a reference to the upload's blob: a failed INSERT doesn't
+        leak it.
+        """
+        with transaction.atomic():
+            if self.is_primary:
+                # Unset other primary images for this listing
+                AnimalImage.objects.filter(
+                    listing=self.listing,
+                    is_primary=True
+                ).exclude(pk=self.pk).update(is_primary=False)
+            
+            super().save(*args, **kwargs)
+
+
+class ListingSearchDocument(models.Model):
+    """
+    Search document for an animal listing.
+    
+    Holds Turkish-folded text built from the listing (see apps.animals.search)
+    and is kept in sync by signals. The database maintains its own full-text
+    index over this table: a GIN-indexed tsvector column on PostgreSQL and
+    an FTS5 virtual table on SQLite.
+    """
+    
+    listing = models.OneToOneField(
+        AnimalListing,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='search_document',
+        help_text="The listing this document indexes"
+    )
+    primary_text = models.TextField(
+        blank=True,
+        default="",
+        help_text="Folded title and breed (highest search weight)"
+    )
+    location_text = models.TextField(
+        blank=True,
+        default="",
+        help_text="Folded city, district and ear tag"
+    )
+    body_text = models.TextField(
+        blank=True,
+        default="",
+        help_text="Folded description (lowest search weight)"
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = 'listing search document'
+        verbose_name_plural = 'listing search documents'
+    
+    def __str__(self) -> str:
+        return f"Search document for listing {self.listing_id}"
+
+
+class ArchivedListing(models.Model):
+    """
+    A listing moved out of the live table (see apps.animals.archive).
+    
+    Holds the listing row and the rows hanging off it as serialized
+    snapshots, so restoring it brings everything back under the original
+    ids. Archived images keep their files and blob references.
+    """
+    
+    id = models.BigIntegerField(
+        primary_key=True,
+        help_text="Id of the listing (kept on restore)"
+    )
+    seller = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='archived_listings',
+        help_text="The user who created the listing"
+    )
+    created_at = models.DateTimeField(
+        help_text="When the listing was created"
+    )
+    archived_at = models.DateTimeField(auto_now_add=True)
+    listing = models.JSONField(
+        encoder=DjangoJSONEncoder,
+        help_text="The listing row, in Django's serialization format"
+    )
+    images = models.JSONField(
+        encoder=DjangoJSONEncoder,
+        default=list,
+        help_text="AnimalImage rows of the listing"
+    )
+    related = models.JSONField(
+        encoder=DjangoJSONEncoder,
+        default=dict,
+        help_text="Favorite, interaction, conversation and message rows; linked appointment and partnership ids"
+    )
+    
+    class Meta:
+        verbose_name = 'archived listing'
+        verbose_name_plural = 'archived listings'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['seller', '-created_at'], name='archived_seller_created_idx'),
+        ]
+    
+    def __str__(self) -> str:
+        return f"Archived listing {self.id}"
+
+
+class OrphanedMediaFile(models.Model):
+    """
+    A stored media file that no row references any more.
+    
+    Rows are written in the same transaction that drops the reference, so a
+    rolled-back delete never orphans a live file. The files themselves are
+    removed later, in batches, by apps.animals.media_gc.
+    """
+    
+    path = models.CharField(
+        max_length=500,
+        unique=True,
+        help_text="Storage-relative path of the file to delete"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = 'orphaned media file'
+        verbose_name_plural = 'orphaned media files'
+        ordering = ['id']
+    
+    def __str__(self) -> str:
+        return self.path
+
+
+class SavedSearch(models.Model):
+    """
+    A listing filter a user wants to be notified about.
+    
+    Fields mirror AnimalListingFilter parameters; empty fields match
+    anything. New listings are matched against saved searches through the
+    SavedSearchIndexEntry inverted index (see apps.animals.saved_searches).
+    """
+    
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='saved_searches',
+        help_text="User who saved this search"
+    )
+    name = models.CharField(
+        max_length=100,
+        blank=True,
+        default="",
+        help_text="Display name (örn: Ankara kurbanlık koç)"
+    )
+    animal_type = models.CharField(
+        max_length=10,
+        blank=True,
+        default="",
+        help_text="KUCUKBAS or BUYUKBAS; empty for any"
+    )
+    city = models.CharField(max_length=100, blank=True, default="")
+    district = models.CharField(max_length=100, blank=True, default="")
+    city_ref = models.ForeignKey(
+        'locations.City',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name='+',
+        help_text="Canonical city resolved from `city`"
+    )
+    district_ref = models.ForeignKey(
+        'locations.District',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name='+',
+        help_text="Canonical district resolved from `district`"
+    )
+    gender = models.CharField(max_length=10, blank=True, default="")
+    min_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    max_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    min_age = models.IntegerField(null=True, blank=True, help_text="Minimum age in months")
+    max_age = models.IntegerField(null=True, blank=True, help_text="Maximum age in months")
+    min_weight = models.DecimalField(max_digits=6, decimal_places=2, null=True, blank=True)
+    max_weight = models.DecimalField(max_digits=6, decimal_places=2, null=True, blank=True)
+    is_active = models.BooleanField(
+        default=True,
+        help_text="Whether new matching listings trigger notifications"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = 'saved search'
+        verbose_name_plural = 'saved searches'
+        ordering = ['-created_at']
+    
+    def __str__(self) -> str:
+        return f"{self.name or 'Saved search'} ({self.user.email})"
+
+
+class SavedSearchIndexEntry(models.Model):
+    """
+    Inverted index posting for a saved search.
+    
+    One row per (animal_type, city, price band, age band) combination the
+    search can match; ANY in a column means the search doesn't constrain
+    that dimension. A new listing looks up its own key plus ANY in each
+    column to get its candidate searches.
+    """
+    
+    ANY_TYPE = '*'
+    ANY = -1
+    
+    saved_search = models.ForeignKey(
+        SavedSearch,
+        on_delete=models.CASCADE,
+        related_name='index_entries'
+    )
+    animal_type = models.CharField(max_length=10)
+    city_id = models.IntegerField()
+    price_band = models.SmallIntegerField()
+    age_band = models.SmallIntegerField()
+    
+    class Meta:
+        verbose_name = 'saved search index entry'
+        verbose_name_plural = 'saved search index entries'
+        indexes = [
+            models.Index(fields=['animal_type', 'city_id', 'price_band', 'age_band'], name='saved_search_key_idx'),
+        ]
+    
+    def __str__(self) -> str:
+        return f"{self.animal_type}/{self.city_id}/{self.price_band}/{self.age_band} -> {self.saved_search_id}"
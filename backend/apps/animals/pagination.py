@@ -2,18 +2,300 @@
 Pagination classes for animals app.
 """
 
-from rest_framework.pagination import PageNumberPagination
+import json
+import operator
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import date, datetime
+from decimal import Decimal
+from functools import reduce
+from typing import Any, List, Optional, Tuple
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import connections
+from django.db.models import F, Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def estimate_count(queryset: QuerySet, limit: int = 1000) -> int:
+    """
+    Cheap row count estimate for a filtered queryset.
+
+    - PostgreSQL: planner row estimate from EXPLAIN (no table scan)
+    - Others: exact count capped at `limit`
+    """
+    queryset = queryset.order_by()
+    connection = connections[queryset.db]
+
+    if connection.vendor == 'postgresql':
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+
+    return queryset.values('pk')[:limit].count()
+
+
+def ordering_keys(queryset: QuerySet) -> List[Tuple[str, bool]]:
+    """
+    [(name, descending), ...] for the queryset ordering, ending with id.
+
+    These are the columns a cursor encodes; .values() querysets paginated
+    with a cursor must include them.
+    """
+    ordering = list(queryset.query.order_by)
+    if not ordering and queryset.query.default_ordering:
+        ordering = list(queryset.model._meta.ordering)
+    if not ordering or not all(isinstance(term, str) for term in ordering):
+        ordering = ['-created_at']
+
+    keys = []
+    for term in ordering:
+        descending = term.startswith('-')
+        name = term.lstrip('-')
+        if name in ('pk', 'id'):
+            break
+        keys.append((name, descending))
+
+    # Tie-break on id in the direction of the last key
+    keys.append(('id', keys[-1][1] if keys else True))
+    return keys
+
+
+class ListingCursorPagination(BasePagination):
+    """
+    Keyset (cursor) pagination for animal listings.
+
+    - Keyed on the queryset ordering plus `id` as tie-breaker, e.g.
+      (created_at, id) for the default ordering
+    - No COUNT(*) and no OFFSET: every page is an index range scan
+    - Response contains next, previous, results
+    - ?approx_count=true adds `approximate_count` from planner statistics
+    """
+
+    cursor_query_param = 'cursor'
+    approx_count_query_param = 'approx_count'
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 50
+    approx_count_limit = 1000
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = remove_query_param(request.build_absolute_uri(), 'page')
+        self.page_size = self.get_page_size(request)
+        self.model = queryset.model
+        self.keys = self.get_ordering_keys(queryset)
+
+        values, self.reverse = self.decode_cursor(request)
+
+        self.approximate_count = None
+        if request.query_params.get(self.approx_count_query_param) == 'true':
+            self.approximate_count = estimate_count(queryset, self.approx_count_limit)
+
+        # Scan direction flips for "previous" pages; NULLs always sort last
+        # in the forward direction so both scans see the same sequence.
+        scan = [(name, descending != self.reverse) for name, descending in self.keys]
+        nulls_last = not self.reverse
+
+        queryset = queryset.order_by(*[
+            self.order_expression(queryset, name, descending, nulls_last)
+            for name, descending in scan
+        ])
+        if values is not None:
+            queryset = queryset.filter(self.build_keyset_filter(queryset, scan, values, nulls_last))
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if self.reverse:
+            rows.reverse()
+
+        if self.reverse:
+            self.has_next = values is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = values is not None
+
+        self.page = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        payload = {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+        }
+        if self.approximate_count is not None:
+            payload['approximate_count'] = self.approximate_count
+        payload['results'] = data
+        return Response(payload)
+
+    def get_page_size(self, request) -> int:
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def get_ordering_keys(self, queryset) -> List[Tuple[str, bool]]:
+        """
+        Return [(name, descending), ...] for the queryset ordering, ending with id.
+        """
+        return ordering_keys(queryset)
+
+    def build_keyset_filter(self, queryset, scan, values, nulls_last) -> Q:
+        """
+        Rows strictly after `values` in scan order.
+
+        Expands the tuple comparison into
+        (k1 > v1) OR (k1 = v1 AND k2 > v2) OR ...
+        with a leading range bound on k1 so the database can seek the index.
+        """
+        branches = []
+        equal_prefix = Q()
+
+        for (name, descending), value in zip(scan, values):
+            nullable = self.is_nullable(queryset, name)
+
+            if value is None:
+                after = Q(**{f'{name}__isnull': False}) if not nulls_last else None
+                equal = Q(**{f'{name}__isnull': True})
+            else:
+                after = Q(**{f'{name}__lt' if descending else f'{name}__gt': value})
+                if nullable and nulls_last:
+                    after |= Q(**{f'{name}__isnull': True})
+                equal = Q(**{name: value})
+
+            if after is not None:
+                branches.append(equal_prefix & after)
+            equal_prefix &= equal
+
+        if not branches:
+            return Q(pk__in=[])
+        condition = reduce(operator.or_, branches)
+
+        first_name, first_descending = scan[0]
+        if values[0] is not None and not self.is_nullable(queryset, first_name):
+            lookup = f'{first_name}__lte' if first_descending else f'{first_name}__gte'
+            condition = Q(**{lookup: values[0]}) & condition
+
+        return condition
+
+    def order_expression(self, queryset, name, descending, nulls_last):
+        """
+        ORDER BY term for one key.
+
+        NULLS FIRST/LAST only for nullable keys: PostgreSQL doesn't use an
+        index whose NULL placement differs from the ORDER BY, even on a
+        NOT NULL column, so e.g. -created_at must stay plain DESC to scan
+        animal_active_created_idx.
+        """
+        nulls = {}
+        if self.is_nullable(queryset, name):
+            nulls = {'nulls_last': True} if nulls_last else {'nulls_first': True}
+        return F(name).desc(**nulls) if descending else F(name).asc(**nulls)
+
+    def is_nullable(self, queryset, name) -> bool:
+        """Whether a key can hold NULL; annotations are treated as non-null."""
+        try:
+            return queryset.model._meta.get_field(name).null
+        except FieldDoesNotExist:
+            return False
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self) -> Optional[str]:
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def encode_cursor(self, instance, reverse: bool) -> str:
+        # Pages of .values() rows are dicts
+        if isinstance(instance, dict):
+            values = [self._to_json(instance[name]) for name, _ in self.keys]
+        else:
+            values = [self._to_json(getattr(instance, name)) for name, _ in self.keys]
+        payload = json.dumps({'v': values, 'r': int(reverse)}, separators=(',', ':'))
+        token = urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request) -> Tuple[Optional[List[Any]], bool]:
+        """
+        Return (values, reverse) for the cursor param; (None, False) for the first page.
+        """
+        token = request.query_params.get(self.cursor_query_param, '')
+        if not token:
+            return None, False
+
+        try:
+            padded = token + '=' * (-len(token) % 4)
+            payload = json.loads(urlsafe_b64decode(padded.encode()).decode())
+            raw_values = payload['v']
+            reverse = bool(payload.get('r'))
+            if len(raw_values) != len(self.keys):
+                raise ValueError
+            values = [
+                self._from_json(name, value)
+                for (name, _), value in zip(self.keys, raw_values)
+            ]
+        except (TypeError, ValueError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return values, reverse
+
+    def _to_json(self, value):
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        if isinstance(value, Decimal):
+            return str(value)
+        return value
+
+    def _from_json(self, name, value):
+        if value is None:
+            return None
+        try:
+            field = self.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            # Annotation (e.g. search_rank): JSON value is used as-is
+            return value
+        return field.to_python(value)
 
 
 class AnimalListingPagination(PageNumberPagination):
     """
     Pagination for animal listings.
-    
+
     - Default page size: 10
     - Client can override with ?page_size= (max 50)
     - Standard pagination response with count, next, previous, results
+    - Opt-in keyset mode with ?cursor= (see ListingCursorPagination)
     """
-    
+
     page_size = 10
     page_size_query_param = 'page_size'
     max_page_size = 50
+    cursor_pagination_class = ListingCursorPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_paginator = None
+        if self.cursor_pagination_class.cursor_query_param in request.query_params:
+            self.cursor_paginator = self.cursor_pagination_class()
+            return self.cursor_paginator.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -0,0 +1,330 @@
+"""
+Read-only serializers that render straight from .values() rows.
+
+A DRF ModelSerializer builds a model instance per row and then walks every
+field through get_attribute()/to_representation(), with SkipField handling
+and SerializerMethodField dispatch. On high-volume list endpoints that
+dominates the request. A RowSerializer declares its output keys up front.
+Each key names the columns it reads and gets a transform compiled once per
+serializer, so rendering a row is a single pass over (key, getter) pairs.
+
+Output matches the corresponding ModelSerializer byte for byte: same key
+order, DRF's decimal and datetime formats, and None passed through.
+`manage.py benchmark_serializers` checks this and measures the difference.
+"""
+
+import decimal
+from typing import Callable, Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from rest_framework.response import Response
+
+from .image_processing import schedule_missing_variants
+from .view_counter import view_counter
+
+
+def decimal_string(max_digits: int, decimal_places: int) -> Callable:
+    """Same output as a DRF DecimalField with COERCE_DECIMAL_TO_STRING."""
+    context = decimal.getcontext().copy()
+    context.prec = max_digits
+    exponent = decimal.Decimal('.1') ** decimal_places
+
+    def transform(value):
+        if not isinstance(value, decimal.Decimal):
+            value = decimal.Decimal(str(value).strip())
+        return f'{value.quantize(exponent, context=context):f}'
+    return transform
+
+
+def iso_datetime(value) -> Optional[str]:
+    """Same output as a DRF DateTimeField with the default ISO 8601 format."""
+    if not value:
+        return None
+    if settings.USE_TZ:
+        current = timezone.get_current_timezone()
+        value = value.astimezone(current) if timezone.is_aware(value) else timezone.make_aware(value, current)
+    text = value.isoformat()
+    return text[:-6] + 'Z' if text.endswith('+00:00') else text
+
+
+class RowField:
+    """
+    Output key read from one column (`source`, default: the key itself).
+
+    `transform` is applied to non-None values. Optional fields are only
+    rendered when the queryset has an annotation of that name, like DRF
+    skipping a read-only field whose attribute is missing.
+    """
+
+    def __init__(self, source: Optional[str] = None, transform: Optional[Callable] = None,
+                 optional: bool = False):
+        self.source = source
+        self.transform = transform
+        self.optional = optional
+
+    def columns(self, name: str) -> List[str]:
+        return [self.source or name]
+
+    def compile(self, name: str, serializer: 'RowSerializer', prefix: str) -> Callable:
+        key = prefix + (self.source or name)
+        transform = self.transform
+        if transform is None:
+            return lambda row: row[key]
+        return lambda row: None if row[key] is None else transform(row[key])
+
+
+class MethodField(RowField):
+    """Output key computed by the serializer's `get_<name>(row)` from `columns`."""
+
+    def __init__(self, *columns: str):
+        super().__init__()
+        self._columns = list(columns)
+
+    def columns(self, name: str) -> List[str]:
+        return list(self._columns)
+
+    def compile(self, name: str, serializer: 'RowSerializer', prefix: str) -> Callable:
+        method = getattr(serializer, f'get_{name}')
+        if not prefix:
+            return method
+        keys = [(prefix + column, column) for column in self._columns]
+        return lambda row: method({column: row[key] for key, column in keys})
+
+
+class NestedField(RowField):
+    """
+    Nested object rendered by another RowSerializer.
+
+    With `prefix` its columns are read from the same row through a join
+    (e.g. 'animal__'); with `source` the row holds the nested row under
+    that key.
+    """
+
+    def __init__(self, serializer_class, prefix: Optional[str] = None, source: Optional[str] = None):
+        super().__init__(source=source)
+        self.serializer_class = serializer_class
+        self.prefix = prefix
+
+    def columns(self, name: str) -> List[str]:
+        if self.prefix is None:
+            return []
+        return [self.prefix + column for column in self.serializer_class.columns()]
+
+    def bind(self, serializer: 'RowSerializer', prefix: str) -> 'RowSerializer':
+        if self.prefix is None:
+            return self.serializer_class(context=serializer.context)
+        return self.serializer_class(context=serializer.context, prefix=prefix + self.prefix)
+
+    def compile(self, name: str, serializer: 'RowSerializer', prefix: str) -> Callable:
+        child = serializer.children[name]
+        if self.prefix is not None:
+            return child.to_representation
+        key = self.source or name
+        return lambda row: child.to_representation(row[key])
+
+
+class RowSerializer:
+    """
+    Declarative read-only serializer over dict rows.
+
+    Declare RowField/MethodField/NestedField class attributes in output
+    order. `fields` limits the output to those keys; optional fields are
+    only included when their column is in `annotations`.
+    """
+
+    declared_fields: Dict[str, RowField] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        declared = dict(cls.declared_fields)
+        declared.update((name, value) for name, value in vars(cls).items() if isinstance(value, RowField))
+        cls.declared_fields = declared
+
+    def __init__(self, context: Optional[dict] = None, fields: Optional[Iterable[str]] = None,
+                 annotations: Iterable[str] = (), prefix: str = ''):
+        self.context = context or {}
+        self.field_names = self.select_fields(fields, annotations)
+        self.children = {
+            name: field.bind(self, prefix)
+            for name, field in self.declared_fields.items()
+            if name in self.field_names and isinstance(field, NestedField)
+        }
+        self._getters = [
+            (name, self.declared_fields[name].compile(name, self, prefix))
+            for name in self.field_names
+        ]
+
+    @classmethod
+    def select_fields(cls, fields: Optional[Iterable[str]] = None,
+                      annotations: Iterable[str] = ()) -> List[str]:
+        selected = None if fields is None else set(fields)
+        annotations = set(annotations)
+        return [
+            name for name, field in cls.declared_fields.items()
+            if (selected is None or name in selected)
+            and (not field.optional or field.columns(name)[0] in annotations)
+        ]
+
+    @classmethod
+    def columns(cls, fields: Optional[Iterable[str]] = None,
+                annotations: Iterable[str] = ()) -> List[str]:
+        """Columns (.values() names) the selected fields read, in declaration order."""
+        columns = []
+        for name in cls.select_fields(fields, annotations):
+            columns.extend(cls.declared_fields[name].columns(name))
+        return list(dict.fromkeys(columns))
+
+    @classmethod
+    def for_queryset(cls, queryset, context: Optional[dict] = None,
+                     fields: Optional[Iterable[str]] = None) -> 'RowSerializer':
+        """Serializer for `queryset`, with the optional fields it has annotations for."""
+        return cls(context=context, fields=fields, annotations=queryset.query.annotations)
+
+    def values(self, queryset, extra_columns: Iterable[str] = ()):
+        """`queryset` as rows holding exactly the columns this serializer reads."""
+        columns = [
+            column
+            for name in self.field_names
+            for column in self.declared_fields[name].columns(name)
+        ]
+        return queryset.values(*dict.fromkeys(columns + list(extra_columns)))
+
+    def prepare(self, rows: List[dict]) -> None:
+        """Per-page lookups before rendering (e.g. batched counters); nested serializers included."""
+        for name, child in self.children.items():
+            field = self.declared_fields[name]
+            if field.prefix is None:
+                child.prepare([row[field.source or name] for row in rows])
+            else:
+                child.prepare(rows)
+
+    def to_representation(self, row: dict) -> dict:
+        return {name: getter(row) for name, getter in self._getters}
+
+    def serialize(self, rows: Iterable[dict]) -> List[dict]:
+        rows = list(rows)
+        self.prepare(rows)
+        to_representation = self.to_representation
+        return [to_representation(row) for row in rows]
+
+
+class RowListMixin:
+    """
+    list() rendered by `row_serializer_class` instead of the ModelSerializer.
+
+    Mirrors ListModelMixin.list, paginating the .values() queryset.
+    """
+
+    row_serializer_class = None
+
+    def get_row_serializer(self, queryset) -> RowSerializer:
+        return self.row_serializer_class.for_queryset(queryset, context=self.get_serializer_context())
+
+    def get_row_extra_columns(self, queryset) -> List[str]:
+        """Columns to fetch besides the serialized ones (e.g. pagination keys)."""
+        return []
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        serializer = self.get_row_serializer(queryset)
+        rows = serializer.values(queryset, self.get_row_extra_columns(queryset))
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(serializer.serialize(page))
+        return Response(serializer.serialize(rows))
+
+
+def format_age(age_months: Optional[int]) -> Optional[str]:
+    """
+    Format age_months as human-readable string.
+    - < 12 months: "X ay"
+    - >= 12 months: "Y yaş" or "Y yaş Z ay"
+    """
+    if age_months is None:
+        return None
+
+    if age_months < 12:
+        return f"{age_months} ay"
+
+    years = age_months // 12
+    months = age_months % 12
+
+    if months == 0:
+        return f"{years} yaş"
+    return f"{years} yaş {months} ay"
+
+
+def thumbnail_path(variants: Optional[dict]) -> Optional[str]:
+    """
+    The WebP thumbnail variant; None until processed, since the original
+    upload may still carry EXIF (GPS etc.).
+    """
+    thumbnail = (variants or {}).get('thumbnail')
+    if thumbnail:
+        return thumbnail['webp']
+    return None
+
+
+class ListingRowSerializer(RowSerializer):
+    """
+    Row version of AnimalListingSerializer (same keys, same output).
+
+    Rows need the with_image_summary() annotations for the image fields.
+    """
+
+    id = RowField()
+    seller = RowField()
+    seller_email = RowField('seller__email')
+    seller_username = RowField('seller__username')
+    seller_phone_number = RowField('seller__phone_number')
+    title = RowField()
+    species = RowField()
+    animal_type = RowField()
+    breed = RowField()
+    gender = RowField()
+    age_months = RowField()
+    age_display = MethodField('age_months')
+    weight = RowField(transform=decimal_string(6, 2))
+    price = RowField(transform=decimal_string(10, 2))
+    location = RowField()
+    city = RowField()
+    district = RowField()
+    ear_tag_no = RowField()
+    company = RowField()
+    description = RowField()
+    is_active = RowField()
+    view_count = MethodField('view_count', 'id')
+    thumbnail_url = MethodField('id', 'primary_image_variants')
+    image_count = RowField()
+    distance_km = RowField(transform=float, optional=True)
+    created_at = RowField(transform=iso_datetime)
+
+    pending_views: Dict[int, int] = {}
+
+    def prepare(self, rows):
+        super().prepare(rows)
+        if 'view_count' in self.field_names:
+            self.pending_views = view_counter.pending_many([row['id'] for row in rows])
+
+    def get_age_display(self, row):
+        return format_age(row['age_months'])
+
+    def get_view_count(self, row):
+        """Add views still buffered by the view counter."""
+        pending = self.pending_views.get(row['id'], 0)
+        if pending:
+            return (row['view_count'] or 0) + pending
+        return row['view_count']
+
+    def get_thumbnail_url(self, row):
+        path = thumbnail_path(row['primary_image_variants'])
+        if not path:
+            if row['primary_image_variants'] is not None:
+                schedule_missing_variants(row['id'])
+            return None
+        url = default_storage.url(path)
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
@@ -0,0 +1,227 @@
+"""
+Saved searches matched incrementally against new listings.
+
+Each SavedSearch is expanded into SavedSearchIndexEntry postings keyed by
+(animal_type, city, price band, age band), using the facet buckets as
+bands; unconstrained dimensions are stored as ANY. A new listing has
+exactly one key, so its candidate searches are one indexed lookup over
+the 2^4 combinations of "its value or ANY". Only those candidates are
+checked against the full predicate (gender, district, exact ranges) and
+matching users get NEW_LISTING_MATCH notifications in one bulk INSERT.
+"""
+
+from itertools import product
+from typing import Dict, List, Optional
+
+from django.db import transaction
+
+from apps.notifications.models import Notification
+from apps.realtime.events import publish_notifications
+from .facets import AGE_BUCKETS, ANIMAL_TYPE_GROUPS, PRICE_BUCKETS
+from .models import AnimalListing, SavedSearch, SavedSearchIndexEntry
+
+ANY_TYPE = SavedSearchIndexEntry.ANY_TYPE
+ANY = SavedSearchIndexEntry.ANY
+
+# Filter parameters a saved search stores (AnimalListingFilter names)
+SEARCH_PARAMS = [
+    'animal_type', 'city', 'district', 'gender',
+    'min_price', 'max_price', 'min_age', 'max_age', 'min_weight', 'max_weight',
+]
+
+MAX_SAVED_SEARCHES = 20
+
+
+def normalize_animal_type(value: Optional[str]) -> str:
+    """Map any accepted type code (SMALL, KUCUKBAS, SMALL_GROUP, ...) to its group."""
+    value = (value or '').upper().strip()
+    for group, codes in ANIMAL_TYPE_GROUPS.items():
+        if value == group or value in codes or value == f"{codes[0]}_GROUP":
+            return group
+    return value
+
+
+def band_of(value, buckets) -> Optional[int]:
+    """Index of the [low, high) bucket containing value, None if none does."""
+    if value is None:
+        return None
+    for index, (low, high) in enumerate(buckets):
+        if value >= low and (high is None or value < high):
+            return index
+    return None
+
+
+def bands_between(low, high, buckets) -> List[int]:
+    """Bucket indexes overlapping the inclusive range [low, high]; [ANY] if unbounded."""
+    if low is None and high is None:
+        return [ANY]
+    return [
+        index for index, (bucket_low, bucket_high) in enumerate(buckets)
+        if (low is None or bucket_high is None or bucket_high > low)
+        and (high is None or bucket_low <= high)
+    ]
+
+
+def listing_key(listing: AnimalListing) -> Dict[str, object]:
+    """The listing's value in every indexed dimension."""
+    return {
+        'animal_type': normalize_animal_type(listing.animal_type),
+        'city_id': listing.city_ref_id,
+        'price_band': band_of(listing.price, PRICE_BUCKETS),
+        'age_band': band_of(listing.age_months, AGE_BUCKETS),
+    }
+
+
+def index_saved_search(search: SavedSearch) -> int:
+    """Rebuild the postings of a saved search; returns how many were written."""
+    types = [search.animal_type] if search.animal_type else [ANY_TYPE]
+    # Names that don't resolve are checked exactly on candidates instead
+    cities = [search.city_ref_id] if search.city_ref_id else [ANY]
+    prices = bands_between(search.min_price, search.max_price, PRICE_BUCKETS)
+    ages = bands_between(search.min_age, search.max_age, AGE_BUCKETS)
+
+    entries = [
+        SavedSearchIndexEntry(
+            saved_search=search,
+            animal_type=animal_type,
+            city_id=city_id,
+            price_band=price_band,
+            age_band=age_band
+        )
+        for animal_type, city_id, price_band, age_band in product(types, cities, prices, ages)
+    ]
+    with transaction.atomic():
+        SavedSearchIndexEntry.objects.filter(saved_search=search).delete()
+        SavedSearchIndexEntry.objects.bulk_create(entries)
+    return len(entries)
+
+
+def _candidate_ids(key: Dict[str, object]):
+    """Ids of saved searches whose postings cover a listing key."""
+    def with_any(value, any_value):
+        return [any_value] if value is None else [value, any_value]
+
+    return SavedSearchIndexEntry.objects.filter(
+        animal_type__in=with_any(key['animal_type'] or None, ANY_TYPE),
+        city_id__in=with_any(key['city_id'], ANY),
+        price_band__in=with_any(key['price_band'], ANY),
+        age_band__in=with_any(key['age_band'], ANY),
+    ).values('saved_search_id')
+
+
+def candidate_searches(listing: AnimalListing):
+    """Active saved searches whose postings cover the listing's key."""
+    return SavedSearch.objects.filter(pk__in=_candidate_ids(listing_key(listing)), is_active=True)
+
+
+def _in_range(value, low, high) -> bool:
+    if low is None and high is None:
+        return True
+    if value is None:
+        return False
+    return (low is None or value >= low) and (high is None or value <= high)
+
+
+def search_matches(search: SavedSearch, listing: AnimalListing) -> bool:
+    """Evaluate the full saved-search predicate against a listing."""
+    if search.animal_type and normalize_animal_type(listing.animal_type) != search.animal_type:
+        return False
+    if search.city:
+        if search.city_ref_id:
+            if listing.city_ref_id != search.city_ref_id:
+                return False
+        elif (listing.city or '').strip().lower() != search.city.strip().lower():
+            return False
+    if search.district:
+        if search.district_ref_id:
+            if listing.district_ref_id != search.district_ref_id:
+                return False
+        elif (listing.district or '').strip().lower() != search.district.strip().lower():
+            return False
+    if search.gender and (listing.gender or '').lower() != search.gender.lower():
+        return False
+    return (
+        _in_range(listing.price, search.min_price, search.max_price) and
+        _in_range(listing.age_months, search.min_age, search.max_age) and
+        _in_range(listing.weight, search.min_weight, search.max_weight)
+    )
+
+
+def _match_notification(listing: AnimalListing, search: SavedSearch) -> Notification:
+    title = listing.title or listing.breed or 'Yeni ilan'
+    return Notification(
+        user_id=search.user_id,
+        type=Notification.NEW_LISTING_MATCH,
+        title='Aramanıza Uyan Yeni İlan',
+        message=f'"{search.name or "Kayıtlı arama"}" aramanıza uyan yeni ilan: {title}',
+        data={
+            'listing_id': listing.id,
+            'saved_search_id': search.id,
+        }
+    )
+
+
+def notify_saved_search_matches(listing: AnimalListing) -> int:
+    """
+    Notify owners of saved searches matching a new listing.
+
+    One notification per user (their first matching search), never to the
+    listing's own seller. Returns the number of notifications created.
+    """
+    matched: Dict[int, SavedSearch] = {}
+    for search in candidate_searches(listing).exclude(user_id=listing.seller_id).order_by('pk'):
+        if search.user_id not in matched and search_matches(search, listing):
+            matched[search.user_id] = search
+
+    notifications = [_match_notification(listing, search) for search in matched.values()]
+    Notification.objects.bulk_create(notifications)
+    publish_notifications(notifications)
+    return len(notifications)
+
+
+def notify_saved_search_matches_bulk(listings: List[AnimalListing]) -> int:
+    """
+    notify_saved_search_matches() for many new listings at once.
+
+    Listings sharing an index key share one candidate lookup, so a bulk
+    import costs one query per distinct (type, city, price band, age band)
+    plus one to load the candidates and one INSERT.
+    """
+    by_key: Dict[tuple, List[AnimalListing]] = {}
+    for listing in listings:
+        key = listing_key(listing)
+        by_key.setdefault(tuple(sorted(key.items())), []).append(listing)
+
+    candidate_ids = {
+        key: set(_candidate_ids(dict(key)).values_list('saved_search_id', flat=True))
+        for key in by_key
+    }
+    searches = SavedSearch.objects.filter(
+        pk__in=set().union(*candidate_ids.values()), is_active=True
+    ).in_bulk()
+
+    notifications = []
+    for key, key_listings in by_key.items():
+        candidates = [searches[pk] for pk in sorted(candidate_ids[key]) if pk in searches]
+        for listing in key_listings:
+            notified = set()
+            for search in candidates:
+                if search.user_id == listing.seller_id or search.user_id in notified:
+                    continue
+                if search_matches(search, listing):
+                    notified.add(search.user_id)
+                    notifications.append(_match_notification(listing, search))
+
+    Notification.objects.bulk_create(notifications, batch_size=500)
+    publish_notifications(notifications)
+    return len(notifications)
+
+
+def search_query_params(search: SavedSearch) -> Dict[str, str]:
+    """The saved search as list endpoint query parameters."""
+    params = {}
+    for name in SEARCH_PARAMS:
+        value = getattr(search, name)
+        if value not in (None, ''):
+            params[name] = str(value)
+    return params
@@ -0,0 +1,158 @@
+"""
+Full-text search for animal listings.
+
+Every listing has a ListingSearchDocument holding Turkish-folded text.
+The database indexes that table natively:
+- PostgreSQL: generated `search_vector` tsvector column with a GIN index
+- SQLite: `animals_listingsearchindex` FTS5 table synced by triggers
+Other backends fall back to icontains over the folded columns.
+
+Both documents and queries go through fold_turkish(), so "KOÇ", "koç"
+and "koc" all match the same listings.
+"""
+
+import re
+from typing import Dict, List, Optional
+
+from django.db import connections
+from django.db.models import Q, QuerySet
+from django.db.models.expressions import RawSQL
+
+from .models import AnimalListing, ListingSearchDocument
+
+# Python's str.lower() maps 'I' to 'i' and 'İ' to 'i̇' (with a combining dot),
+# so the Turkish dotted/dotless pair is handled before lowercasing.
+_TURKISH_LOWER = str.maketrans({'I': 'ı', 'İ': 'i'})
+_ASCII_FOLD = str.maketrans('çğıöşüâîû', 'cgiosuaiu')
+_TOKEN_RE = re.compile(r'\w+')
+
+# Keep pathological queries cheap
+MAX_QUERY_TERMS = 8
+
+DOCUMENT_TABLE = ListingSearchDocument._meta.db_table
+FTS_TABLE = 'animals_listingsearchindex'
+
+
+def fold_turkish(text: Optional[str]) -> str:
+    """
+    Lowercase text with Turkish rules and strip Turkish diacritics.
+
+    Example: "İstanbul Şişli KOÇ" -> "istanbul sisli koc"
+    """
+    if not text:
+        return ''
+    return text.translate(_TURKISH_LOWER).lower().translate(_ASCII_FOLD)
+
+
+def tokenize_query(query: Optional[str]) -> List[str]:
+    """Split a raw search string into folded terms."""
+    return _TOKEN_RE.findall(fold_turkish(query))[:MAX_QUERY_TERMS]
+
+
+def build_document_fields(listing: AnimalListing) -> Dict[str, str]:
+    """Build ListingSearchDocument column values for a listing."""
+    def join(*parts):
+        return fold_turkish(' '.join(p for p in parts if p))
+
+    return {
+        'primary_text': join(listing.title, listing.breed),
+        'location_text': join(listing.city, listing.district, listing.ear_tag_no),
+        'body_text': join(listing.description),
+    }
+
+
+def index_listing(listing: AnimalListing) -> None:
+    """Create or refresh the search document for a listing."""
+    ListingSearchDocument.objects.update_or_create(
+        listing=listing,
+        defaults=build_document_fields(listing)
+    )
+
+
+class BaseSearchBackend:
+    """Filters and ranks a listing queryset by folded search terms."""
+
+    def search(self, queryset: QuerySet, terms: List[str]) -> QuerySet:
+        raise NotImplementedError
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """tsvector/GIN search with ts_rank ordering and prefix matching."""
+
+    def search(self, queryset, terms):
+        tsquery = ' & '.join(f'{term}:*' for term in terms)
+        listing_table = queryset.model._meta.db_table
+
+        matches = RawSQL(
+            f"SELECT listing_id FROM {DOCUMENT_TABLE} "
+            f"WHERE search_vector @@ to_tsquery('simple', %s)",
+            (tsquery,)
+        )
+        rank = RawSQL(
+            f"SELECT ts_rank(d.search_vector, to_tsquery('simple', %s)) "
+            f"FROM {DOCUMENT_TABLE} d WHERE d.listing_id = {listing_table}.id",
+            (tsquery,)
+        )
+        return queryset.filter(pk__in=matches).annotate(
+            search_rank=rank
+        ).order_by('-search_rank', '-created_at')
+
+
+class SQLiteSearchBackend(BaseSearchBackend):
+    """FTS5 search with bm25 ordering (title > location > description)."""
+
+    def search(self, queryset, terms):
+        match = ' '.join(f'"{term}"*' for term in terms)
+        listing_table = queryset.model._meta.db_table
+
+        matches = RawSQL(
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s",
+            (match,)
+        )
+        # bm25() is lower-is-better, negate it so ordering matches Postgres
+        rank = RawSQL(
+            f"SELECT -bm25({FTS_TABLE}, 10.0, 4.0, 1.0) FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s AND rowid = {listing_table}.id",
+            (match,)
+        )
+        return queryset.filter(pk__in=matches).annotate(
+            search_rank=rank
+        ).order_by('-search_rank', '-created_at')
+
+
+class FallbackSearchBackend(BaseSearchBackend):
+    """Unindexed icontains search over the folded document columns."""
+
+    def search(self, queryset, terms):
+        for term in terms:
+            queryset = queryset.filter(
+                Q(search_document__primary_text__icontains=term) |
+                Q(search_document__location_text__icontains=term) |
+                Q(search_document__body_text__icontains=term)
+            )
+        return queryset
+
+
+SEARCH_BACKENDS = {
+    'postgresql': PostgresSearchBackend,
+    'sqlite': SQLiteSearchBackend,
+}
+
+
+def get_search_backend(using: str = 'default') -> BaseSearchBackend:
+    """Return the search backend for a database alias."""
+    vendor = connections[using].vendor
+    return SEARCH_BACKENDS.get(vendor, FallbackSearchBackend)()
+
+
+def search_listings(queryset: QuerySet, query: Optional[str]) -> QuerySet:
+    """
+    Apply a free-text search to a listing queryset.
+
+    Every term must match (as a prefix) somewhere in the listing.
+    Returns the queryset unchanged when the query has no usable terms.
+    """
+    terms = tokenize_query(query)
+    if not terms:
+        return queryset
+    return get_search_backend(queryset.db).search(queryset, terms)
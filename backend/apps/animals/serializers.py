@@ -2,8 +2,30 @@
 Serializers for animals app.
 """
 
+from typing import List, Optional
+
+from django.core.files.storage import default_storage
 from rest_framework import serializers
-from .models import AnimalListing
+from .facets import ANIMAL_TYPE_GROUPS
+from .image_processing import schedule_missing_variants
+from .models import AnimalListing, SavedSearch
+from .row_serializers import format_age, thumbnail_path
+from .saved_searches import MAX_SAVED_SEARCHES, normalize_animal_type, search_query_params
+from .view_counter import view_counter
+
+
+class AnimalListingListSerializer(serializers.ListSerializer):
+    """
+    List serializer that looks up buffered view counts for the whole page at once.
+    """
+    
+    def to_representation(self, data):
+        items = list(data.all() if hasattr(data, 'all') else data)
+        self.child.pending_views = view_counter.pending_many([obj.pk for obj in items])
+        try:
+            return super().to_representation(items)
+        finally:
+            self.child.pending_views = None
 
 
 class AnimalListingSerializer(serializers.ModelSerializer):
@@ -17,6 +39,10 @@ class AnimalListingSerializer(serializers.ModelSerializer):
     seller_username = serializers.CharField(source='seller.username', read_only=True)
     seller_phone_number = serializers.CharField(source='seller.phone_number', read_only=True)
     age_display = serializers.SerializerMethodField()
+    thumbnail_url = serializers.SerializerMethodField()
+    image_count = serializers.SerializerMethodField()
+    # Only present on ?near= queries (ProximityFilter annotation)
+    distance_km = serializers.FloatField(read_only=True)
     
     class Meta:
         model = AnimalListing
@@ -43,31 +69,68 @@ class AnimalListingSerializer(serializers.ModelSerializer):
             'description',
             'is_active',
             'view_count',
+            'thumbnail_url',
+            'image_count',
+            'distance_km',
             'created_at',
         ]
         read_only_fields = ['id', 'seller', 'created_at']
+        list_serializer_class = AnimalListingListSerializer
     
-    def get_age_display(self, obj):
-        """
-        Format age_months as human-readable string.
-        - < 12 months: "X ay"
-        - >= 12 months: "Y yaş" or "Y yaş Z ay"
+    pending_views = None
+    
+    def __init__(self, *args, fields=None, **kwargs):
+        """`fields` limits the output to those field names (sparse fieldsets)."""
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+    
+    def to_representation(self, instance):
+        """Add views still buffered by the view counter to view_count."""
+        data = super().to_representation(instance)
+        if 'view_count' not in data:
+            return data
+        if self.pending_views is not None:
+            pending = self.pending_views.get(instance.pk, 0)
+        else:
+            pending = view_counter.pending(instance.pk)
+        if pending:
+            data['view_count'] = (data.get('view_count') or 0) + pending
+        return data
+    
+    def get_thumbnail_url(self, obj):
         """
-        if obj.age_months is None:
-            return None
-        
-        if obj.age_months < 12:
-            return f"{obj.age_months} ay"
+        URL of the listing's primary image thumbnail.
         
-        years = obj.age_months // 12
-        months = obj.age_months % 12
-        
-        if months == 0:
-            return f"{years} yaş"
+        Uses the with_image_summary() annotation when present; otherwise
+        falls back to a query (e.g. create/update responses). Points at the
+        WebP thumbnail variant; null (and processing queued) until it exists.
+        """
+        if hasattr(obj, 'primary_image_variants'):
+            variants = obj.primary_image_variants
         else:
-            return f"{years} yaş {months} ay"
+            image = obj.images.order_by('-is_primary', 'order', 'created_at').first()
+            variants = image.variants if image else None
+        
+        path = thumbnail_path(variants)
+        if not path:
+            if variants is not None:
+                schedule_missing_variants(obj.pk)
+            return None
+        url = default_storage.url(path)
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
     
-
+    def get_image_count(self, obj):
+        """Number of images for the listing."""
+        if hasattr(obj, 'image_count'):
+            return obj.image_count
+        return obj.images.count()
+    
+    def get_age_display(self, obj):
+        """Human-readable age ("8 ay", "2 yaş 3 ay"); see format_age."""
+        return format_age(obj.age_months)
     
     def validate_age_months(self, value):
         """Age must be non-negative."""
@@ -120,3 +183,142 @@ class AnimalListingSerializer(serializers.ModelSerializer):
             attrs['location'] = f"{attrs['city']}, {attrs['district']}"
         
         return attrs
+
+
+class AnimalListingImportSerializer(AnimalListingSerializer):
+    """
+    One row of a bulk import (see apps.animals.bulk_import).
+    
+    Same validation as AnimalListingSerializer except ear_tag_no
+    uniqueness, which the import checks for a whole chunk in one query.
+    """
+    
+    class Meta(AnimalListingSerializer.Meta):
+        extra_kwargs = {'ear_tag_no': {'validators': []}}
+    
+    def validate_ear_tag_no(self, value):
+        if value and value.strip():
+            return value.strip()
+        return None
+
+
+# ?view=card: what a listing card in the search results shows
+LISTING_CARD_FIELDS = [
+    'id', 'title', 'animal_type', 'breed', 'gender', 'age_months', 'age_display',
+    'weight', 'price', 'city', 'district', 'view_count', 'thumbnail_url',
+    'image_count', 'distance_km', 'created_at',
+]
+
+# Columns each serializer field reads; fields not listed read their own column
+LISTING_FIELD_COLUMNS = {
+    'seller_email': ['seller__email'],
+    'seller_username': ['seller__username'],
+    'seller_phone_number': ['seller__phone_number'],
+    'age_display': ['age_months'],
+    'thumbnail_url': [],
+    'image_count': [],
+    'distance_km': [],
+}
+
+# with_image_summary() annotations are only computed when one of these is asked for
+LISTING_IMAGE_FIELDS = {'thumbnail_url', 'image_count'}
+
+
+def requested_listing_fields(params) -> Optional[List[str]]:
+    """
+    Field names selected by ?fields=a,b,c or ?view=card; None means all.
+
+    Raises ValidationError for unknown field names or views.
+    """
+    available = AnimalListingSerializer.Meta.fields
+    if params.get('fields'):
+        fields = [name.strip() for name in params['fields'].split(',') if name.strip()]
+        unknown = [name for name in fields if name not in available]
+        if unknown:
+            raise serializers.ValidationError({'fields': f"Bilinmeyen alanlar: {', '.join(unknown)}"})
+        return ['id'] + [name for name in fields if name != 'id']
+    view = params.get('view')
+    if view == 'card':
+        return list(LISTING_CARD_FIELDS)
+    if view and view != 'full':
+        raise serializers.ValidationError({'view': "Geçerli değerler: card, full"})
+    return None
+
+
+def restrict_listing_queryset(queryset, fields: Optional[List[str]], extra_columns=()):
+    """
+    Load only what the selected serializer fields read.
+
+    Joins the seller when a seller_* field is selected and skips the image
+    summary subqueries when no image field is. `extra_columns` are always
+    loaded (e.g. ordering keys read by the cursor paginator).
+    """
+    names = AnimalListingSerializer.Meta.fields if fields is None else fields
+    if LISTING_IMAGE_FIELDS.intersection(names):
+        queryset = queryset.with_image_summary()
+    
+    columns = {'id', 'seller', *extra_columns}
+    for name in names:
+        columns.update(LISTING_FIELD_COLUMNS.get(name, [name]))
+    if any(column.startswith('seller__') for column in columns):
+        queryset = queryset.select_related('seller')
+    if fields is None:
+        return queryset
+    return queryset.only(*sorted(columns))
+
+
+class SavedSearchSerializer(serializers.ModelSerializer):
+    """
+    Serializer for saved searches.
+    
+    Accepts the same type codes as the list filter and exposes the search
+    as list endpoint query parameters (query_params).
+    """
+    
+    query_params = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = SavedSearch
+        fields = [
+            'id',
+            'name',
+            'animal_type',
+            'city',
+            'district',
+            'gender',
+            'min_price',
+            'max_price',
+            'min_age',
+            'max_age',
+            'min_weight',
+            'max_weight',
+            'is_active',
+            'query_params',
+            'created_at',
+        ]
+        read_only_fields = ['id', 'created_at']
+    
+    def get_query_params(self, obj) -> dict:
+        return search_query_params(obj)
+    
+    def validate_animal_type(self, value):
+        value = normalize_animal_type(value)
+        if value and value not in ANIMAL_TYPE_GROUPS:
+            raise serializers.ValidationError("Bilinmeyen hayvan türü.")
+        return value
+    
+    def validate(self, attrs):
+        """Check ranges and the per-user limit."""
+        for low, high in (('min_price', 'max_price'), ('min_age', 'max_age'), ('min_weight', 'max_weight')):
+            low_value = attrs.get(low, getattr(self.instance, low, None))
+            high_value = attrs.get(high, getattr(self.instance, high, None))
+            if low_value is not None and high_value is not None and low_value > high_value:
+                raise serializers.ValidationError({low: f"{low}, {high} değerinden büyük olamaz."})
+        
+        request = self.context.get('request')
+        if self.instance is None and request is not None:
+            if SavedSearch.objects.filter(user=request.user).count() >= MAX_SAVED_SEARCHES:
+                raise serializers.ValidationError(
+                    f"En fazla {MAX_SAVED_SEARCHES} arama kaydedebilirsiniz."
+                )
+        return attrs
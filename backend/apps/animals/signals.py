@@ -1,38 +1,111 @@
-import os
-from django.db.models.signals import post_delete, pre_save
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db.models.signals import post_delete, post_init, post_save, pre_save
 from django.dispatch import receiver
-from .models import AnimalImage
+from .models import AnimalImage, AnimalListing, ArchivedListing
+from .search import index_listing
+from .image_blobs import acquire_blob, release_blob
+from .image_processing import schedule_variants, variant_file_paths
+from .media_gc import queue_orphaned_files, schedule_collection
+
+
+def release_image_files(blob_id, name, variants):
+    """
+    Queue an image file and its variants for deletion once nothing uses them.
+
+    Shared (blob) files go only with their last reference; files from
+    before content-addressed storage belong to a single image.
+    """
+    if blob_id is not None and not release_blob(blob_id):
+        return
+    queue_orphaned_files([name, *variant_file_paths(variants)])
+    schedule_collection()
+
+
+# Set while image rows move to or from the archive; their files stay in use
+_keeping_files = ContextVar('keeping_image_files', default=False)
+
+
+@contextmanager
+def keep_image_files():
+    """Delete AnimalImage/ArchivedListing rows without releasing their files."""
+    token = _keeping_files.set(True)
+    try:
+        yield
+    finally:
+        _keeping_files.reset(token)
+
+@receiver(post_init, sender=AnimalImage)
+def remember_original_file(sender, instance, **kwargs):
+    """
+    Remember the file the row was loaded with, so a changed file can be
+    detected on save without re-reading the row.
+    """
+    instance._original_image_name = instance.__dict__.get('image') and instance.image.name
+    instance._original_blob_id = instance.__dict__.get('blob_id')
+
+@receiver(post_save, sender=AnimalImage)
+def refresh_original_file(sender, instance, **kwargs):
+    """Uploads are renamed by storage on save; track the stored name."""
+    instance._original_image_name = instance.image.name
+    instance._original_blob_id = instance.blob_id
 
 @receiver(post_delete, sender=AnimalImage)
 def auto_delete_file_on_delete(sender, instance, **kwargs):
     """
-    Deletes file from filesystem when corresponding `AnimalImage` object is deleted.
+    Releases the image file and its variants when the corresponding
+    `AnimalImage` object is deleted.
     """
-    if instance.image:
-        if os.path.isfile(instance.image.path):
-            try:
-                os.remove(instance.image.path)
-            except Exception as e:
-                print(f"Error deleting file {instance.image.path}: {e}")
+    if _keeping_files.get():
+        return
+    release_image_files(instance.blob_id, instance.image.name, instance.variants)
+
+
+@receiver(post_delete, sender=ArchivedListing)
+def release_archived_image_files(sender, instance, **kwargs):
+    """Archived images hold their files until the archived listing is deleted."""
+    if _keeping_files.get():
+        return
+    for image in instance.images:
+        fields = image['fields']
+        release_image_files(fields['blob'], fields['image'], fields['variants'])
 
 @receiver(pre_save, sender=AnimalImage)
 def auto_delete_file_on_change(sender, instance, **kwargs):
     """
-    Deletes old file from filesystem when corresponding `AnimalImage` object is updated
-    with new file.
+    Attaches new uploads to their shared blob, and releases the old file
+    when the corresponding `AnimalImage` object is updated with a new file.
     """
+    if instance.image and not instance.image._committed:
+        acquire_blob(instance)
+
     if not instance.pk:
         return False
-
-    try:
-        old_file = AnimalImage.objects.get(pk=instance.pk).image
-    except AnimalImage.DoesNotExist:
+    
+    # Metadata-only saves (order, is_primary, ...) can't change the file
+    update_fields = kwargs.get('update_fields')
+    if update_fields is not None and 'image' not in update_fields:
         return False
 
-    new_file = instance.image
-    if not old_file == new_file:
-        if old_file and os.path.isfile(old_file.path):
-            try:
-                os.remove(old_file.path)
-            except Exception as e:
-                print(f"Error deleting old file {old_file.path}: {e}")
+    old_name = getattr(instance, '_original_image_name', None)
+    if old_name and old_name != instance.image.name:
+        release_image_files(instance._original_blob_id, old_name, instance.variants)
+        # The old variants may be gone; render the new file's
+        instance.variants = {}
+        instance.width = instance.height = None
+        schedule_variants(instance.pk)
+
+
+SEARCH_INDEXED_FIELDS = {'title', 'breed', 'city', 'district', 'ear_tag_no', 'description'}
+
+
+@receiver(post_save, sender=AnimalListing)
+def update_search_document(sender, instance, update_fields=None, **kwargs):
+    """
+    Keeps the listing's search document in sync with its text fields.
+    """
+    if update_fields is not None and not SEARCH_INDEXED_FIELDS.intersection(update_fields):
+        return
+
+    index_listing(instance)
@@ -0,0 +1,64 @@
+"""
+Content-addressed file storage for animal images.
+
+Files are named after the SHA-256 of their bytes, so uploading a photo
+that is already stored costs a hash and no write. Reference counting of
+shared files lives in apps.animals.image_blobs.
+"""
+
+import hashlib
+import os
+
+from django.core.files.storage import FileSystemStorage
+
+IMAGE_DIR = 'animal_images'
+
+
+def file_sha256(file) -> str:
+    """Hex SHA-256 of a Django File, leaving it rewound for the actual save."""
+    digest = hashlib.sha256()
+    file.seek(0)
+    for chunk in file.chunks():
+        digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()
+
+
+def content_addressed_name(sha256: str, filename: str) -> str:
+    """animal_images/ab/ab12...ef.jpg for a digest and the uploaded file name."""
+    extension = os.path.splitext(filename)[1].lower()
+    return f'{IMAGE_DIR}/{sha256[:2]}/{sha256}{extension}'
+
+
+def content_addressed_upload_to(instance, filename: str) -> str:
+    """
+    upload_to for AnimalImage.image.
+
+    The pre_save signal has already attached the blob, whose path wins so
+    that "a.JPG" and "a.jpeg" with the same bytes share one file.
+    """
+    blob = getattr(instance, 'blob', None)
+    if blob is not None:
+        return blob.path
+    return content_addressed_name(file_sha256(instance.image), filename)
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    FileSystemStorage that never writes a name twice.
+
+    Names are content hashes, so an existing file already holds the bytes
+    being saved and the upload is skipped.
+    """
+
+    def save(self, name, content, max_length=None):
+        if name and self.exists(name):
+            return name
+        return super().save(name, content, max_length=max_length)
+
+
+image_storage = ContentAddressedStorage()
+
+
+def get_image_storage():
+    return image_storage
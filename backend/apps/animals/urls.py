@@ -4,10 +4,12 @@ URL configuration for animals app.
 
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import AnimalListingViewSet
+from .views import AnimalListingViewSet, SavedSearchViewSet
 from .image_views import AnimalImageViewSet
 
 router = DefaultRouter()
+# Registered before the listing routes so 'saved-searches' isn't taken as a listing id
+router.register(r'saved-searches', SavedSearchViewSet, basename='saved-search')
 router.register(r'', AnimalListingViewSet, basename='animal')
 
 # Image endpoints (manually defined for nested routes)
@@ -24,9 +26,19 @@ image_reorder = AnimalImageViewSet.as_view({
     'post': 'reorder'
 })
 
+image_batch = AnimalImageViewSet.as_view({
+    'post': 'batch'
+})
+
+image_similar = AnimalImageViewSet.as_view({
+    'get': 'similar'
+})
+
 urlpatterns = [
     path('', include(router.urls)),
     path('<int:listing_pk>/images/', image_list, name='animal-images-list'),
     path('<int:listing_pk>/images/reorder/', image_reorder, name='animal-images-reorder'),
+    path('<int:listing_pk>/images/batch/', image_batch, name='animal-images-batch'),
     path('images/<int:pk>/', image_detail, name='animal-image-detail'),
+    path('images/<int:pk>/similar/', image_similar, name='animal-image-similar'),
 ]
@@ -0,0 +1,305 @@
+"""
+Write-behind view ingestion for animal listings.
+
+Every listing view (detail page or a VIEW interaction logged through the
+recommendations API) goes through view_counter.record_view():
+- repeat views by the same user/IP within VIEW_DEDUP_WINDOW are dropped
+- the view_count increment is buffered
+- the ListingInteraction row is buffered
+
+A timer thread flushes both in one transaction: a bulk INSERT of
+interaction rows and one CASE UPDATE of view_count per batch, so a viral
+listing costs one UPDATE per flush interval instead of one per view.
+Serializers add the pending (unflushed) delta on read.
+
+Buffers (settings.VIEW_COUNT_BUFFER):
+- 'local': per-process dict, zero I/O
+- 'cache': counts live in the Django cache, so every worker sees the
+  pending delta of the others
+"""
+
+import atexit
+import ipaddress
+import logging
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Case, F, IntegerField, Value, When
+
+from apps.recommendations.models import ListingInteraction
+from .models import AnimalListing
+
+logger = logging.getLogger(__name__)
+
+FLUSH_BATCH_SIZE = 500
+DEDUP_KEY_PREFIX = 'listing_view_seen:'
+
+
+def get_client_ip(request) -> Optional[str]:
+    """
+    Client IP, honouring the first X-Forwarded-For hop.
+
+    None if the address isn't a valid IPv4/IPv6 address: the header is
+    client-controlled, and a bad value would fail the buffered INSERT
+    of every view in the same flush.
+    """
+    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+    if x_forwarded_for:
+        address = x_forwarded_for.split(',')[0].strip()
+    else:
+        address = request.META.get('REMOTE_ADDR')
+    try:
+        return str(ipaddress.ip_address(address))
+    except ValueError:
+        return None
+
+
+class LocalViewCountBuffer:
+    """In-process buffer of pending view increments."""
+
+    def __init__(self):
+        self._counts = Counter()
+        self._lock = threading.Lock()
+
+    def add(self, listing_id: int, amount: int = 1) -> None:
+        with self._lock:
+            self._counts[listing_id] += amount
+
+    def pending_many(self, listing_ids: Iterable[int]) -> Dict[int, int]:
+        with self._lock:
+            return {pk: self._counts[pk] for pk in listing_ids if pk in self._counts}
+
+    def drain(self) -> Dict[int, int]:
+        """Remove and return all pending increments."""
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+        return dict(counts)
+
+    def __bool__(self) -> bool:
+        return bool(self._counts)
+
+
+class CacheViewCountBuffer:
+    """
+    Buffer backed by the Django cache (one integer key per listing).
+
+    Each process remembers which listings it incremented and drains those;
+    draining subtracts exactly what was read, so concurrent increments from
+    other workers are never lost.
+    """
+
+    key_prefix = 'listing_views:'
+
+    def __init__(self):
+        self._dirty = set()
+        self._lock = threading.Lock()
+
+    def _key(self, listing_id: int) -> str:
+        return f'{self.key_prefix}{listing_id}'
+
+    def add(self, listing_id: int, amount: int = 1) -> None:
+        key = self._key(listing_id)
+        try:
+            cache.incr(key, amount)
+        except ValueError:
+            # Key missing: create it, or increment if another worker just did
+            if not cache.add(key, amount, timeout=None):
+                cache.incr(key, amount)
+        with self._lock:
+            self._dirty.add(listing_id)
+
+    def pending_many(self, listing_ids: Iterable[int]) -> Dict[int, int]:
+        keys = {self._key(pk): pk for pk in listing_ids}
+        values = cache.get_many(list(keys))
+        return {keys[key]: value for key, value in values.items() if value}
+
+    def drain(self) -> Dict[int, int]:
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+
+        counts = {}
+        for listing_id, value in self.pending_many(dirty).items():
+            try:
+                cache.decr(self._key(listing_id), value)
+            except ValueError:
+                # Already drained by another worker
+                continue
+            counts[listing_id] = value
+        return counts
+
+    def __bool__(self) -> bool:
+        return bool(self._dirty)
+
+
+BUFFER_CLASSES = {
+    'local': LocalViewCountBuffer,
+    'cache': CacheViewCountBuffer,
+}
+
+
+class ViewCounter:
+    """Records listing views and flushes them to the database on a timer."""
+
+    def __init__(self, buffer, flush_interval: float, dedup_window: int):
+        self.buffer = buffer
+        self.flush_interval = flush_interval
+        self.dedup_window = dedup_window
+        self._interactions: List[ListingInteraction] = []
+        self._interactions_lock = threading.Lock()
+        self._timer = None
+        self._timer_lock = threading.Lock()
+
+    def record_view(self, listing_id: int, user_id: Optional[int] = None,
+                    ip_address: Optional[str] = None) -> bool:
+        """
+        Record one view of a listing by a user (or anonymous IP).
+
+        Returns False if the view was a duplicate within the dedup window.
+        """
+        if self.is_duplicate(listing_id, user_id, ip_address):
+            return False
+
+        self.buffer.add(listing_id)
+        with self._interactions_lock:
+            self._interactions.append(ListingInteraction(
+                user_id=user_id,
+                listing_id=listing_id,
+                interaction_type=ListingInteraction.VIEW,
+                ip_address=ip_address
+            ))
+        self._schedule_flush()
+        return True
+
+    def is_duplicate(self, listing_id: int, user_id: Optional[int],
+                     ip_address: Optional[str]) -> bool:
+        """Mark (viewer, listing) as seen; True if it already was."""
+        viewer = f'u{user_id}' if user_id else (f'ip{ip_address}' if ip_address else None)
+        if viewer is None or not self.dedup_window:
+            return False
+        key = f'{DEDUP_KEY_PREFIX}{viewer}:{listing_id}'
+        return not cache.add(key, 1, timeout=self.dedup_window)
+
+    def pending(self, listing_id: int) -> int:
+        """Views recorded for a listing but not yet written to the database."""
+        return self.buffer.pending_many([listing_id]).get(listing_id, 0)
+
+    def pending_many(self, listing_ids: Iterable[int]) -> Dict[int, int]:
+        return self.buffer.pending_many(listing_ids)
+
+    def flush(self) -> int:
+        """
+        Write buffered interactions and view_count increments in one transaction.
+
+        Returns the number of listings updated. If the batch fails, the
+        counts are written on their own and interactions one by one,
+        dropping the rows that fail, so one bad row can't block every
+        later flush. Counts are put back into the buffer only if they
+        can't be written either.
+        """
+        counts = self.buffer.drain()
+        with self._interactions_lock:
+            interactions, self._interactions = self._interactions, []
+        if not counts and not interactions:
+            return 0
+
+        try:
+            with transaction.atomic():
+                write_interactions(interactions)
+                write_view_counts(counts)
+        except Exception:
+            logger.exception("View flush failed, retrying counts and interactions separately")
+            try:
+                with transaction.atomic():
+                    write_view_counts(counts)
+            except Exception:
+                logger.exception("View count flush failed, re-queueing %d listings", len(counts))
+                for listing_id, amount in counts.items():
+                    self.buffer.add(listing_id, amount)
+                raise
+            finally:
+                write_interactions_one_by_one(interactions)
+        return len(counts)
+
+    def _schedule_flush(self) -> None:
+        with self._timer_lock:
+            if self._timer is not None:
+                return
+            self._timer = threading.Timer(self.flush_interval, self._run_timer)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _run_timer(self) -> None:
+        with self._timer_lock:
+            self._timer = None
+        try:
+            self.flush()
+        except Exception:
+            # Logged in flush(); counts were re-queued
+            pass
+        finally:
+            # Each Timer is a new thread with its own connection
+            connection.close()
+        if self.buffer or self._interactions:
+            self._schedule_flush()
+
+
+def write_interactions(interactions: List[ListingInteraction]) -> None:
+    """Bulk insert interaction rows, skipping listings deleted since the view."""
+    if not interactions:
+        return
+    existing = set(AnimalListing.objects.filter(
+        pk__in={interaction.listing_id for interaction in interactions}
+    ).values_list('pk', flat=True))
+    ListingInteraction.objects.bulk_create(
+        [interaction for interaction in interactions if interaction.listing_id in existing],
+        batch_size=FLUSH_BATCH_SIZE
+    )
+
+
+def write_interactions_one_by_one(interactions: List[ListingInteraction]) -> int:
+    """Insert interactions separately, dropping (and logging) the ones that fail; returns how many were dropped."""
+    dropped = 0
+    for interaction in interactions:
+        try:
+            with transaction.atomic():
+                write_interactions([interaction])
+        except Exception:
+            dropped += 1
+    if dropped:
+        logger.error("Dropped %d view interactions that could not be written", dropped)
+    return dropped
+
+
+def write_view_counts(counts: Dict[int, int]) -> None:
+    """Add per-listing view deltas with one UPDATE per batch."""
+    items = list(counts.items())
+    for start in range(0, len(items), FLUSH_BATCH_SIZE):
+        batch = items[start:start + FLUSH_BATCH_SIZE]
+        delta = Case(
+            *[When(pk=listing_id, then=Value(amount)) for listing_id, amount in batch],
+            default=Value(0),
+            output_field=IntegerField()
+        )
+        AnimalListing.objects.filter(
+            pk__in=[listing_id for listing_id, _ in batch]
+        ).update(view_count=F('view_count') + delta)
+
+
+view_counter = ViewCounter(
+    buffer=BUFFER_CLASSES[getattr(settings, 'VIEW_COUNT_BUFFER', 'local')](),
+    flush_interval=getattr(settings, 'VIEW_COUNT_FLUSH_INTERVAL', 10),
+    dedup_window=getattr(settings, 'VIEW_DEDUP_WINDOW', 30 * 60),
+)
+
+
+@atexit.register
+def _flush_on_exit() -> None:
+    """Don't drop buffered views on graceful worker shutdown."""
+    try:
+        view_counter.flush()
+    except Exception:
+        pass
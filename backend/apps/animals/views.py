@@ -2,42 +2,59 @@
 Views for animals app.
 """
 
-from rest_framework import viewsets, status, filters
+from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
+from django.http import Http404, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.functional import cached_property
 from django_filters.rest_framework import DjangoFilterBackend
 from apps.accounts.permissions import IsOwner
-from .models import AnimalListing
-from .serializers import AnimalListingSerializer
-from .filters import AnimalListingFilter
-from .pagination import AnimalListingPagination
+from apps.locations.filters import ProximityFilter
+from config.renderers import streaming_content
+from .models import AnimalListing, SavedSearch
+from .serializers import (
+    AnimalListingSerializer, SavedSearchSerializer,
+    requested_listing_fields, restrict_listing_queryset
+)
+from .filters import AnimalListingFilter, ListingOrderingFilter, ListingSearchFilter
+from .pagination import AnimalListingPagination, ordering_keys
+from .row_serializers import ListingRowSerializer, RowListMixin
+from .bulk_import import ImportFormatError, detect_format, import_listings, iter_import_rows
+from .export import CONTENT_TYPES, export_listings
+from .archive import archived_listing_instance, find_archived
+from .facets import listing_facets
+from .saved_searches import index_saved_search, notify_saved_search_matches
+from .view_counter import get_client_ip, view_counter
 
 
-class AnimalListingViewSet(viewsets.ModelViewSet):
+class AnimalListingViewSet(RowListMixin, viewsets.ModelViewSet):
     """
     ViewSet for animal listings.
     
     All authenticated users can create listings.
     Only owners can update/delete their listings.
+    list renders .values() rows with ListingRowSerializer (same output as
+    AnimalListingSerializer without building model instances).
     """
     
     serializer_class = AnimalListingSerializer
+    row_serializer_class = ListingRowSerializer
     queryset = AnimalListing.objects.filter(is_active=True)
     filterset_class = AnimalListingFilter
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
-    search_fields = ['title', 'description', 'breed', 'city', 'district', 'ear_tag_no']
+    filter_backends = [DjangoFilterBackend, ListingSearchFilter, ProximityFilter, ListingOrderingFilter]
     pagination_class = AnimalListingPagination
     
     def get_permissions(self):
         """
         Set different permissions for different actions.
         
-        - list/retrieve: IsAuthenticated
+        - list/retrieve/facets: AllowAny
         - create: IsAuthenticated (any user can create)
         - update/partial_update/destroy: IsAuthenticated + IsOwner
         """
-        if self.action in ['list', 'retrieve']:
+        if self.action in ['list', 'retrieve', 'facets']:
             return [AllowAny()]
         elif self.action == 'create':
             return [IsAuthenticated()]
@@ -50,30 +67,70 @@ class AnimalListingViewSet(viewsets.ModelViewSet):
         Override to allow sellers to see their listings.
         - mine=true: Active listings (default)
         - mine=true & deleted=true: Inactive (soft deleted) listings
+        
+        list/retrieve querysets only load the columns the selected fields
+        need (?fields=/?view=card), join the seller when a seller_* field is
+        selected and carry the primary image thumbnail and image count as
+        subquery annotations, so cards need no extra queries.
         """
-        if self.action in ['update', 'partial_update', 'destroy', 'retrieve']:
-            # For update/delete/retrieve, show all listings (including inactive)
+        if self.action in ['update', 'partial_update', 'destroy']:
+            # For update/delete, show all listings (including inactive)
             # Permission check will ensure only owner can access
             return AnimalListing.objects.all()
         
+        if self.action == 'retrieve':
+            return self.restrict_queryset(AnimalListing.objects.all())
+        
         # Check for 'mine=true' filter
         if self.request.query_params.get('mine') == 'true':
             qs = AnimalListing.objects.filter(seller=self.request.user)
             
             # Check for 'deleted=true' to show trash bin
             if self.request.query_params.get('deleted') == 'true':
-                return qs.filter(is_active=False)
+                return self.restrict_queryset(qs.filter(is_active=False))
             
             # Default: Show active listings
-            return qs.filter(is_active=True)
+            return self.restrict_queryset(qs.filter(is_active=True))
             
         # For public list, only show active listings
-        return AnimalListing.objects.filter(is_active=True)
+        return self.restrict_queryset(AnimalListing.objects.filter(is_active=True))
+    
+    def restrict_queryset(self, queryset):
+        """Sparse fieldset for list/retrieve; other actions get the queryset as is."""
+        if self.action not in ['list', 'retrieve']:
+            return queryset
+        # Ordering keys are read back by the cursor paginator
+        return restrict_listing_queryset(
+            queryset,
+            self.requested_fields,
+            extra_columns=ListingOrderingFilter.ordering_fields
+        )
+    
+    @cached_property
+    def requested_fields(self):
+        return requested_listing_fields(self.request.query_params)
+    
+    def get_serializer(self, *args, **kwargs):
+        if self.action in ['list', 'retrieve']:
+            kwargs.setdefault('fields', self.requested_fields)
+        return super().get_serializer(*args, **kwargs)
+    
+    def get_row_serializer(self, queryset):
+        return self.row_serializer_class.for_queryset(
+            queryset,
+            context=self.get_serializer_context(),
+            fields=self.requested_fields
+        )
+    
+    def get_row_extra_columns(self, queryset):
+        # Read back by the cursor paginator
+        return [name for name, _ in ordering_keys(queryset)]
     
     # ... (perform_create, update, partial_update methods remain same) ...
     def perform_create(self, serializer):
-        """Set the seller to the current user."""
-        serializer.save(seller=self.request.user)
+        """Set the seller to the current user and notify matching saved searches."""
+        listing = serializer.save(seller=self.request.user)
+        notify_saved_search_matches(listing)
         
     def perform_update(self, serializer):
         """Update the listing."""
@@ -87,16 +144,29 @@ class AnimalListingViewSet(viewsets.ModelViewSet):
         """
         Retrieve a listing and increment view count.
         Skips increment if the requester is the owner.
+        
+        The view goes through the shared view pipeline (dedup + batched
+        interaction/counter writes); the serializer adds the pending delta
+        to view_count.
+        
+        Archived listings (see apps.animals.archive) are served read-only
+        from the archive, without counting the view.
         """
-        instance = self.get_object()
+        try:
+            instance = self.get_object()
+        except Http404:
+            archived = find_archived(kwargs.get(self.lookup_url_kwarg or self.lookup_field))
+            if archived is None:
+                raise
+            return Response(self.get_serializer(archived_listing_instance(archived)).data)
         
         # Only increment view count if user is not the owner
-        if not request.user.is_authenticated or request.user != instance.seller:
-            # Use F() expression to avoid race conditions
-            from django.db.models import F
-            AnimalListing.objects.filter(pk=instance.pk).update(view_count=F('view_count') + 1)
-            # Refresh instance to get updated view_count
-            instance.refresh_from_db()
+        if not request.user.is_authenticated or request.user.pk != instance.seller_id:
+            view_counter.record_view(
+                instance.pk,
+                user_id=request.user.pk if request.user.is_authenticated else None,
+                ip_address=get_client_ip(request)
+            )
         
         serializer = self.get_serializer(instance)
         return Response(serializer.data)
@@ -123,6 +193,117 @@ class AnimalListingViewSet(viewsets.ModelViewSet):
         # Soft delete (via perform_destroy)
         return super().destroy(request, *args, **kwargs)
 
+    @action(detail=False, methods=['get'])
+    def facets(self, request):
+        """
+        Facet counts for the current filters, in one grouped query.
+        
+        Accepts the same query parameters as the list endpoint (filters,
+        search, mine/deleted) and returns counts per animal type, city,
+        district, gender, price bucket and age bucket.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        return Response(listing_facets(queryset))
+
+    @action(detail=False, methods=['post'], url_path='import')
+    def bulk_import(self, request):
+        """
+        Create many listings from a CSV or JSON upload.
+        
+        POST /api/animals/import/
+        - multipart `file` (.csv or .json), or the raw body with
+          Content-Type text/csv or application/json
+        - ?file_format=csv|json overrides detection (?format= is DRF's
+          renderer override)
+        - ?dry_run=true validates without creating anything
+        
+        Rows are streamed and inserted in chunks; the response reports
+        created/failed counts and errors per row number.
+        """
+        if request.content_type.startswith('multipart/form-data'):
+            upload = request.FILES.get('file')
+            stream = upload
+            detected = detect_format(upload.name, upload.content_type) if upload else ''
+        else:
+            # Read the body directly so DRF doesn't parse it into memory
+            stream = request.stream
+            detected = detect_format(content_type=request.content_type)
+        
+        if stream is None:
+            return Response({'detail': 'Dosya gerekli.'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            rows = iter_import_rows(stream, request.query_params.get('file_format') or detected)
+        except ImportFormatError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        report = import_listings(
+            request.user,
+            rows,
+            dry_run=request.query_params.get('dry_run') == 'true'
+        )
+        if report['created']:
+            return Response(report, status=status.HTTP_201_CREATED)
+        if report['format_error'] and not report['valid']:
+            return Response(report, status=status.HTTP_400_BAD_REQUEST)
+        return Response(report)
+
+    @action(detail=False, methods=['get'], url_path=r'export/(?P<file_format>csv|xlsx)')
+    def export(self, request, file_format):
+        """
+        Download listings with their statistics as CSV or XLSX.
+        
+        GET /api/animals/export/csv/ or /api/animals/export/xlsx/
+        - sellers get all their own listings, active and inactive
+        - staff get every listing, or one seller's with ?seller=<id>
+        
+        The file is streamed chunk by chunk, so its size doesn't affect
+        memory use.
+        """
+        queryset = AnimalListing.objects.all()
+        if not request.user.is_staff:
+            queryset = queryset.filter(seller=request.user)
+        elif request.query_params.get('seller'):
+            try:
+                queryset = queryset.filter(seller_id=int(request.query_params['seller']))
+            except ValueError:
+                return Response({'detail': 'Geçersiz satıcı.'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        response = StreamingHttpResponse(
+            streaming_content(request, export_listings(queryset, file_format)),
+            content_type=CONTENT_TYPES[file_format]
+        )
+        filename = f"ilanlar-{timezone.localdate():%Y%m%d}.{file_format}"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
     def perform_hard_delete(self, instance):
         """Perform actual database deletion"""
         instance.delete()
+
+
+class SavedSearchViewSet(viewsets.ModelViewSet):
+    """
+    ViewSet for the current user's saved searches.
+    
+    New listings matching an active saved search create a
+    NEW_LISTING_MATCH notification, so clients don't need to poll the
+    list endpoint.
+    """
+    
+    serializer_class = SavedSearchSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = None
+    
+    def get_queryset(self):
+        """Return only the requesting user's saved searches."""
+        return SavedSearch.objects.filter(user=self.request.user)
+    
+    def perform_create(self, serializer):
+        """Set the user and index the search for matching."""
+        search = serializer.save(user=self.request.user)
+        index_saved_search(search)
+    
+    def perform_update(self, serializer):
+        """Re-index the search after its filters change."""
+        search = serializer.save()
+        index_saved_search(search)
@@ -42,6 +42,24 @@ class ButcherProfile(models.Model):
         default="",
         help_text="İlçe (opsiyonel)"
     )
+    city_ref = models.ForeignKey(
+        'locations.City',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name='+',
+        help_text="Canonical city resolved from `city`"
+    )
+    district_ref = models.ForeignKey(
+        'locations.District',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name='+',
+        help_text="Canonical district resolved from `district`"
+    )
     services = models.JSONField(
         default=list,
         help_text="List of services offered"
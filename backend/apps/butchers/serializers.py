@@ -15,6 +15,8 @@ class ButcherProfileSerializer(serializers.ModelSerializer):
     
     user_email = serializers.EmailField(source='user.email', read_only=True)
     butcher_name = serializers.SerializerMethodField()
+    # Only present on ?near= queries (ProximityFilter annotation)
+    distance_km = serializers.FloatField(read_only=True)
     
     class Meta:
         model = ButcherProfile
@@ -30,7 +32,8 @@ class ButcherProfileSerializer(serializers.ModelSerializer):
             'services',
             'price_range',
             'rating',
-            'is_active'
+            'is_active',
+            'distance_km'
         ]
         labels = {
             'user': 'Kullanıcı',
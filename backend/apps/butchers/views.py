@@ -8,6 +8,8 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
 from apps.accounts.permissions import IsButcher
+from apps.locations.filters import ProximityFilter
+from apps.locations.lookup import filter_by_location
 from .models import ButcherProfile, Appointment
 from .serializers import ButcherProfileSerializer, AppointmentSerializer
 
@@ -40,13 +42,15 @@ class ButcherProfileViewSet(viewsets.ModelViewSet):
     
     serializer_class = ButcherProfileSerializer
     permission_classes = [IsAuthenticated]
+    filter_backends = [ProximityFilter]
     http_method_names = ['get', 'post', 'patch', 'put', 'head', 'options']
     
     def get_queryset(self):
         """
         Return active butcher profiles.
         
-        Can filter by city.
+        Can filter by city and district (exact, canonical names);
+        ?near=lat,lng&radius_km= sorts by distance (ProximityFilter).
         """
         queryset = ButcherProfile.objects.select_related('user')
         
@@ -57,10 +61,12 @@ class ButcherProfileViewSet(viewsets.ModelViewSet):
              # But 'me' endpoint handles that separately.
              queryset = queryset.filter(is_active=True)
         
-        # Filter by city if provided
-        city = self.request.query_params.get('city')
-        if city:
-            queryset = queryset.filter(city__icontains=city)
+        # Filter by city/district if provided
+        queryset = filter_by_location(
+            queryset,
+            city=self.request.query_params.get('city'),
+            district=self.request.query_params.get('district')
+        )
         
         return queryset
     
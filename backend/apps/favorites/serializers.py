@@ -6,6 +6,7 @@ from rest_framework import serializers
 from django.core.exceptions import ValidationError as DjangoValidationError
 from .models import Favorite
 from apps.animals.models import AnimalListing
+from apps.animals.row_serializers import NestedField, RowField, RowSerializer, decimal_string, iso_datetime
 
 
 class AnimalListingBasicSerializer(serializers.ModelSerializer):
@@ -91,3 +92,33 @@ class FavoriteSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("You have already favorited this listing.")
         
         return attrs
+
+
+class AnimalListingBasicRowSerializer(RowSerializer):
+    """
+    Row version of AnimalListingBasicSerializer.
+    """
+    
+    id = RowField()
+    title = RowField()
+    animal_type = RowField()
+    breed = RowField()
+    price = RowField(transform=decimal_string(10, 2))
+    location = RowField()
+    is_active = RowField()
+
+
+class FavoriteRowSerializer(RowSerializer):
+    """
+    Row version of FavoriteSerializer for the list endpoint.
+    
+    One .values() query joins the user and the listing; output is
+    identical to FavoriteSerializer.
+    """
+    
+    id = RowField()
+    user = RowField()
+    user_email = RowField('user__email')
+    animal = RowField()
+    animal_details = NestedField(AnimalListingBasicRowSerializer, prefix='animal__')
+    created_at = RowField(transform=iso_datetime)
@@ -5,11 +5,12 @@ Views for favorites app.
 from rest_framework import viewsets, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from apps.animals.row_serializers import RowListMixin
 from .models import Favorite
-from .serializers import FavoriteSerializer
+from .serializers import FavoriteRowSerializer, FavoriteSerializer
 
 
-class FavoriteViewSet(viewsets.ModelViewSet):
+class FavoriteViewSet(RowListMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing user favorites.
     
@@ -20,6 +21,7 @@ class FavoriteViewSet(viewsets.ModelViewSet):
     """
     
     serializer_class = FavoriteSerializer
+    row_serializer_class = FavoriteRowSerializer
     permission_classes = [IsAuthenticated]
     http_method_names = ['get', 'post', 'delete', 'head', 'options']  # Disable PUT/PATCH
     
@@ -56,6 +58,8 @@ class FavoriteViewSet(viewsets.ModelViewSet):
         """
         List all favorites for the authenticated user.
         
+        Rendered from .values() rows by FavoriteRowSerializer.
+        
         Returns:
             200 OK with list of favorites
         """
@@ -0,0 +1,22 @@
+"""
+Admin configuration for locations app.
+"""
+
+from django.contrib import admin
+from .models import City, District
+
+
+@admin.register(City)
+class CityAdmin(admin.ModelAdmin):
+    """Admin for canonical cities."""
+    list_display = ['id', 'name']
+    search_fields = ['name']
+
+
+@admin.register(District)
+class DistrictAdmin(admin.ModelAdmin):
+    """Admin for canonical districts."""
+    list_display = ['id', 'name', 'city']
+    list_filter = ['city']
+    search_fields = ['name', 'city__name']
+    list_select_related = ['city']
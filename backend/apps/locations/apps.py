@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class LocationsConfig(AppConfig):
+    name = 'apps.locations'
+    
+    def ready(self):
+        import apps.locations.signals
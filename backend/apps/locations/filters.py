@@ -0,0 +1,41 @@
+"""
+Filters for locations app.
+"""
+
+import math
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from .geo import DEFAULT_RADIUS_KM, MAX_RADIUS_KM, filter_by_distance, parse_near
+
+
+class ProximityFilter(BaseFilterBackend):
+    """
+    ?near=lat,lng&radius_km=N: rows within N km, nearest first.
+    
+    Rows are placed at their district (or city) centroid and carry a
+    `distance_km` annotation. radius_km defaults to 50 and is capped at 300.
+    """
+    
+    near_param = 'near'
+    radius_param = 'radius_km'
+    
+    def filter_queryset(self, request, queryset, view):
+        near = request.query_params.get(self.near_param)
+        if not near:
+            return queryset
+        
+        try:
+            lat, lng = parse_near(near)
+            radius_km = float(request.query_params.get(self.radius_param, DEFAULT_RADIUS_KM))
+            # float() accepts "nan" and "inf"
+            if not math.isfinite(radius_km):
+                raise ValueError(radius_km)
+        except ValueError:
+            raise ValidationError({
+                self.near_param: 'Konum near=<enlem>,<boylam> biçiminde, radius_km ise sayı olmalıdır.'
+            })
+        
+        radius_km = min(max(radius_km, 0), MAX_RADIUS_KM)
+        return filter_by_distance(queryset, lat, lng, radius_km)
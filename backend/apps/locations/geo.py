@@ -0,0 +1,155 @@
+"""
+Proximity search without PostGIS.
+
+Every City and District has a centroid (districts without one use their
+city's). Those ~1000 points live in an in-memory grid of GRID_DEGREES
+cells; a radius query only visits the cells overlapping the search box
+and computes haversine distances for the points in them.
+
+Listings and butcher profiles are located by district_ref (city_ref when
+they have no district), so a radius query turns into
+    district_ref IN (...) OR (district_ref IS NULL AND city_ref IN (...))
+plus a CASE annotation carrying the distance, which the database sorts
+and paginates on. The grid holds the static location points rather than
+the rows, so it never goes stale as listings come and go.
+"""
+
+import math
+import threading
+from collections import defaultdict
+from typing import Dict, Optional, Tuple
+
+from django.db.models import Case, FloatField, Q, QuerySet, Value, When
+
+from .models import City, District
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 111.32
+GRID_DEGREES = 0.5
+
+DEFAULT_RADIUS_KM = 50
+MAX_RADIUS_KM = 300
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance between two WGS84 points."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def parse_near(value: str) -> Tuple[float, float]:
+    """"39.93,32.86" -> (39.93, 32.86); ValueError if malformed, not finite or out of range."""
+    lat, lng = (float(part) for part in value.split(','))
+    if not (math.isfinite(lat) and math.isfinite(lng)):
+        raise ValueError(value)
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        raise ValueError(value)
+    return lat, lng
+
+
+class GeoIndex:
+    """Grid of city and district centroids, loaded once per process."""
+
+    def __init__(self):
+        self._cells: Optional[Dict[Tuple[int, int], list]] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _cell(lat: float, lng: float) -> Tuple[int, int]:
+        return math.floor(lat / GRID_DEGREES), math.floor(lng / GRID_DEGREES)
+
+    def _load(self) -> Dict[Tuple[int, int], list]:
+        cells = self._cells
+        if cells is not None:
+            return cells
+        with self._lock:
+            if self._cells is None:
+                cities = {
+                    pk: (lat, lng)
+                    for pk, lat, lng in City.objects.filter(
+                        latitude__isnull=False, longitude__isnull=False
+                    ).values_list('pk', 'latitude', 'longitude')
+                }
+                cells = defaultdict(list)
+                for pk, (lat, lng) in cities.items():
+                    cells[self._cell(lat, lng)].append(('city', pk, lat, lng))
+                for pk, city_id, lat, lng in District.objects.values_list(
+                    'pk', 'city_id', 'latitude', 'longitude'
+                ):
+                    if lat is None or lng is None:
+                        if city_id not in cities:
+                            continue
+                        lat, lng = cities[city_id]
+                    cells[self._cell(lat, lng)].append(('district', pk, lat, lng))
+                self._cells = dict(cells)
+            return self._cells
+
+    def within(self, lat: float, lng: float,
+               radius_km: float) -> Tuple[Dict[int, float], Dict[int, float]]:
+        """({city_id: km}, {district_id: km}) for centroids within the radius."""
+        cells = self._load()
+        lat_span = radius_km / KM_PER_DEGREE
+        lng_span = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(lat)), 0.01))
+        min_row, min_col = self._cell(lat - lat_span, lng - lng_span)
+        max_row, max_col = self._cell(lat + lat_span, lng + lng_span)
+
+        found = {'city': {}, 'district': {}}
+        for row in range(min_row, max_row + 1):
+            for col in range(min_col, max_col + 1):
+                for kind, pk, point_lat, point_lng in cells.get((row, col), ()):
+                    distance = haversine_km(lat, lng, point_lat, point_lng)
+                    if distance <= radius_km:
+                        found[kind][pk] = round(distance, 1)
+        return found['city'], found['district']
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cells = None
+
+
+geo_index = GeoIndex()
+
+
+def _distance_whens(field: str, distances: Dict[int, float], **extra) -> list:
+    """One WHEN per distinct distance: field IN (ids...) THEN km."""
+    by_distance = defaultdict(list)
+    for pk, distance in distances.items():
+        by_distance[distance].append(pk)
+    return [
+        When(**{f'{field}__in': ids}, **extra, then=Value(distance))
+        for distance, ids in sorted(by_distance.items())
+    ]
+
+
+def filter_by_distance(queryset: QuerySet, lat: float, lng: float,
+                       radius_km: float = DEFAULT_RADIUS_KM) -> QuerySet:
+    """
+    Rows located within `radius_km` of (lat, lng), nearest first.
+
+    Works on any model with city_ref (and optionally district_ref) and
+    annotates `distance_km`.
+    """
+    cities, districts = geo_index.within(lat, lng, radius_km)
+    has_district = any(field.name == 'district_ref' for field in queryset.model._meta.get_fields())
+
+    if has_district:
+        condition = Q(district_ref_id__in=list(districts)) | Q(
+            district_ref__isnull=True, city_ref_id__in=list(cities)
+        )
+        whens = (
+            _distance_whens('district_ref_id', districts) +
+            _distance_whens('city_ref_id', cities, district_ref__isnull=True)
+        )
+    else:
+        condition = Q(city_ref_id__in=list(cities))
+        whens = _distance_whens('city_ref_id', cities)
+
+    if not whens:
+        return queryset.none()
+
+    return queryset.filter(condition).annotate(
+        distance_km=Case(*whens, output_field=FloatField())
+    ).order_by('distance_km', 'id')
@@ -0,0 +1,121 @@
+"""
+Resolve free-text city/district names to canonical City/District rows.
+
+The tables are small and static (81 cities, ~970 districts), so the whole
+index is loaded once per process and matching is a dict lookup on
+Turkish-folded names: "ANKARA", "ankara" and "Ankara " all resolve to the
+same City, while "Ankaragücü" resolves to nothing.
+"""
+
+import threading
+from typing import Dict, Optional, Tuple
+
+from django.apps import apps
+from django.conf import settings
+from django.db.models import QuerySet
+
+from .models import City, District
+
+# Models with free-text city (and optionally district) columns mirrored
+# into city_ref/district_ref foreign keys
+LOCATED_MODELS = [
+    'animals.AnimalListing',
+    'animals.SavedSearch',
+    'butchers.ButcherProfile',
+    'partnerships.PartnershipListing',
+    settings.AUTH_USER_MODEL,
+]
+
+
+# Turkish dotted/dotless I before lowercasing, then diacritics stripped
+# (the same folding as apps.animals.search.fold_turkish)
+_TURKISH_LOWER = str.maketrans({'I': 'ı', 'İ': 'i'})
+_ASCII_FOLD = str.maketrans('çğıöşüâîû', 'cgiosuaiu')
+
+
+def normalize_name(name: Optional[str]) -> str:
+    if not name:
+        return ''
+    return ' '.join(name.translate(_TURKISH_LOWER).lower().translate(_ASCII_FOLD).split())
+
+
+def located_models():
+    return [apps.get_model(label) for label in LOCATED_MODELS]
+
+
+def has_district(model) -> bool:
+    return any(field.name == 'district_ref' for field in model._meta.get_fields())
+
+
+class LocationIndex:
+    """In-process map of normalized names to City/District ids."""
+
+    def __init__(self):
+        self._cities: Optional[Dict[str, int]] = None
+        self._districts: Dict[Tuple[int, str], int] = {}
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, int]:
+        cities = self._cities
+        if cities is not None:
+            return cities
+        with self._lock:
+            if self._cities is None:
+                self._districts = {
+                    (city_id, normalize_name(name)): pk
+                    for pk, city_id, name in District.objects.values_list('pk', 'city_id', 'name')
+                }
+                self._cities = {
+                    normalize_name(name): pk
+                    for pk, name in City.objects.values_list('pk', 'name')
+                }
+            return self._cities
+
+    def city_id(self, name: Optional[str]) -> Optional[int]:
+        if not name:
+            return None
+        return self._load().get(normalize_name(name))
+
+    def district_id(self, city_id: Optional[int], name: Optional[str]) -> Optional[int]:
+        if city_id is None or not name:
+            return None
+        self._load()
+        return self._districts.get((city_id, normalize_name(name)))
+
+    def resolve(self, city: Optional[str],
+                district: Optional[str] = None) -> Tuple[Optional[int], Optional[int]]:
+        """(city_id, district_id) for free-text names; None where unknown."""
+        city_id = self.city_id(city)
+        return city_id, self.district_id(city_id, district)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cities = None
+            self._districts = {}
+
+
+location_index = LocationIndex()
+
+
+def filter_by_location(queryset: QuerySet, city: Optional[str] = None,
+                       district: Optional[str] = None) -> QuerySet:
+    """
+    Exact city/district filter on the city_ref/district_ref foreign keys.
+
+    Names that aren't canonical fall back to a case-insensitive exact
+    match on the text column (rows saved before the backfill).
+    """
+    city_id = location_index.city_id(city)
+    if city:
+        if city_id is not None:
+            queryset = queryset.filter(city_ref_id=city_id)
+        else:
+            queryset = queryset.filter(city__iexact=city.strip())
+
+    if district:
+        district_id = location_index.district_id(city_id, district)
+        if district_id is not None:
+            queryset = queryset.filter(district_ref_id=district_id)
+        else:
+            queryset = queryset.filter(district__iexact=district.strip())
+    return queryset
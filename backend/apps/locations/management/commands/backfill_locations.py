@@ -0,0 +1,60 @@
+"""
+Point existing rows' city_ref/district_ref at the canonical locations.
+
+Usage:
+    python manage.py backfill_locations
+    python manage.py backfill_locations --dry-run    # only report unmatched names
+"""
+
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.locations.lookup import has_district, location_index, located_models
+
+
+class Command(BaseCommand):
+    help = "Resolve free-text city/district values to City/District foreign keys"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help="Report what would change without writing"
+        )
+
+    def handle(self, *args, **options):
+        location_index.clear()
+        
+        for model in located_models():
+            with_district = has_district(model)
+            fields = ['city', 'district'] if with_district else ['city']
+            
+            # One UPDATE per distinct text value, not per row
+            groups = model.objects.order_by().values_list(*fields).distinct()
+            
+            updated = 0
+            unmatched = Counter()
+            with transaction.atomic():
+                for values in groups:
+                    city, district = values if with_district else (values[0], None)
+                    city_id, district_id = location_index.resolve(city, district)
+                    
+                    rows = model.objects.filter(**dict(zip(fields, values)))
+                    changes = {'city_ref_id': city_id}
+                    if with_district:
+                        changes['district_ref_id'] = district_id
+                    
+                    if city and city_id is None:
+                        unmatched[city] += rows.count()
+                    elif district and district_id is None:
+                        unmatched[f"{city} / {district}"] += rows.count()
+                    
+                    if not options['dry_run']:
+                        updated += rows.update(**changes)
+            
+            label = model._meta.label
+            self.stdout.write(self.style.SUCCESS(f"{label}: updated {updated} rows"))
+            for name, count in unmatched.most_common():
+                self.stdout.write(f"  unmatched: {name!r} ({count} rows)")
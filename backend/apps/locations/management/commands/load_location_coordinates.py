@@ -0,0 +1,64 @@
+"""
+Load district (or city) centroids from a CSV file.
+
+Usage:
+    python manage.py load_location_coordinates districts.csv
+
+CSV columns: city, district, latitude, longitude
+Leave district empty to set a city's centroid. Running servers load the
+proximity index once, so they pick up new coordinates on restart.
+"""
+
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from apps.locations.lookup import location_index
+from apps.locations.models import City, District
+
+
+class Command(BaseCommand):
+    help = "Set City/District centroid coordinates from a CSV file"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="CSV with city, district, latitude, longitude columns")
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['path'], newline='', encoding='utf-8') as f:
+                rows = list(csv.DictReader(f))
+        except OSError as e:
+            raise CommandError(str(e))
+        
+        location_index.clear()
+        cities, districts, unmatched = {}, {}, []
+        for row in rows:
+            try:
+                point = (float(row['latitude']), float(row['longitude']))
+            except (KeyError, TypeError, ValueError):
+                unmatched.append(row)
+                continue
+            city_id, district_id = location_index.resolve(row.get('city'), row.get('district'))
+            if row.get('district'):
+                if district_id is None:
+                    unmatched.append(row)
+                else:
+                    districts[district_id] = point
+            elif city_id is None:
+                unmatched.append(row)
+            else:
+                cities[city_id] = point
+        
+        with transaction.atomic():
+            for model, points in ((City, cities), (District, districts)):
+                objects = list(model.objects.filter(pk__in=points))
+                for obj in objects:
+                    obj.latitude, obj.longitude = points[obj.pk]
+                model.objects.bulk_update(objects, ['latitude', 'longitude'], batch_size=500)
+        
+        self.stdout.write(self.style.SUCCESS(
+            f"Updated {len(cities)} cities and {len(districts)} districts"
+        ))
+        for row in unmatched:
+            self.stdout.write(f"  skipped: {row}")
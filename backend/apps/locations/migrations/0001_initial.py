@@ -0,0 +1,44 @@
+# Generated by Django 4.2.17 on 2026-10-17 03:11
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='City',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text='Şehir adı (örn: Ankara)', max_length=100, unique=True)),
+            ],
+            options={
+                'verbose_name': 'city',
+                'verbose_name_plural': 'cities',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='District',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text='İlçe adı (örn: Çankaya)', max_length=100)),
+                ('city', models.ForeignKey(help_text='City this district belongs to', on_delete=django.db.models.deletion.CASCADE, related_name='districts', to='locations.city')),
+            ],
+            options={
+                'verbose_name': 'district',
+                'verbose_name_plural': 'districts',
+                'ordering': ['city__name', 'name'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='district',
+            constraint=models.UniqueConstraint(fields=('city', 'name'), name='unique_district_per_city'),
+        ),
+    ]
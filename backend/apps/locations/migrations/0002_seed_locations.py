@@ -0,0 +1,51 @@
+# Data migration: Seed cities and districts from data/locations.json
+
+import json
+from pathlib import Path
+
+from django.db import migrations
+
+LOCATIONS_FILE = Path(__file__).resolve().parent.parent / 'data' / 'locations.json'
+
+
+def seed_locations(apps, schema_editor):
+    """
+    Create every city and district listed in data/locations.json.
+    Existing rows are kept, so the migration is safe to re-run.
+    """
+    City = apps.get_model('locations', 'City')
+    District = apps.get_model('locations', 'District')
+    
+    with open(LOCATIONS_FILE, encoding='utf-8') as f:
+        locations = json.load(f)
+    
+    City.objects.bulk_create(
+        [City(name=name) for name in locations],
+        ignore_conflicts=True
+    )
+    city_ids = dict(City.objects.values_list('name', 'pk'))
+    District.objects.bulk_create(
+        [
+            District(city_id=city_ids[city], name=name)
+            for city, districts in locations.items()
+            for name in districts
+        ],
+        batch_size=500,
+        ignore_conflicts=True
+    )
+
+
+def unseed_locations(apps, schema_editor):
+    """Reverse: remove all seeded locations"""
+    apps.get_model('locations', 'City').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_locations, unseed_locations),
+    ]
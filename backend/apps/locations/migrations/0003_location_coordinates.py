@@ -0,0 +1,33 @@
+# Generated by Django 4.2.17 on 2026-10-17 03:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0002_seed_locations'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='city',
+            name='latitude',
+            field=models.FloatField(blank=True, help_text='Centroid latitude (WGS84)', null=True),
+        ),
+        migrations.AddField(
+            model_name='city',
+            name='longitude',
+            field=models.FloatField(blank=True, help_text='Centroid longitude (WGS84)', null=True),
+        ),
+        migrations.AddField(
+            model_name='district',
+            name='latitude',
+            field=models.FloatField(blank=True, help_text='Centroid latitude (WGS84); the city centroid is used when empty', null=True),
+        ),
+        migrations.AddField(
+            model_name='district',
+            name='longitude',
+            field=models.FloatField(blank=True, help_text='Centroid longitude (WGS84)', null=True),
+        ),
+    ]
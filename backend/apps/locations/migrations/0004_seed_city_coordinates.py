@@ -0,0 +1,40 @@
+# Data migration: Seed city centroids from data/city_coordinates.json
+
+import json
+from pathlib import Path
+
+from django.db import migrations
+
+COORDINATES_FILE = Path(__file__).resolve().parent.parent / 'data' / 'city_coordinates.json'
+
+
+def seed_city_coordinates(apps, schema_editor):
+    """
+    Set latitude/longitude of every city (provincial center).
+    District centroids are loaded separately with load_location_coordinates.
+    """
+    City = apps.get_model('locations', 'City')
+    
+    with open(COORDINATES_FILE, encoding='utf-8') as f:
+        coordinates = json.load(f)
+    
+    cities = list(City.objects.filter(name__in=coordinates))
+    for city in cities:
+        city.latitude, city.longitude = coordinates[city.name]
+    City.objects.bulk_update(cities, ['latitude', 'longitude'])
+
+
+def clear_city_coordinates(apps, schema_editor):
+    """Reverse: clear city coordinates"""
+    apps.get_model('locations', 'City').objects.update(latitude=None, longitude=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0003_location_coordinates'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_city_coordinates, clear_city_coordinates),
+    ]
@@ -0,0 +1,67 @@
+# Data migration: Point existing rows' city_ref/district_ref at the canonical locations
+
+from django.db import migrations
+
+# (app label, model) pairs with city_ref (and optionally district_ref), as of this migration
+LOCATED_MODELS = [
+    ('animals', 'AnimalListing'),
+    ('animals', 'SavedSearch'),
+    ('butchers', 'ButcherProfile'),
+    ('partnerships', 'PartnershipListing'),
+    ('accounts', 'User'),
+]
+
+# Frozen copy of apps.locations.lookup's name normalization
+_TURKISH_LOWER = str.maketrans({'I': 'ı', 'İ': 'i'})
+_ASCII_FOLD = str.maketrans('çğıöşüâîû', 'cgiosuaiu')
+
+
+def _normalize(name):
+    if not name:
+        return ''
+    return ' '.join(name.translate(_TURKISH_LOWER).lower().translate(_ASCII_FOLD).split())
+
+
+def backfill_location_refs(apps, schema_editor):
+    """
+    Resolve city/district text of rows saved before the refs existed.
+
+    One UPDATE per distinct (city, district) value, not per row; names that
+    match nothing are left NULL (filters fall back to the text column).
+    """
+    City = apps.get_model('locations', 'City')
+    District = apps.get_model('locations', 'District')
+    cities = {_normalize(name): pk for pk, name in City.objects.values_list('pk', 'name')}
+    districts = {
+        (city_id, _normalize(name)): pk
+        for pk, city_id, name in District.objects.values_list('pk', 'city_id', 'name')
+    }
+
+    for app_label, model_name in LOCATED_MODELS:
+        model = apps.get_model(app_label, model_name)
+        with_district = any(field.name == 'district_ref' for field in model._meta.get_fields())
+        fields = ['city', 'district'] if with_district else ['city']
+
+        for values in model.objects.filter(city_ref__isnull=True).order_by().values_list(*fields).distinct():
+            city_id = cities.get(_normalize(values[0]))
+            if city_id is None:
+                continue
+            changes = {'city_ref_id': city_id}
+            if with_district:
+                changes['district_ref_id'] = districts.get((city_id, _normalize(values[1])))
+            model.objects.filter(city_ref__isnull=True, **dict(zip(fields, values))).update(**changes)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0004_seed_city_coordinates'),
+        ('animals', '0019_saved_searches'),
+        ('accounts', '0011_location_refs'),
+        ('butchers', '0007_location_refs'),
+        ('partnerships', '0003_location_refs'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_location_refs, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,76 @@
+"""
+Models for locations app.
+
+Canonical cities and districts of Turkey, seeded from data/locations.json
+(the same list the frontend dropdowns use in src/data/locations.js).
+Listings, butcher profiles, partnerships and users keep their free-text
+city/district columns for display and reference these tables for
+filtering (see apps.locations.lookup) and proximity search
+(see apps.locations.geo).
+"""
+
+from django.db import models
+
+
+class City(models.Model):
+    """A province (il)."""
+    
+    name = models.CharField(
+        max_length=100,
+        unique=True,
+        help_text="Şehir adı (örn: Ankara)"
+    )
+    latitude = models.FloatField(
+        null=True,
+        blank=True,
+        help_text="Centroid latitude (WGS84)"
+    )
+    longitude = models.FloatField(
+        null=True,
+        blank=True,
+        help_text="Centroid longitude (WGS84)"
+    )
+    
+    class Meta:
+        verbose_name = 'city'
+        verbose_name_plural = 'cities'
+        ordering = ['name']
+    
+    def __str__(self) -> str:
+        return self.name
+
+
+class District(models.Model):
+    """A district (ilçe) of a city."""
+    
+    city = models.ForeignKey(
+        City,
+        on_delete=models.CASCADE,
+        related_name='districts',
+        help_text="City this district belongs to"
+    )
+    name = models.CharField(
+        max_length=100,
+        help_text="İlçe adı (örn: Çankaya)"
+    )
+    latitude = models.FloatField(
+        null=True,
+        blank=True,
+        help_text="Centroid latitude (WGS84); the city centroid is used when empty"
+    )
+    longitude = models.FloatField(
+        null=True,
+        blank=True,
+        help_text="Centroid longitude (WGS84)"
+    )
+    
+    class Meta:
+        verbose_name = 'district'
+        verbose_name_plural = 'districts'
+        ordering = ['city__name', 'name']
+        constraints = [
+            models.UniqueConstraint(fields=['city', 'name'], name='unique_district_per_city'),
+        ]
+    
+    def __str__(self) -> str:
+        return f"{self.name}, {self.city.name}"
@@ -0,0 +1,49 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from .geo import geo_index
+from .lookup import has_district, location_index, located_models
+from .models import City, District
+
+
+def sync_location_refs(sender, instance, update_fields=None, using=None, **kwargs):
+    """
+    Points city_ref/district_ref at the canonical rows for the text fields.
+
+    A save with update_fields naming only the text fields would skip the
+    refs (update_fields is a frozenset by now), so changed refs are written
+    with their own UPDATE.
+    """
+    if update_fields is not None and not {'city', 'district', 'city_ref', 'district_ref'}.intersection(update_fields):
+        return
+
+    refs = {'city_ref_id': instance.city_ref_id}
+    if has_district(sender):
+        refs['district_ref_id'] = instance.district_ref_id
+        instance.city_ref_id, instance.district_ref_id = location_index.resolve(
+            instance.city, instance.district
+        )
+    else:
+        instance.city_ref_id = location_index.city_id(instance.city)
+
+    if update_fields is None or instance.pk is None:
+        return
+    unsaved = {
+        attname: getattr(instance, attname)
+        for attname, old_value in refs.items()
+        if attname[:-3] not in update_fields and getattr(instance, attname) != old_value
+    }
+    if unsaved:
+        sender._base_manager.using(using).filter(pk=instance.pk).update(**unsaved)
+
+for model in located_models():
+    pre_save.connect(sync_location_refs, sender=model, dispatch_uid=f'sync_location_refs_{model._meta.label}')
+
+
+@receiver(post_save, sender=City)
+@receiver(post_delete, sender=City)
+@receiver(post_save, sender=District)
+@receiver(post_delete, sender=District)
+def reset_location_index(sender, **kwargs):
+    """Reload the name and proximity indexes after the canonical tables change."""
+    location_index.clear()
+    geo_index.clear()
@@ -0,0 +1,189 @@
+"""
+Unified inbox built in the database.
+
+Direct conversations and the user's active group conversations are each
+read from their summary columns (last message, activity time, unread and
+member counts; see ConversationSummary), combined with UNION ALL and
+ordered by (updated_at, type, id), newest first. A page is one query,
+however many conversations or messages the user has.
+
+Pages are keyed on that ordering (see InboxPagination); the cursor
+condition is applied inside both halves of the union.
+"""
+
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from typing import List, Optional, Tuple
+
+from django.db.models import Case, CharField, F, IntegerField, Q, Value, When
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from .models import Conversation, GroupConversationParticipant
+
+DIRECT = 'DIRECT'
+GROUP = 'GROUP'
+
+# Same names, same annotation order in both halves: UNION matches columns by position
+INBOX_COLUMNS = [
+    'kind', 'item_id', 'partnership_ref', 'name', 'email', 'person_count', 'member_count',
+    'unread', 'last_message_ref', 'last_content', 'last_sender_ref', 'last_sender_username',
+    'last_sender_email', 'updated_at',
+]
+
+
+def direct_conversations(user):
+    """The user's direct conversations as inbox rows."""
+    def counterparty(field):
+        return Case(When(buyer=user, then=F(f'seller__{field}')), default=F(f'buyer__{field}'))
+
+    return Conversation.objects.filter(Q(buyer=user) | Q(seller=user)).order_by().annotate(
+        kind=Value(DIRECT, output_field=CharField()),
+        item_id=F('pk'),
+        partnership_ref=Value(None, output_field=IntegerField()),
+        name=counterparty('username'),
+        email=counterparty('email'),
+        person_count=Value(None, output_field=IntegerField()),
+        member_count=Value(None, output_field=IntegerField()),
+        unread=Case(When(buyer=user, then=F('buyer_unread_count')), default=F('seller_unread_count')),
+        last_message_ref=F('last_message_id'),
+        last_content=F('last_message_preview'),
+        last_sender_ref=F('last_message_sender_id'),
+        last_sender_username=F('last_message_sender__username'),
+        last_sender_email=F('last_message_sender__email'),
+        updated_at=F('last_activity_at'),
+    )
+
+
+def group_conversations(user):
+    """The group conversations the user is an active member of, as inbox rows."""
+    return GroupConversationParticipant.objects.filter(user=user, is_active=True).order_by().annotate(
+        kind=Value(GROUP, output_field=CharField()),
+        item_id=F('conversation_id'),
+        partnership_ref=F('conversation__partnership_id'),
+        name=F('conversation__partnership__city'),
+        email=Value('', output_field=CharField()),
+        person_count=F('conversation__partnership__person_count'),
+        member_count=F('conversation__member_count'),
+        unread=F('unread_count'),
+        last_message_ref=F('conversation__last_message_id'),
+        last_content=F('conversation__last_message_preview'),
+        last_sender_ref=F('conversation__last_message_sender_id'),
+        last_sender_username=F('conversation__last_message_sender__username'),
+        last_sender_email=F('conversation__last_message_sender__email'),
+        updated_at=F('conversation__last_activity_at'),
+    )
+
+
+def _after_cursor(kind: str, cursor: Tuple) -> Q:
+    """Rows of one half that sort after `cursor` in (updated_at, kind, id) DESC order."""
+    updated_at, cursor_kind, cursor_id = cursor
+    if kind < cursor_kind:
+        return Q(updated_at__lte=updated_at)
+    if kind > cursor_kind:
+        return Q(updated_at__lt=updated_at)
+    return Q(updated_at__lt=updated_at) | Q(updated_at=updated_at, item_id__lt=cursor_id)
+
+
+def inbox_rows(user, cursor: Optional[Tuple] = None):
+    """Both conversation types as one UNION ALL queryset, newest first."""
+    direct = direct_conversations(user)
+    group = group_conversations(user)
+    if cursor is not None:
+        direct = direct.filter(_after_cursor(DIRECT, cursor))
+        group = group.filter(_after_cursor(GROUP, cursor))
+    return (
+        direct.values(*INBOX_COLUMNS)
+        .union(group.values(*INBOX_COLUMNS), all=True)
+        .order_by('-updated_at', '-kind', '-item_id')
+    )
+
+
+def inbox_items(rows: List[dict]) -> List[dict]:
+    """InboxItemSerializer items for a page of inbox rows."""
+    items = []
+    for row in rows:
+        if row['kind'] == DIRECT:
+            title = row['name'] or row['email'].split('@')[0]
+        else:
+            title = f"{row['name']} Ortaklığı ({row['member_count']}/{row['person_count']})"
+        items.append({
+            'type': row['kind'],
+            'id': row['item_id'],
+            'title': title,
+            'partnership_id': row['partnership_ref'],
+            'last_message': {
+                'content': row['last_content'],
+                'sender_id': row['last_sender_ref'],
+                'sender_username': row['last_sender_username'] or (row['last_sender_email'] or '').split('@')[0],
+                'created_at': row['updated_at']
+            } if row['last_message_ref'] else None,
+            'unread_count': row['unread'],
+            'updated_at': row['updated_at']
+        })
+    return items
+
+
+class InboxPagination(BasePagination):
+    """
+    Keyset pagination over inbox_rows().
+
+    Forward only: the response has `next` (null on the last page) and
+    `results`.
+    """
+
+    cursor_query_param = 'cursor'
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 50
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_inbox(self, user, request) -> List[dict]:
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        rows = list(inbox_rows(user, self.decode_cursor(request))[:self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_page_size(self, request) -> int:
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next or not self.page:
+            return None
+        last = self.page[-1]
+        payload = json.dumps(
+            [last['updated_at'].isoformat(), last['kind'], last['item_id']], separators=(',', ':')
+        )
+        token = urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, token)
+
+    def decode_cursor(self, request) -> Optional[Tuple]:
+        token = request.query_params.get(self.cursor_query_param, '')
+        if not token:
+            return None
+        try:
+            padded = token + '=' * (-len(token) % 4)
+            updated_at, kind, item_id = json.loads(urlsafe_b64decode(padded.encode()).decode())
+            updated_at = parse_datetime(updated_at)
+            if updated_at is None or kind not in (DIRECT, GROUP):
+                raise ValueError
+            return updated_at, kind, int(item_id)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
@@ -0,0 +1,24 @@
+"""
+Recompute the conversation summary columns from the message tables.
+
+Usage:
+    python manage.py rebuild_conversation_summaries
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.messages.summaries import rebuild_conversation_summaries, rebuild_group_summaries
+
+
+class Command(BaseCommand):
+    help = "Rebuild last message, unread and member counts of all conversations"
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            direct = rebuild_conversation_summaries()
+            group = rebuild_group_summaries()
+        
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {direct} direct and {group} group conversation summaries"
+        ))
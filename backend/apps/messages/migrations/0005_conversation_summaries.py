@@ -0,0 +1,143 @@
+# Generated by Django 4.2.17 on 2026-10-17 03:37
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+from django.db.models import Case, Count, F, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce, Substr
+
+# Frozen copy of apps.messages.summaries as of this migration, so later
+# changes to the app code don't alter what it does
+PREVIEW_LENGTH = 255
+
+
+def _count(queryset):
+    return Coalesce(
+        Subquery(queryset.order_by().values('conversation').annotate(total=Count('pk')).values('total')),
+        0
+    )
+
+
+def _last_message_columns(messages) -> dict:
+    last = messages.order_by('-created_at', '-id')
+    return {
+        'last_message': Subquery(last.values('pk')[:1]),
+        'last_message_sender': Subquery(last.values('sender')[:1]),
+        'last_message_preview': Coalesce(
+            Substr(Subquery(last.values('content')[:1]), 1, PREVIEW_LENGTH), Value('')
+        ),
+        'last_activity_at': Coalesce(Subquery(last.values('created_at')[:1]), F('created_at')),
+    }
+
+
+def rebuild_summaries(apps, schema_editor):
+    """Fill the new summary columns from the existing messages."""
+    Conversation = apps.get_model('chat_messages', 'Conversation')
+    Message = apps.get_model('chat_messages', 'Message')
+    GroupConversation = apps.get_model('chat_messages', 'GroupConversation')
+    GroupConversationParticipant = apps.get_model('chat_messages', 'GroupConversationParticipant')
+    GroupMessage = apps.get_model('chat_messages', 'GroupMessage')
+
+    messages = Message.objects.filter(conversation=OuterRef('pk'))
+    unread = messages.filter(is_read=False)
+    Conversation.objects.update(
+        buyer_unread_count=_count(unread.filter(sender=OuterRef('seller'))),
+        seller_unread_count=_count(unread.filter(sender=OuterRef('buyer'))),
+        **_last_message_columns(messages)
+    )
+
+    GroupConversation.objects.update(
+        member_count=_count(GroupConversationParticipant.objects.filter(
+            conversation=OuterRef('pk'), is_active=True
+        )),
+        **_last_message_columns(GroupMessage.objects.filter(conversation=OuterRef('pk')))
+    )
+    others = GroupMessage.objects.filter(conversation=OuterRef('conversation')).exclude(sender=OuterRef('user'))
+    GroupConversationParticipant.objects.update(
+        unread_count=Case(
+            When(last_read_at__isnull=True, then=_count(others)),
+            default=_count(others.filter(created_at__gt=OuterRef('last_read_at'))),
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('chat_messages', '0004_inbox_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='conversation',
+            name='buyer_unread_count',
+            field=models.PositiveIntegerField(default=0, help_text="Messages from the seller the buyer hasn't read"),
+        ),
+        migrations.AddField(
+            model_name='conversation',
+            name='last_activity_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, help_text='Time of the last message (creation time before any)'),
+        ),
+        migrations.AddField(
+            model_name='conversation',
+            name='last_message',
+            field=models.ForeignKey(blank=True, help_text='Most recent message', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='chat_messages.message'),
+        ),
+        migrations.AddField(
+            model_name='conversation',
+            name='last_message_preview',
+            field=models.CharField(blank=True, default='', help_text='Start of the last message', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='conversation',
+            name='last_message_sender',
+            field=models.ForeignKey(blank=True, help_text='Sender of the last message', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='conversation',
+            name='seller_unread_count',
+            field=models.PositiveIntegerField(default=0, help_text="Messages from the buyer the seller hasn't read"),
+        ),
+        migrations.AddField(
+            model_name='groupconversation',
+            name='last_activity_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, help_text='Time of the last message (creation time before any)'),
+        ),
+        migrations.AddField(
+            model_name='groupconversation',
+            name='last_message',
+            field=models.ForeignKey(blank=True, help_text='Most recent message', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='chat_messages.groupmessage'),
+        ),
+        migrations.AddField(
+            model_name='groupconversation',
+            name='last_message_preview',
+            field=models.CharField(blank=True, default='', help_text='Start of the last message', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='groupconversation',
+            name='last_message_sender',
+            field=models.ForeignKey(blank=True, help_text='Sender of the last message', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='groupconversation',
+            name='member_count',
+            field=models.PositiveIntegerField(default=0, help_text='Active participants'),
+        ),
+        migrations.AddField(
+            model_name='groupconversationparticipant',
+            name='unread_count',
+            field=models.PositiveIntegerField(default=0, help_text='Messages from others since last_read_at'),
+        ),
+        migrations.AddIndex(
+            model_name='conversation',
+            index=models.Index(fields=['buyer', '-last_activity_at', '-id'], name='conv_buyer_activity_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='conversation',
+            index=models.Index(fields=['seller', '-last_activity_at', '-id'], name='conv_seller_activity_idx'),
+        ),
+        migrations.RunPython(rebuild_summaries, migrations.RunPython.noop),
+    ]
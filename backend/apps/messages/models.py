@@ -2,16 +2,77 @@
 Models for messages app.
 """
 
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Case, Count, F, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce, Greatest
 from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.utils import timezone
 
+# Characters of the last message kept on the conversation for lists
+PREVIEW_LENGTH = 255
 
-class Conversation(models.Model):
+
+def summary_updates(message) -> dict:
+    """
+    update() kwargs recording `message` as its conversation's last message.
+
+    Conditional on the stored last activity, so a message committed after
+    a newer one doesn't replace it.
+    """
+    newer = Q(last_message__isnull=True) | Q(last_activity_at__lte=message.created_at)
+
+    def latest(column, value, output_field):
+        return Case(When(newer, then=Value(value)), default=F(column), output_field=output_field)
+
+    return {
+        'last_message': latest('last_message', message.pk, models.BigIntegerField()),
+        'last_message_sender': latest('last_message_sender', message.sender_id, models.BigIntegerField()),
+        'last_message_preview': latest(
+            'last_message_preview', message.content[:PREVIEW_LENGTH], models.CharField()
+        ),
+        'last_activity_at': latest('last_activity_at', message.created_at, models.DateTimeField()),
+    }
+
+
+class ConversationSummary(models.Model):
+    """
+    Last-message columns shared by direct and group conversations.
+    
+    Kept up to date in the transaction that saves each new message, so
+    conversation lists never query the message tables;
+    `manage.py rebuild_conversation_summaries` recomputes them.
+    """
+    
+    last_message_sender = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        help_text="Sender of the last message"
+    )
+    last_message_preview = models.CharField(
+        max_length=PREVIEW_LENGTH,
+        blank=True,
+        default="",
+        help_text="Start of the last message"
+    )
+    last_activity_at = models.DateTimeField(
+        default=timezone.now,
+        help_text="Time of the last message (creation time before any)"
+    )
+    
+    class Meta:
+        abstract = True
+
+
+class Conversation(ConversationSummary):
     """
     Represents a conversation between a buyer and seller about an animal listing.
     
-    A conversation is unique per (listing, buyer) pair.
+    A conversation is unique per (listing, buyer) pair. Carries its last
+    message and each side's unread count (see ConversationSummary).
     """
     
     listing = models.ForeignKey(
@@ -32,6 +93,22 @@ class Conversation(models.Model):
         related_name='seller_conversations',
         help_text="The seller (owner of the listing)"
     )
+    last_message = models.ForeignKey(
+        'Message',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        help_text="Most recent message"
+    )
+    buyer_unread_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Messages from the seller the buyer hasn't read"
+    )
+    seller_unread_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Messages from the buyer the seller hasn't read"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
@@ -39,6 +116,11 @@ class Conversation(models.Model):
         verbose_name_plural = 'conversations'
         unique_together = [['listing', 'buyer']]
         ordering = ['-created_at']
+        indexes = [
+            # Inbox pages, newest activity first
+            models.Index(fields=['buyer', '-last_activity_at', '-id'], name='conv_buyer_activity_idx'),
+            models.Index(fields=['seller', '-last_activity_at', '-id'], name='conv_seller_activity_idx'),
+        ]
     
     def __str__(self) -> str:
         return f"Conversation about {self.listing.breed} between {self.buyer.email} and {self.seller.email}"
@@ -57,6 +139,33 @@ class Conversation(models.Model):
         
         if self.buyer == self.seller:
             raise ValidationError("Buyer and seller cannot be the same user.")
+    
+    def unread_count_for(self, user) -> int:
+        """Unread messages for one participant."""
+        return self.buyer_unread_count if user.pk == self.buyer_id else self.seller_unread_count
+    
+    def mark_read(self, user) -> int:
+        """
+        Mark the messages `user` received as read and lower their counter.
+        
+        The counter drops by the rows actually marked, so a message
+        committed between the two statements stays counted.
+        
+        Returns the number of messages marked.
+        """
+        is_buyer = user.pk == self.buyer_id
+        counter = 'buyer_unread_count' if is_buyer else 'seller_unread_count'
+        with transaction.atomic():
+            marked = self.messages.filter(
+                sender_id=self.seller_id if is_buyer else self.buyer_id,
+                is_read=False
+            ).update(is_read=True)
+            if marked:
+                Conversation.objects.filter(pk=self.pk).update(
+                    **{counter: Greatest(F(counter) - marked, Value(0))}
+                )
+        setattr(self, counter, max(getattr(self, counter) - marked, 0))
+        return marked
 
 
 class Message(models.Model):
@@ -90,10 +199,39 @@ class Message(models.Model):
         verbose_name = 'message'
         verbose_name_plural = 'messages'
         ordering = ['created_at']
+        indexes = [
+            # Last message per conversation (inbox)
+            models.Index(fields=['conversation', '-created_at', '-id'], name='message_conv_created_idx'),
+            # Unread counts only touch unread rows
+            models.Index(fields=['conversation', 'sender'], name='message_unread_idx', condition=models.Q(is_read=False)),
+        ]
     
     def __str__(self) -> str:
         return f"Message from {self.sender.email} at {self.created_at}"
     
+    def save(self, *args, **kwargs) -> None:
+        """
+        Save; a new message also updates its conversation's last message
+        and the recipient's unread count, in the same transaction.
+        """
+        if not self._state.adding:
+            return super().save(*args, **kwargs)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            Conversation.objects.filter(pk=self.conversation_id).update(
+                buyer_unread_count=Case(
+                    When(seller_id=self.sender_id, then=F('buyer_unread_count') + 1),
+                    default=F('buyer_unread_count'),
+                    output_field=models.PositiveIntegerField()
+                ),
+                seller_unread_count=Case(
+                    When(buyer_id=self.sender_id, then=F('seller_unread_count') + 1),
+                    default=F('seller_unread_count'),
+                    output_field=models.PositiveIntegerField()
+                ),
+                **summary_updates(self)
+            )
+    
     def clean(self) -> None:
         """
         Validate that sender is part of the conversation.
@@ -107,9 +245,12 @@ class Message(models.Model):
             raise ValidationError("Sender must be either the buyer or seller of this conversation.")
 
 
-class GroupConversation(models.Model):
+class GroupConversation(ConversationSummary):
     """
     Represents a group conversation for a partnership.
+    
+    Carries its last message and active member count; unread counts are
+    kept per participant.
     """
     
     partnership = models.OneToOneField(
@@ -117,6 +258,18 @@ class GroupConversation(models.Model):
         on_delete=models.CASCADE,
         related_name='group_conversation'
     )
+    last_message = models.ForeignKey(
+        'GroupMessage',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        help_text="Most recent message"
+    )
+    member_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Active participants"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
@@ -143,6 +296,10 @@ class GroupConversationParticipant(models.Model):
     )
     joined_at = models.DateTimeField(auto_now_add=True)
     last_read_at = models.DateTimeField(null=True, blank=True)
+    unread_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Messages from others since last_read_at"
+    )
     is_active = models.BooleanField(default=True)
     
     class Meta:
@@ -151,6 +308,40 @@ class GroupConversationParticipant(models.Model):
     
     def __str__(self):
         return f"{self.user.email} in {self.conversation}"
+    
+    def save(self, *args, **kwargs) -> None:
+        """
+        Save and recount the conversation's active members (unless
+        update_fields leaves is_active out).
+        
+        New members start with every earlier message unread, as nothing
+        has been read yet.
+        """
+        with transaction.atomic():
+            if self._state.adding and self.last_read_at is None:
+                self.unread_count = GroupMessage.objects.filter(
+                    conversation_id=self.conversation_id
+                ).exclude(sender_id=self.user_id).count()
+            super().save(*args, **kwargs)
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and 'is_active' not in update_fields:
+                return
+            GroupConversation.objects.filter(pk=self.conversation_id).update(
+                member_count=Coalesce(
+                    Subquery(
+                        GroupConversationParticipant.objects.filter(
+                            conversation_id=self.conversation_id, is_active=True
+                        ).order_by().values('conversation').annotate(total=Count('pk')).values('total')
+                    ),
+                    0
+                )
+            )
+    
+    def mark_read(self) -> None:
+        """Mark the conversation read up to now for this participant."""
+        self.last_read_at = timezone.now()
+        self.unread_count = 0
+        self.save(update_fields=['last_read_at', 'unread_count'])
 
 
 class GroupMessage(models.Model):
@@ -172,6 +363,25 @@ class GroupMessage(models.Model):
     
     class Meta:
         ordering = ['created_at']
+        indexes = [
+            # Last message and unread counts per conversation (inbox)
+            models.Index(fields=['conversation', '-created_at', '-id'], name='group_msg_conv_created_idx'),
+        ]
     
     def __str__(self):
         return f"Group message from {self.sender.email} at {self.created_at}"
+    
+    def save(self, *args, **kwargs) -> None:
+        """
+        Save; a new message also becomes the conversation's last message
+        and counts as unread for every other active participant, in the
+        same transaction.
+        """
+        if not self._state.adding:
+            return super().save(*args, **kwargs)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            GroupConversation.objects.filter(pk=self.conversation_id).update(**summary_updates(self))
+            GroupConversationParticipant.objects.filter(
+                conversation_id=self.conversation_id, is_active=True
+            ).exclude(user_id=self.sender_id).update(unread_count=F('unread_count') + 1)
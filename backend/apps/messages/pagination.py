@@ -0,0 +1,114 @@
+"""
+Pagination classes for messages app.
+"""
+
+from typing import List, Optional, Tuple
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class MessageCursorPagination(BasePagination):
+    """
+    Keyset pagination for a conversation's message history.
+
+    - Keyed on (created_at, id), matching the (conversation, created_at, id)
+      message indexes; no COUNT(*) and no OFFSET
+    - No cursor: the latest page_size messages
+    - ?before_id=<message id>: the page of older messages before it
+    - ?after_id=<message id>: messages after it, oldest first (polling for
+      new messages)
+    - Results are always in chronological order; the response contains
+      previous (older), next (newer) and results
+    """
+
+    before_query_param = 'before_id'
+    after_query_param = 'after_id'
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None) -> List:
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        before = self.decode_cursor(queryset, self.before_query_param)
+        after = self.decode_cursor(queryset, self.after_query_param)
+        queryset = queryset.order_by()
+
+        if before is not None:
+            queryset = queryset.filter(self.older_than(before))
+        if after is not None:
+            # Forward scan from the cursor; anything before it is older
+            queryset = queryset.filter(self.newer_than(after))
+            rows = list(queryset.order_by('created_at', 'id')[:self.page_size + 1])
+            self.has_newer = len(rows) > self.page_size or before is not None
+            self.has_older = True
+            self.page = rows[:self.page_size]
+            return self.page
+
+        rows = list(queryset.order_by('-created_at', '-id')[:self.page_size + 1])
+        self.has_older = len(rows) > self.page_size
+        self.has_newer = before is not None
+        self.page = rows[:self.page_size]
+        self.page.reverse()
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response({
+            'previous': self.get_previous_link(),
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_page_size(self, request) -> int:
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    @staticmethod
+    def older_than(cursor: Tuple) -> Q:
+        created_at, pk = cursor
+        return Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+
+    @staticmethod
+    def newer_than(cursor: Tuple) -> Q:
+        created_at, pk = cursor
+        return Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk)
+
+    def decode_cursor(self, queryset, param: str) -> Optional[Tuple]:
+        """(created_at, id) of the message named by `param`, looked up within `queryset`."""
+        value = self.request.query_params.get(param, '')
+        if not value:
+            return None
+        try:
+            pk = int(value)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+        cursor = queryset.filter(pk=pk).values_list('created_at', 'id').first()
+        if cursor is None:
+            raise NotFound(self.invalid_cursor_message)
+        return cursor
+
+    def _link(self, param: str, pk: int) -> str:
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.before_query_param)
+        url = remove_query_param(url, self.after_query_param)
+        return replace_query_param(url, param, pk)
+
+    def get_previous_link(self) -> Optional[str]:
+        if not self.has_older or not self.page:
+            return None
+        return self._link(self.before_query_param, self.page[0].pk)
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_newer or not self.page:
+            return None
+        return self._link(self.after_query_param, self.page[-1].pk)
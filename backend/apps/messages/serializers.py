@@ -73,40 +73,27 @@ class ConversationSerializer(serializers.ModelSerializer):
         return obj.seller.email.split('@')[0] if obj.seller.email else None
     
     def get_last_message(self, obj):
-        """Get the most recent message in this conversation."""
-        last_msg = obj.messages.order_by('-created_at').first()
-        if last_msg:
-            sender_username = last_msg.sender.username
-            if not sender_username and last_msg.sender.email:
-                sender_username = last_msg.sender.email.split('@')[0]
-                
-            return {
-                'content': last_msg.content,
-                'sender_id': last_msg.sender.id,
-                'sender_username': sender_username,
-                'created_at': last_msg.created_at
-            }
-        return None
+        """The most recent message, from the conversation's summary columns."""
+        if not obj.last_message_id:
+            return None
+        sender = obj.last_message_sender
+        sender_username = sender.username if sender else None
+        if sender and not sender_username and sender.email:
+            sender_username = sender.email.split('@')[0]
+        
+        return {
+            'content': obj.last_message_preview,
+            'sender_id': obj.last_message_sender_id,
+            'sender_username': sender_username,
+            'created_at': obj.last_activity_at
+        }
     
     def get_unread_count(self, obj):
-        """Get count of unread messages for the current user."""
+        """Count of unread messages for the current user (maintained on the conversation)."""
         request = self.context.get('request')
         if not request or not request.user:
             return 0
-        
-        # Count messages sent by the OTHER participant that are unread
-        if request.user == obj.buyer:
-            # Messages from seller to buyer
-            return obj.messages.filter(
-                sender=obj.seller,
-                is_read=False
-            ).count()
-        else:
-            # Messages from buyer to seller
-            return obj.messages.filter(
-                sender=obj.buyer,
-                is_read=False
-            ).count()
+        return obj.unread_count_for(request.user)
     
     def validate_listing(self, value: AnimalListing) -> AnimalListing:
         """
@@ -0,0 +1,68 @@
+"""
+Rebuild of the denormalized conversation summaries.
+
+Last message, activity time, unread and member counts are maintained on
+every message write and read-marking (see apps.messages.models). The
+functions here recompute them from the message tables, e.g. after
+messages were bulk-inserted or edited by hand. Each table is one UPDATE
+with correlated subqueries.
+
+chat_messages 0005 carries a frozen copy for its data step.
+"""
+
+from django.db.models import Case, Count, F, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce, Substr
+
+from .models import (
+    PREVIEW_LENGTH, Conversation, GroupConversation, GroupConversationParticipant, GroupMessage, Message
+)
+
+
+def _count(queryset):
+    """Correlated COUNT(*) over `queryset` (filtered on one conversation), 0 when empty."""
+    return Coalesce(
+        Subquery(queryset.order_by().values('conversation').annotate(total=Count('pk')).values('total')),
+        0
+    )
+
+
+def _last_message_columns(messages) -> dict:
+    """update() kwargs for the ConversationSummary columns from `messages` (correlated)."""
+    last = messages.order_by('-created_at', '-id')
+    return {
+        'last_message': Subquery(last.values('pk')[:1]),
+        'last_message_sender': Subquery(last.values('sender')[:1]),
+        'last_message_preview': Coalesce(
+            Substr(Subquery(last.values('content')[:1]), 1, PREVIEW_LENGTH), Value('')
+        ),
+        'last_activity_at': Coalesce(Subquery(last.values('created_at')[:1]), F('created_at')),
+    }
+
+
+def rebuild_conversation_summaries() -> int:
+    """Recompute every direct conversation's summary; returns the rows updated."""
+    messages = Message.objects.filter(conversation=OuterRef('pk'))
+    unread = messages.filter(is_read=False)
+    return Conversation.objects.update(
+        buyer_unread_count=_count(unread.filter(sender=OuterRef('seller'))),
+        seller_unread_count=_count(unread.filter(sender=OuterRef('buyer'))),
+        **_last_message_columns(messages)
+    )
+
+
+def rebuild_group_summaries() -> int:
+    """Recompute group conversation summaries and participant unread counts; returns the conversations updated."""
+    updated = GroupConversation.objects.update(
+        member_count=_count(GroupConversationParticipant.objects.filter(
+            conversation=OuterRef('pk'), is_active=True
+        )),
+        **_last_message_columns(GroupMessage.objects.filter(conversation=OuterRef('pk')))
+    )
+    others = GroupMessage.objects.filter(conversation=OuterRef('conversation')).exclude(sender=OuterRef('user'))
+    GroupConversationParticipant.objects.update(
+        unread_count=Case(
+            When(last_read_at__isnull=True, then=_count(others)),
+            default=_count(others.filter(created_at__gt=OuterRef('last_read_at'))),
+        )
+    )
+    return updated
@@ -8,9 +8,11 @@ from rest_framework.response import Response
 from rest_framework.decorators import action, api_view, permission_classes
 from django.db.models import Q
 from django.db import IntegrityError
-from django.utils import timezone
 from .models import Conversation, Message, GroupConversation, GroupMessage, GroupConversationParticipant
 from .serializers import ConversationSerializer, MessageSerializer, GroupMessageSerializer, InboxItemSerializer
+from .inbox import InboxPagination, inbox_items
+from .pagination import MessageCursorPagination
+from apps.realtime.events import GROUP_READ, READ, publish_read
 
 
 class ConversationViewSet(viewsets.ModelViewSet):
@@ -35,7 +37,7 @@ class ConversationViewSet(viewsets.ModelViewSet):
         user = self.request.user
         return Conversation.objects.filter(
             Q(buyer=user) | Q(seller=user)
-        ).select_related('listing', 'buyer', 'seller').order_by('-created_at')
+        ).select_related('listing', 'buyer', 'seller', 'last_message_sender').order_by('-created_at')
     
     def create(self, request, *args, **kwargs):
         """
@@ -103,22 +105,9 @@ class ConversationViewSet(viewsets.ModelViewSet):
         Only marks messages where receiver is request.user.
         """
         conversation = self.get_object()
-        
-        # Determine which messages to mark (received by this user)
-        if request.user == conversation.buyer:
-            # Mark messages from seller
-            marked = Message.objects.filter(
-                conversation=conversation,
-                sender=conversation.seller,
-                is_read=False
-            ).update(is_read=True)
-        else:
-            # Mark messages from buyer
-            marked = Message.objects.filter(
-                conversation=conversation,
-                sender=conversation.buyer,
-                is_read=False
-            ).update(is_read=True)
+        marked = conversation.mark_read(request.user)
+        if marked:
+            publish_read(request.user.pk, READ, conversation.pk)
         
         return Response({
             'status': 'ok',
@@ -131,11 +120,13 @@ class MessageViewSet(viewsets.ModelViewSet):
     ViewSet for messages.
     
     - CREATE: Send message in conversation
-    - LIST: Get messages (filtered by conversation)
+    - LIST: Get messages (filtered by conversation), latest page first;
+      ?before_id= / ?after_id= page through history (MessageCursorPagination)
     """
     
     serializer_class = MessageSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = MessageCursorPagination
     http_method_names = ['get', 'post', 'head', 'options']  # Disable PUT/PATCH/DELETE
     
     def get_queryset(self):
@@ -176,85 +167,16 @@ class MessageViewSet(viewsets.ModelViewSet):
 def inbox(request):
     """
     Unified inbox combining direct (1-1) and group conversations.
-    Returns sorted list by most recent activity.
-    """
-    user = request.user
-    inbox_items = []
-    
-    # Get direct conversations (where user is buyer or seller)
-    direct_convs = Conversation.objects.filter(
-        Q(buyer=user) | Q(seller=user)
-    )
-    
-    for conv in direct_convs:
-        last_msg = conv.messages.order_by('-created_at').first()
-        
-        # Determine counterparty
-        counterparty = conv.seller if user == conv.buyer else conv.buyer
-        counterparty_username = counterparty.username if counterparty.username else counterparty.email.split('@')[0]
-        
-        # Calculate unread count
-        if user == conv.buyer:
-            unread = conv.messages.filter(sender=conv.seller, is_read=False).count()
-        else:
-            unread = conv.messages.filter(sender=conv.buyer, is_read=False).count()
-        
-        inbox_items.append({
-            'type': 'DIRECT',
-            'id': conv.id,
-            'title': counterparty_username,
-            'partnership_id': None,
-            'last_message': {
-                'content': last_msg.content,
-                'sender_id': last_msg.sender.id,
-                'sender_username': last_msg.sender.username or last_msg.sender.email.split('@')[0],
-                'created_at': last_msg.created_at
-            } if last_msg else None,
-            'unread_count': unread,
-            'updated_at': last_msg.created_at if last_msg else conv.created_at
-        })
+    Returns a page sorted by most recent activity.
     
-    # Get group conversations (where user is active participant)
-    group_participants = GroupConversationParticipant.objects.filter(
-        user=user,
-        is_active=True
-    ).select_related('conversation__partnership')
-    
-    for participant in group_participants:
-        conv = participant.conversation
-        last_msg = conv.messages.order_by('-created_at').first()
-        
-        # Calculate unread count
-        if participant.last_read_at:
-            unread = conv.messages.filter(
-                created_at__gt=participant.last_read_at
-            ).exclude(sender=user).count()
-        else:
-            unread = conv.messages.exclude(sender=user).count()
-        
-        # Get member count
-        member_count = conv.participants.filter(is_active=True).count()
-        
-        inbox_items.append({
-            'type': 'GROUP',
-            'id': conv.id,
-            'title': f"{conv.partnership.city} Ortaklığı ({member_count}/{conv.partnership.person_count})",
-            'partnership_id': conv.partnership.id,
-            'last_message': {
-                'content': last_msg.content,
-                'sender_id': last_msg.sender.id,
-                'sender_username': last_msg.sender.username or last_msg.sender.email.split('@')[0],
-                'created_at': last_msg.created_at
-            } if last_msg else None,
-            'unread_count': unread,
-            'updated_at': last_msg.created_at if last_msg else conv.created_at
-        })
-    
-    # Sort by updated_at descending
-    inbox_items.sort(key=lambda x: x['updated_at'], reverse=True)
-    
-    serializer = InboxItemSerializer(inbox_items, many=True)
-    return Response(serializer.data)
+    A page is one UNION query over the conversation summary columns (see
+    apps.messages.inbox); ?cursor= continues from the `next` link and
+    ?page_size= sets the page length (max 50).
+    """
+    paginator = InboxPagination()
+    rows = paginator.paginate_inbox(request.user, request)
+    serializer = InboxItemSerializer()
+    return paginator.get_paginated_response([serializer.to_representation(item) for item in inbox_items(rows)])
 
 
 class GroupConversationViewSet(viewsets.ViewSet):
@@ -265,7 +187,12 @@ class GroupConversationViewSet(viewsets.ViewSet):
     
     @action(detail=True, methods=['get'], url_path='messages')
     def messages(self, request, pk=None):
-        """Get all messages in a group conversation."""
+        """
+        Get a page of messages in a group conversation.
+        
+        Latest page first; ?before_id= loads older messages and ?after_id=
+        newer ones (see MessageCursorPagination).
+        """
         try:
             conversation = GroupConversation.objects.get(pk=pk)
         except GroupConversation.DoesNotExist:
@@ -275,9 +202,10 @@ class GroupConversationViewSet(viewsets.ViewSet):
         if not conversation.participants.filter(user=request.user, is_active=True).exists():
             return Response({'error': 'Not authorized'}, status=status.HTTP_403_FORBIDDEN)
         
-        messages = conversation.messages.all()
+        paginator = MessageCursorPagination()
+        messages = paginator.paginate_queryset(conversation.messages.select_related('sender'), request, view=self)
         serializer = GroupMessageSerializer(messages, many=True, context={'request': request})
-        return Response(serializer.data)
+        return paginator.get_paginated_response(serializer.data)
     
     @action(detail=True, methods=['post'], url_path='messages/send')
     def send_message(self, request, pk=None):
@@ -318,7 +246,9 @@ class GroupConversationViewSet(viewsets.ViewSet):
         except GroupConversationParticipant.DoesNotExist:
             return Response({'error': 'Not authorized'}, status=status.HTTP_403_FORBIDDEN)
         
-        participant.last_read_at = timezone.now()
-        participant.save()
+        had_unread = participant.unread_count > 0
+        participant.mark_read()
+        if had_unread:
+            publish_read(request.user.pk, GROUP_READ, conversation.pk)
         
         return Response({'status': 'marked as read'})
@@ -22,6 +22,7 @@ class Notification(models.Model):
     APPOINTMENT_APPROVED = 'APPOINTMENT_APPROVED'
     APPOINTMENT_REJECTED = 'APPOINTMENT_REJECTED'
     APPOINTMENT_CANCELLED = 'APPOINTMENT_CANCELLED'
+    NEW_LISTING_MATCH = 'NEW_LISTING_MATCH'
     
     TYPE_CHOICES = [
         (NEW_MESSAGE, 'New Message'),
@@ -32,6 +33,7 @@ class Notification(models.Model):
         (APPOINTMENT_APPROVED, 'Appointment Approved'),
         (APPOINTMENT_REJECTED, 'Appointment Rejected'),
         (APPOINTMENT_CANCELLED, 'Appointment Cancelled'),
+        (NEW_LISTING_MATCH, 'New Listing Match'),
     ]
     
     user = models.ForeignKey(
@@ -7,17 +7,19 @@ from django.dispatch import receiver
 from apps.messages.models import Message
 from apps.favorites.models import Favorite
 from apps.animals.models import AnimalListing
+from apps.realtime.events import publish_notifications
 from .models import Notification
 
 
 @receiver(post_save, sender=Message)
-def notify_on_new_message(sender, instance, created, **kwargs):
+def notify_on_new_message(sender, instance, created, raw=False, **kwargs):
     """
     Create notification when a new message is sent.
     
     Notifies the OTHER participant (not the sender).
+    Raw saves (fixtures, listings restored from the archive) are skipped.
     """
-    if not created:
+    if not created or raw:
         return
     
     conversation = instance.conversation
@@ -41,13 +43,14 @@ def notify_on_new_message(sender, instance, created, **kwargs):
 
 
 @receiver(post_save, sender=Favorite)
-def notify_on_favorite(sender, instance, created, **kwargs):
+def notify_on_favorite(sender, instance, created, raw=False, **kwargs):
     """
     Create notification when a listing is favorited.
     
     Notifies the seller who owns the listing.
+    Raw saves (fixtures, listings restored from the archive) are skipped.
     """
-    if not created:
+    if not created or raw:
         return
     
     seller = instance.animal.seller
@@ -134,6 +137,7 @@ def notify_on_listing_update(sender, instance, created, **kwargs):
         ]
     
     Notification.objects.bulk_create(notifications)
+    publish_notifications(notifications)
     
     # Clean up tracking
     _listing_old_prices.pop(instance.pk, None)
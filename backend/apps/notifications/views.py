@@ -6,6 +6,8 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from config.renderers import StreamingJSONResponse, stream_serialized
+from apps.realtime.events import NOTIFICATION_READ, publish_read
 from .models import Notification
 from .serializers import NotificationSerializer
 
@@ -31,6 +33,16 @@ class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
         """
         return Notification.objects.filter(user=self.request.user)
     
+    def list(self, request, *args, **kwargs):
+        """
+        List all of the user's notifications.
+        
+        Unpaginated, so the array is streamed from a queryset iterator
+        instead of being built in memory.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        return StreamingJSONResponse(stream_serialized(queryset, self.get_serializer), request=request)
+    
     @action(detail=True, methods=['post'])
     def mark_as_read(self, request, pk=None):
         """
@@ -45,7 +57,9 @@ class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
             404 Not Found if notification doesn't exist or doesn't belong to user
         """
         notification = self.get_object()
-        notification.mark_as_read()
+        if not notification.is_read:
+            notification.mark_as_read()
+            publish_read(request.user.pk, NOTIFICATION_READ, notification.pk)
         
         serializer = self.get_serializer(notification)
         return Response(serializer.data)
@@ -57,5 +71,6 @@ class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
         
         POST /api/notifications/mark_all_read/
         """
-        self.get_queryset().update(is_read=True)
+        if self.get_queryset().filter(is_read=False).update(is_read=True):
+            publish_read(request.user.pk, NOTIFICATION_READ, 0)
         return Response({'status': 'success', 'message': 'All notifications marked as read'})
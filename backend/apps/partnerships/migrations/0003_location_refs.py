@@ -0,0 +1,20 @@
+# Generated by Django 4.2.17 on 2026-10-17 03:11
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0001_initial'),
+        ('partnerships', '0002_partnershipmembership_partnershipjoinrequest'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='partnershiplisting',
+            name='city_ref',
+            field=models.ForeignKey(blank=True, editable=False, help_text='Canonical city resolved from `city`', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='locations.city'),
+        ),
+    ]
@@ -34,6 +34,15 @@ class PartnershipListing(models.Model):
         max_length=100,
         help_text="City where partnership is sought"
     )
+    city_ref = models.ForeignKey(
+        'locations.City',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name='+',
+        help_text="Canonical city resolved from `city`"
+    )
     person_count = models.PositiveIntegerField(
         help_text="Number of partners needed"
     )
@@ -8,6 +8,7 @@ from .models import PartnershipListing, PartnershipMembership, PartnershipJoinRe
 from .serializers import PartnershipSerializer, MemberSerializer, JoinRequestSerializer
 from .permissions import IsCreator
 from apps.messages.models import GroupConversation, GroupConversationParticipant
+from apps.locations.lookup import filter_by_location
 
 
 class PartnershipListingViewSet(viewsets.ModelViewSet):
@@ -42,9 +43,7 @@ class PartnershipListingViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(status=PartnershipListing.OPEN)
         
         # Filter by city
-        city = self.request.query_params.get('city')
-        if city:
-            queryset = queryset.filter(city__icontains=city)
+        queryset = filter_by_location(queryset, city=self.request.query_params.get('city'))
         
         if is_my_partnerships:
             queryset = queryset.filter(memberships__user=self.request.user, memberships__is_active=True).distinct()
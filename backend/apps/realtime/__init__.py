@@ -0,0 +1,5 @@
+"""
+Realtime app: push of new messages and notifications.
+"""
+
+default_app_config = 'apps.realtime.apps.RealtimeConfig'
@@ -0,0 +1,15 @@
+"""
+Realtime app configuration.
+"""
+
+from django.apps import AppConfig
+
+
+class RealtimeConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.realtime'
+    verbose_name = 'Realtime'
+    
+    def ready(self):
+        """Import signal handlers when app is ready."""
+        import apps.realtime.signals
@@ -0,0 +1,43 @@
+"""
+JWT authentication for push connections.
+
+Browsers can't set an Authorization header on WebSocket or EventSource
+requests, so the access token may also come as ?token=. A connection is
+only authorized until its token expires; it is then closed and the client
+reconnects with a refreshed token.
+"""
+
+from datetime import datetime, timezone as dt_timezone
+from typing import Optional, Tuple
+
+from asgiref.sync import sync_to_async
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+TOKEN_QUERY_PARAM = 'token'
+
+
+def _authenticate_token(raw_token: str) -> Optional[Tuple[int, datetime]]:
+    authentication = JWTAuthentication()
+    try:
+        token = authentication.get_validated_token(raw_token.encode())
+        user = authentication.get_user(token)
+    except (InvalidToken, AuthenticationFailed):
+        return None
+    return user.pk, datetime.fromtimestamp(token['exp'], tz=dt_timezone.utc)
+
+
+def _bearer_token(authorization: str) -> str:
+    parts = authorization.split()
+    if len(parts) == 2 and parts[0] in api_settings.AUTH_HEADER_TYPES:
+        return parts[1]
+    return ''
+
+
+async def authenticate(raw_token: str = '', authorization: str = '') -> Optional[Tuple[int, datetime]]:
+    """(user id, token expiry) for a valid access token, else None."""
+    raw_token = _bearer_token(authorization) or raw_token
+    if not raw_token:
+        return None
+    return await sync_to_async(_authenticate_token)(raw_token)
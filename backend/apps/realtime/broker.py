@@ -0,0 +1,177 @@
+"""
+Per-user pub/sub behind the push endpoints.
+
+Connections subscribe to their user's channel and get a Subscription, an
+asyncio queue owned by the connection's event loop. publish() may be
+called from any thread (request threads, on_commit hooks); events are
+handed to the subscriber loops with call_soon_threadsafe.
+
+Brokers (settings.REALTIME_BROKER):
+- 'local': fan-out inside this process only; enough for one ASGI worker
+- 'redis': events go through one Redis pub/sub channel that every
+  process listens on, so a message saved by any worker reaches
+  connections held by the others (needs the redis package)
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from typing import Dict, Iterable, Optional, Set
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+
+try:
+    import redis
+except ImportError:  # Optional: only needed for REALTIME_BROKER = 'redis'
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+SUBSCRIPTION_QUEUE_SIZE = 100
+
+# Sent instead of events a slow connection missed; clients refetch
+RESYNC_EVENT = {'type': 'resync'}
+
+
+class Subscription:
+    """One connection's queue of events for a user."""
+
+    def __init__(self, broker, user_id: int, max_size: int = SUBSCRIPTION_QUEUE_SIZE):
+        self.broker = broker
+        self.user_id = user_id
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_size)
+
+    def push(self, event: dict) -> None:
+        """Queue `event` from any thread."""
+        try:
+            self.loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            # Loop closed: the connection is gone and will unsubscribe
+            pass
+
+    def _put(self, event: dict) -> None:
+        if self.queue.full():
+            # Don't let one stalled client buffer without bound
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            event = RESYNC_EVENT
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout: float) -> Optional[dict]:
+        """The next event, or None if nothing arrived within `timeout` seconds."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self.broker.unsubscribe(self)
+
+
+class LocalBroker:
+    """Delivers events to subscriptions held by this process."""
+
+    def __init__(self):
+        self._subscriptions: Dict[int, Set[Subscription]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, user_id: int) -> Subscription:
+        """Subscribe the calling event loop to `user_id`'s events."""
+        subscription = Subscription(self, user_id)
+        with self._lock:
+            self._subscriptions.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.user_id)
+            if subscriptions is None:
+                return
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[subscription.user_id]
+
+    def publish(self, user_ids: Iterable[int], event: dict) -> None:
+        """Send `event` to every connection of the given users."""
+        self.deliver(user_ids, event)
+
+    def deliver(self, user_ids: Iterable[int], event: dict) -> None:
+        with self._lock:
+            targets = [
+                subscription
+                for user_id in set(user_ids)
+                for subscription in self._subscriptions.get(user_id, ())
+            ]
+        for subscription in targets:
+            subscription.push(event)
+
+    def connection_count(self) -> int:
+        with self._lock:
+            return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+
+
+class RedisBroker(LocalBroker):
+    """
+    Publishes through Redis; each process delivers to its own connections.
+
+    A daemon thread per process listens on the channel, started with the
+    first subscription and reconnecting after Redis errors.
+    """
+
+    channel = 'realtime:events'
+    reconnect_delay = 1.0
+
+    def __init__(self, url: str):
+        if redis is None:
+            raise ImproperlyConfigured("REALTIME_BROKER = 'redis' requires the redis package.")
+        super().__init__()
+        self.client = redis.Redis.from_url(url)
+        self._listener = None
+
+    def subscribe(self, user_id: int) -> Subscription:
+        self._start_listener()
+        return super().subscribe(user_id)
+
+    def publish(self, user_ids: Iterable[int], event: dict) -> None:
+        payload = json.dumps({'users': list(user_ids), 'event': event}, cls=DjangoJSONEncoder)
+        try:
+            self.client.publish(self.channel, payload)
+        except redis.RedisError:
+            # Push is best effort; clients resync when they reconnect
+            logger.exception("Realtime publish failed")
+
+    def _start_listener(self) -> None:
+        with self._lock:
+            if self._listener is not None:
+                return
+            self._listener = threading.Thread(target=self._listen, name='realtime-redis', daemon=True)
+            self._listener.start()
+
+    def _listen(self) -> None:
+        while True:
+            try:
+                pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                for message in pubsub.listen():
+                    payload = json.loads(message['data'])
+                    self.deliver(payload['users'], payload['event'])
+            except redis.RedisError:
+                logger.exception("Realtime listener lost Redis, reconnecting")
+                time.sleep(self.reconnect_delay)
+
+
+def _make_broker():
+    name = getattr(settings, 'REALTIME_BROKER', 'local')
+    if name == 'local':
+        return LocalBroker()
+    if name == 'redis':
+        return RedisBroker(getattr(settings, 'REALTIME_REDIS_URL', 'redis://localhost:6379/0'))
+    raise ImproperlyConfigured(f"Unknown REALTIME_BROKER: {name}")
+
+
+broker = _make_broker()
@@ -0,0 +1,107 @@
+"""
+Push events and change-log entries for new messages, notifications and reads.
+
+Every change is recorded twice:
+- a ChangeLogEntry per affected user, in the writing transaction, for
+  clients that sync by long-polling (apps.realtime.sync). Its position
+  comes from the user's ChangeLogSequence row, which stays locked until
+  the transaction commits, so a user's positions commit in order
+- a push event {'type': ..., 'data': ...}, published after commit, where
+  data is what the REST API returns for the object, so clients handle
+  pushed and fetched objects the same way. A rolled-back write never
+  reaches a client.
+"""
+
+from typing import Dict, Iterable, List
+
+from django.db import transaction
+
+from apps.messages.models import GroupConversationParticipant
+from apps.messages.serializers import GroupMessageSerializer, MessageSerializer
+from apps.notifications.serializers import NotificationSerializer
+from .broker import broker
+from .models import ChangeLogEntry, ChangeLogSequence
+
+MESSAGE = ChangeLogEntry.MESSAGE
+GROUP_MESSAGE = ChangeLogEntry.GROUP_MESSAGE
+NOTIFICATION = ChangeLogEntry.NOTIFICATION
+READ = ChangeLogEntry.READ
+GROUP_READ = ChangeLogEntry.GROUP_READ
+NOTIFICATION_READ = ChangeLogEntry.NOTIFICATION_READ
+
+
+def publish_on_commit(user_ids: Iterable[int], event: dict) -> None:
+    user_ids = list(user_ids)
+    transaction.on_commit(lambda: broker.publish(user_ids, event))
+
+
+def _lock_sequences(user_ids: List[int]) -> Dict[int, ChangeLogSequence]:
+    """Lock (creating if needed) the users' sequence rows, in user id order."""
+    locked = ChangeLogSequence.objects.select_for_update().filter(user_id__in=user_ids).order_by('user_id')
+    sequences = {sequence.user_id: sequence for sequence in locked}
+    missing = [user_id for user_id in user_ids if user_id not in sequences]
+    if missing:
+        ChangeLogSequence.objects.bulk_create(
+            [ChangeLogSequence(user_id=user_id) for user_id in missing], ignore_conflicts=True
+        )
+        sequences.update({sequence.user_id: sequence for sequence in locked.filter(user_id__in=missing)})
+    return sequences
+
+
+def record_changes(entries: List[ChangeLogEntry]) -> None:
+    """Give entries the next positions of their users and save them."""
+    if not entries:
+        return
+    with transaction.atomic():
+        sequences = _lock_sequences(sorted({entry.user_id for entry in entries}))
+        for entry in entries:
+            sequence = sequences[entry.user_id]
+            sequence.last_position += 1
+            entry.position = sequence.last_position
+        ChangeLogSequence.objects.bulk_update(list(sequences.values()), ['last_position'], batch_size=500)
+        ChangeLogEntry.objects.bulk_create(entries, batch_size=500)
+
+
+def publish_message(message) -> None:
+    """A direct message, to both sides of the conversation."""
+    conversation = message.conversation
+    user_ids = [conversation.buyer_id, conversation.seller_id]
+    record_changes([
+        ChangeLogEntry(user_id=user_id, kind=MESSAGE, object_id=message.pk) for user_id in user_ids
+    ])
+    publish_on_commit(user_ids, {'type': MESSAGE, 'data': MessageSerializer(message).data})
+
+
+def publish_group_message(message) -> None:
+    """A group message, to every active participant."""
+    user_ids = list(GroupConversationParticipant.objects.filter(
+        conversation_id=message.conversation_id, is_active=True
+    ).values_list('user_id', flat=True))
+    record_changes([
+        ChangeLogEntry(user_id=user_id, kind=GROUP_MESSAGE, object_id=message.pk) for user_id in user_ids
+    ])
+    publish_on_commit(user_ids, {'type': GROUP_MESSAGE, 'data': GroupMessageSerializer(message).data})
+
+
+def publish_notifications(notifications: List) -> None:
+    """Saved notifications (also bulk-created ones, which send no post_save), to their users."""
+    notifications = [notification for notification in notifications if notification.pk is not None]
+    record_changes([
+        ChangeLogEntry(user_id=notification.user_id, kind=NOTIFICATION, object_id=notification.pk)
+        for notification in notifications
+    ])
+    for notification in notifications:
+        publish_on_commit(
+            [notification.user_id],
+            {'type': NOTIFICATION, 'data': NotificationSerializer(notification).data}
+        )
+
+
+def publish_read(user_id: int, kind: str, object_id: int) -> None:
+    """
+    The user read a conversation (READ, GROUP_READ) or notifications
+    (NOTIFICATION_READ; object_id 0 for all), so their other clients
+    update unread counts.
+    """
+    record_changes([ChangeLogEntry(user_id=user_id, kind=kind, object_id=object_id)])
+    publish_on_commit([user_id], {'type': kind, 'data': {'id': object_id}})
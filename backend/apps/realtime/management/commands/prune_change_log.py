@@ -0,0 +1,34 @@
+"""
+Delete old sync change-log entries.
+
+Clients whose token is older than the retention period get a reset and
+reload everything, so older entries are never read. Run daily (cron).
+
+Usage:
+    python manage.py prune_change_log
+    python manage.py prune_change_log --days 3
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.realtime.sync import prune_change_log, retention_days
+
+
+class Command(BaseCommand):
+    help = "Delete change-log entries older than SYNC_CHANGE_LOG_RETENTION_DAYS"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=None,
+            help='Keep this many days instead of SYNC_CHANGE_LOG_RETENTION_DAYS'
+        )
+
+    def handle(self, *args, **options):
+        days = options['days'] if options['days'] is not None else retention_days()
+        deleted = prune_change_log(days)
+        
+        self.stdout.write(self.style.SUCCESS(
+            f"Deleted {deleted} change-log entries older than {days} days"
+        ))
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.17 on 2026-10-17 03:45
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLogEntry',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('message', 'Yeni Mesaj'), ('group_message', 'Yeni Grup Mesajı'), ('notification', 'Yeni Bildirim'), ('read', 'Konuşma Okundu'), ('group_read', 'Grup Konuşması Okundu'), ('notification_read', 'Bildirim Okundu')], max_length=20)),
+                ('object_id', models.BigIntegerField(help_text='Message, conversation or notification id (0: all notifications)')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(help_text='User whose clients see this change', on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'change log entry',
+                'verbose_name_plural': 'change log entries',
+                'indexes': [models.Index(fields=['user', 'id'], name='changelog_user_id_idx'), models.Index(fields=['created_at'], name='changelog_created_idx')],
+            },
+        ),
+    ]
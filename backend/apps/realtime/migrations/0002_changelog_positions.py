@@ -0,0 +1,61 @@
+# Generated by Django 4.2.17 on 2026-10-17 05:10
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F, Max
+import django.db.models.deletion
+
+
+def backfill_positions(apps, schema_editor):
+    """Existing entries keep their id as position (ordered per user, gaps are fine)."""
+    ChangeLogEntry = apps.get_model('realtime', 'ChangeLogEntry')
+    ChangeLogSequence = apps.get_model('realtime', 'ChangeLogSequence')
+
+    ChangeLogEntry.objects.update(position=F('id'))
+    ChangeLogSequence.objects.bulk_create([
+        ChangeLogSequence(user_id=user_id, last_position=last_position)
+        for user_id, last_position in ChangeLogEntry.objects.values('user').annotate(
+            last_position=Max('id')
+        ).values_list('user', 'last_position')
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('realtime', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLogSequence',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('last_position', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'change log sequence',
+                'verbose_name_plural': 'change log sequences',
+            },
+        ),
+        migrations.AddField(
+            model_name='changelogentry',
+            name='position',
+            field=models.BigIntegerField(null=True),
+        ),
+        migrations.RunPython(backfill_positions, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='changelogentry',
+            name='position',
+            field=models.BigIntegerField(help_text='Per-user sync position; a position never commits before a lower one'),
+        ),
+        migrations.RemoveIndex(
+            model_name='changelogentry',
+            name='changelog_user_id_idx',
+        ),
+        migrations.AddConstraint(
+            model_name='changelogentry',
+            constraint=models.UniqueConstraint(fields=('user', 'position'), name='changelog_user_position_uniq'),
+        ),
+    ]
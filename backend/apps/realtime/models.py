@@ -0,0 +1,89 @@
+"""
+Models for realtime app.
+"""
+
+from django.conf import settings
+from django.db import models
+
+
+class ChangeLogEntry(models.Model):
+    """
+    One change a user's clients need to know about, in commit order per user.
+
+    Written in the same transaction as the change itself. `position` is
+    the sync position: taken from the user's ChangeLogSequence under a row
+    lock, so positions commit in order (see apps.realtime.events). Entries
+    only point at the changed object, which is loaded when a client syncs.
+    """
+    
+    MESSAGE = 'message'
+    GROUP_MESSAGE = 'group_message'
+    NOTIFICATION = 'notification'
+    READ = 'read'
+    GROUP_READ = 'group_read'
+    NOTIFICATION_READ = 'notification_read'
+    
+    KIND_CHOICES = [
+        (MESSAGE, 'Yeni Mesaj'),
+        (GROUP_MESSAGE, 'Yeni Grup Mesajı'),
+        (NOTIFICATION, 'Yeni Bildirim'),
+        (READ, 'Konuşma Okundu'),
+        (GROUP_READ, 'Grup Konuşması Okundu'),
+        (NOTIFICATION_READ, 'Bildirim Okundu'),
+    ]
+    
+    id = models.BigAutoField(primary_key=True)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='+',
+        help_text="User whose clients see this change"
+    )
+    position = models.BigIntegerField(
+        help_text="Per-user sync position; a position never commits before a lower one"
+    )
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField(
+        help_text="Message, conversation or notification id (0: all notifications)"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = 'change log entry'
+        verbose_name_plural = 'change log entries'
+        constraints = [
+            # "Changes since" per user is one range scan
+            models.UniqueConstraint(fields=['user', 'position'], name='changelog_user_position_uniq'),
+        ]
+        indexes = [
+            # Pruning
+            models.Index(fields=['created_at'], name='changelog_created_idx'),
+        ]
+    
+    def __str__(self) -> str:
+        return f"{self.kind} {self.object_id} for user {self.user_id}"
+
+
+class ChangeLogSequence(models.Model):
+    """
+    The last change-log position handed out for a user.
+
+    Writers lock this row to take positions and hold the lock until they
+    commit, so a user's entries become visible in position order and a
+    sync cursor never skips an entry that commits later.
+    """
+    
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='+'
+    )
+    last_position = models.BigIntegerField(default=0)
+    
+    class Meta:
+        verbose_name = 'change log sequence'
+        verbose_name_plural = 'change log sequences'
+    
+    def __str__(self) -> str:
+        return f"User {self.user_id} at {self.last_position}"
@@ -0,0 +1,30 @@
+"""
+Signal handlers publishing push events for new rows.
+"""
+
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from apps.messages.models import GroupMessage, Message
+from apps.notifications.models import Notification
+from .events import publish_group_message, publish_message, publish_notifications
+
+
+@receiver(post_save, sender=Message)
+def push_message(sender, instance, created, raw=False, **kwargs):
+    """Push a new direct message; raw saves (fixtures, archive restores) are skipped."""
+    if created and not raw:
+        publish_message(instance)
+
+
+@receiver(post_save, sender=GroupMessage)
+def push_group_message(sender, instance, created, raw=False, **kwargs):
+    """Push a new group message to the participants."""
+    if created and not raw:
+        publish_group_message(instance)
+
+
+@receiver(post_save, sender=Notification)
+def push_notification(sender, instance, created, raw=False, **kwargs):
+    """Push a new notification; bulk-created ones call publish_notifications() themselves."""
+    if created and not raw:
+        publish_notifications([instance])
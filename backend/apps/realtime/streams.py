@@ -0,0 +1,44 @@
+"""
+Event stream shared by the WebSocket and SSE endpoints.
+"""
+
+from datetime import datetime
+from typing import AsyncIterator, Optional
+
+from django.conf import settings
+from django.utils import timezone
+
+from config.renderers import encode_json
+from .broker import broker
+
+# First event of every connection: clients refetch what they may have
+# missed while disconnected, then rely on pushes
+READY_EVENT = {'type': 'ready'}
+
+
+def heartbeat_interval() -> float:
+    return getattr(settings, 'REALTIME_HEARTBEAT_INTERVAL', 25)
+
+
+async def iter_events(user_id: int, expires_at: datetime) -> AsyncIterator[Optional[dict]]:
+    """
+    Events for `user_id` until `expires_at`; None every heartbeat interval
+    without events, so proxies keep the connection open.
+    """
+    subscription = broker.subscribe(user_id)
+    try:
+        yield READY_EVENT
+        while True:
+            remaining = (expires_at - timezone.now()).total_seconds()
+            if remaining <= 0:
+                return
+            yield await subscription.get(min(heartbeat_interval(), remaining))
+    finally:
+        subscription.close()
+
+
+def sse_frame(event: Optional[dict]) -> bytes:
+    """An SSE data frame, or a comment line as heartbeat."""
+    if event is None:
+        return b': ping\n\n'
+    return b'data: ' + encode_json(event) + b'\n\n'
@@ -0,0 +1,154 @@
+"""
+"Changes since" sync over the per-user change log.
+
+A sync token is an opaque position in the user's ChangeLogEntry rows
+(the last position seen, plus when the token was issued). A sync reads
+the entries after it with one range scan on (user, position) and loads
+only the objects they point at, in one query per kind, together with
+the unread counts they affect. An idle client costs one indexed query.
+
+Positions are per user and commit in order (see apps.realtime.events),
+so once a client has seen a position, no entry below it can still appear.
+
+Tokens older than SYNC_CHANGE_LOG_RETENTION_DAYS may point at pruned
+entries; they, invalid tokens and a missing token get `reset: true`
+and the client reloads its lists from the REST API instead.
+"""
+
+import json
+import time
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import timedelta
+from typing import Dict, List, Optional, Set
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.messages.models import Conversation, GroupConversationParticipant, GroupMessage, Message
+from apps.messages.serializers import GroupMessageSerializer, MessageSerializer
+from apps.notifications.models import Notification
+from apps.notifications.serializers import NotificationSerializer
+from .models import ChangeLogEntry, ChangeLogSequence
+
+
+def retention_days() -> int:
+    return getattr(settings, 'SYNC_CHANGE_LOG_RETENTION_DAYS', 7)
+
+
+def max_changes() -> int:
+    return getattr(settings, 'SYNC_MAX_CHANGES', 500)
+
+
+def encode_token(position: int) -> str:
+    payload = json.dumps([position, int(time.time())], separators=(',', ':'))
+    return urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_token(token: str) -> Optional[int]:
+    """The position in a token, or None if it is invalid or expired."""
+    if not token:
+        return None
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        position, issued_at = json.loads(urlsafe_b64decode(padded.encode()).decode())
+        position, issued_at = int(position), int(issued_at)
+    except (TypeError, ValueError):
+        return None
+    if issued_at < time.time() - retention_days() * 86400:
+        return None
+    return position
+
+
+def latest_position(user_id: int) -> int:
+    return ChangeLogSequence.objects.filter(user_id=user_id).values_list('last_position', flat=True).first() or 0
+
+
+def changes_since(user_id: int, position: int) -> List[ChangeLogEntry]:
+    """Up to SYNC_MAX_CHANGES + 1 entries after `position`, oldest first."""
+    return list(
+        ChangeLogEntry.objects.filter(user_id=user_id, position__gt=position).order_by('position')[:max_changes() + 1]
+    )
+
+
+def _object_ids(entries: List[ChangeLogEntry], kind: str) -> Set[int]:
+    return {entry.object_id for entry in entries if entry.kind == kind}
+
+
+def empty_response(token: str, reset: bool = False) -> Dict[str, object]:
+    return {
+        'token': token,
+        'reset': reset,
+        'more': False,
+        'messages': [],
+        'group_messages': [],
+        'notifications': [],
+        'unread': {'conversations': [], 'groups': [], 'notifications': None},
+    }
+
+
+def reset_response(user_id: int) -> Dict[str, object]:
+    """A fresh token at the user's latest change; the client reloads everything."""
+    return empty_response(encode_token(latest_position(user_id)), reset=True)
+
+
+def sync_response(user_id: int, position: int, entries: List[ChangeLogEntry], request=None) -> Dict[str, object]:
+    """
+    New objects and affected unread counts for `entries`.
+
+    Objects deleted since, or no longer visible to the user (e.g. a group
+    they left), are left out. `unread.notifications` is the user's unread
+    notification count when it may have changed, else null.
+    """
+    more = len(entries) > max_changes()
+    entries = entries[:max_changes()]
+    response = empty_response(encode_token(entries[-1].position if entries else position))
+    response['more'] = more
+    if not entries:
+        return response
+    context = {'request': request}
+
+    messages = list(Message.objects.filter(
+        Q(conversation__buyer_id=user_id) | Q(conversation__seller_id=user_id),
+        pk__in=_object_ids(entries, ChangeLogEntry.MESSAGE)
+    ).select_related('sender').order_by('created_at', 'id'))
+    group_messages = list(GroupMessage.objects.filter(
+        pk__in=_object_ids(entries, ChangeLogEntry.GROUP_MESSAGE),
+        conversation__participants__user_id=user_id,
+        conversation__participants__is_active=True
+    ).select_related('sender').order_by('created_at', 'id'))
+    notifications = Notification.objects.filter(
+        user_id=user_id, pk__in=_object_ids(entries, ChangeLogEntry.NOTIFICATION)
+    ).order_by('-created_at')
+
+    response['messages'] = MessageSerializer(messages, many=True, context=context).data
+    response['group_messages'] = GroupMessageSerializer(group_messages, many=True, context=context).data
+    response['notifications'] = NotificationSerializer(notifications, many=True, context=context).data
+
+    conversation_ids = {message.conversation_id for message in messages} | _object_ids(entries, ChangeLogEntry.READ)
+    if conversation_ids:
+        response['unread']['conversations'] = [
+            {'id': pk, 'unread_count': buyer_unread if buyer_id == user_id else seller_unread}
+            for pk, buyer_id, buyer_unread, seller_unread in Conversation.objects.filter(
+                Q(buyer_id=user_id) | Q(seller_id=user_id), pk__in=conversation_ids
+            ).values_list('pk', 'buyer_id', 'buyer_unread_count', 'seller_unread_count')
+        ]
+    group_ids = {message.conversation_id for message in group_messages} | _object_ids(entries, ChangeLogEntry.GROUP_READ)
+    if group_ids:
+        response['unread']['groups'] = [
+            {'id': conversation_id, 'unread_count': unread_count}
+            for conversation_id, unread_count in GroupConversationParticipant.objects.filter(
+                user_id=user_id, is_active=True, conversation_id__in=group_ids
+            ).values_list('conversation_id', 'unread_count')
+        ]
+    if any(entry.kind in (ChangeLogEntry.NOTIFICATION, ChangeLogEntry.NOTIFICATION_READ) for entry in entries):
+        response['unread']['notifications'] = Notification.objects.filter(user_id=user_id, is_read=False).count()
+    return response
+
+
+def prune_change_log(days: Optional[int] = None) -> int:
+    """Delete entries older than `days` (default SYNC_CHANGE_LOG_RETENTION_DAYS); returns how many."""
+    if days is None:
+        days = retention_days()
+    deleted, _ = ChangeLogEntry.objects.filter(created_at__lt=timezone.now() - timedelta(days=days)).delete()
+    return deleted
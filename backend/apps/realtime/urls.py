@@ -0,0 +1,10 @@
+"""
+URL configuration for realtime app.
+"""
+
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('events/', views.EventStreamView.as_view(), name='realtime-events'),
+]
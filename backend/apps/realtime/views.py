@@ -0,0 +1,111 @@
+"""
+Views for realtime app.
+"""
+
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.views import View
+
+from config.renderers import encode_json
+from .auth import TOKEN_QUERY_PARAM, authenticate
+from .broker import broker
+from .streams import iter_events, sse_frame
+from .sync import changes_since, decode_token, reset_response, sync_response
+
+UNAUTHORIZED = {'detail': 'Kimlik doğrulama bilgileri sağlanmadı.'}
+# Under WSGI Django collects the whole stream before sending it
+STREAMING_UNAVAILABLE = {'detail': 'Canlı akış yalnızca ASGI sunucusunda çalışır; /api/sync/ kullanın.'}
+
+
+async def _sse_stream(user_id, expires_at):
+    async for event in iter_events(user_id, expires_at):
+        yield sse_frame(event)
+
+
+class EventStreamView(View):
+    """
+    Server-Sent Events fallback for clients without WebSocket.
+
+    Same events as /ws/events/, one `data:` frame each. Authorized by the
+    Authorization header or ?token=. The stream ends when the token
+    expires or after REALTIME_SSE_MAX_AGE seconds, whichever is first, and
+    the client reconnects: Django's ASGI handler doesn't notice a client
+    that went away, so this bounds how long an abandoned stream keeps its
+    subscription. Needs an ASGI server (config.asgi):
+    under WSGI (e.g. runserver) it answers 501 and clients long-poll
+    /api/sync/ instead.
+    """
+
+    http_method_names = ['get']
+
+    async def get(self, request):
+        if not isinstance(request, ASGIRequest):
+            return JsonResponse(STREAMING_UNAVAILABLE, status=501)
+        auth = await authenticate(
+            request.GET.get(TOKEN_QUERY_PARAM, ''), request.headers.get('Authorization', '')
+        )
+        if auth is None:
+            return JsonResponse(UNAUTHORIZED, status=401)
+        user_id, expires_at = auth
+        max_age = timedelta(seconds=getattr(settings, 'REALTIME_SSE_MAX_AGE', 300))
+        expires_at = min(expires_at, timezone.now() + max_age)
+
+        response = StreamingHttpResponse(_sse_stream(user_id, expires_at), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        # Don't let nginx buffer the stream
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+
+class SyncView(View):
+    """
+    Long-poll "changes since" endpoint for clients that can't hold a socket.
+
+    GET /api/sync/?since=<token>&timeout=<seconds>, authorized by the
+    Authorization header. Returns at once if the user has changes after
+    the token, otherwise waits up to `timeout` (default and maximum
+    SYNC_LONG_POLL_TIMEOUT) for one to be published. The response carries
+    the new messages, group messages, notifications and affected unread
+    counts plus the token for the next call (see apps.realtime.sync).
+    Without a valid token it returns a fresh one with `reset: true`.
+    """
+
+    http_method_names = ['get']
+
+    def get_timeout(self, request) -> float:
+        maximum = getattr(settings, 'SYNC_LONG_POLL_TIMEOUT', 25)
+        try:
+            timeout = float(request.GET['timeout'])
+        except (KeyError, ValueError):
+            return maximum
+        return min(max(timeout, 0), maximum)
+
+    async def get(self, request):
+        auth = await authenticate(authorization=request.headers.get('Authorization', ''))
+        if auth is None:
+            return JsonResponse(UNAUTHORIZED, status=401)
+        user_id, _ = auth
+
+        position = decode_token(request.GET.get('since', ''))
+        if position is None:
+            payload = await sync_to_async(reset_response)(user_id)
+            return HttpResponse(encode_json(payload), content_type='application/json')
+
+        # Subscribed before reading, so a change committed in between still wakes us
+        subscription = broker.subscribe(user_id)
+        try:
+            entries = await sync_to_async(changes_since)(user_id, position)
+            timeout = self.get_timeout(request)
+            if not entries and timeout:
+                if await subscription.get(timeout) is not None:
+                    entries = await sync_to_async(changes_since)(user_id, position)
+        finally:
+            subscription.close()
+
+        payload = await sync_to_async(sync_response)(user_id, position, entries, request)
+        return HttpResponse(encode_json(payload), content_type='application/json')
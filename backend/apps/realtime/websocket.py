@@ -0,0 +1,66 @@
+"""
+WebSocket push endpoint, served by config.asgi next to Django.
+
+Django has no WebSocket support, so this is a plain ASGI application:
+the connection is authorized from its JWT (?token=), subscribed to the
+user's channel and sent every event as a JSON text frame. Heartbeats are
+{"type": "ping"} frames. Messages from the client are ignored; sending
+goes through the REST API.
+
+Close codes: 4401 for a missing, invalid or expired token, 4404 for an
+unknown path.
+"""
+
+import asyncio
+from urllib.parse import parse_qs
+
+from config.renderers import encode_json
+from .auth import TOKEN_QUERY_PARAM, authenticate
+from .streams import iter_events
+
+WEBSOCKET_PATH = '/ws/events/'
+
+CLOSE_UNAUTHORIZED = 4401
+CLOSE_NOT_FOUND = 4404
+
+PING_EVENT = {'type': 'ping'}
+
+
+async def _wait_for_disconnect(receive) -> None:
+    while True:
+        message = await receive()
+        if message['type'] == 'websocket.disconnect':
+            return
+
+
+async def _send_events(send, user_id, expires_at) -> None:
+    async for event in iter_events(user_id, expires_at):
+        await send({'type': 'websocket.send', 'text': encode_json(event or PING_EVENT).decode()})
+    # Token expired: the client reconnects with a refreshed one
+    await send({'type': 'websocket.close', 'code': CLOSE_UNAUTHORIZED})
+
+
+async def websocket_application(scope, receive, send) -> None:
+    message = await receive()
+    if message['type'] != 'websocket.connect':
+        return
+    if scope['path'] != WEBSOCKET_PATH:
+        await send({'type': 'websocket.close', 'code': CLOSE_NOT_FOUND})
+        return
+
+    query = parse_qs(scope.get('query_string', b'').decode())
+    auth = await authenticate(query.get(TOKEN_QUERY_PARAM, [''])[0])
+    if auth is None:
+        await send({'type': 'websocket.close', 'code': CLOSE_UNAUTHORIZED})
+        return
+    user_id, expires_at = auth
+
+    await send({'type': 'websocket.accept'})
+    sender = asyncio.ensure_future(_send_events(send, user_id, expires_at))
+    disconnect = asyncio.ensure_future(_wait_for_disconnect(receive))
+    done, pending = await asyncio.wait({sender, disconnect}, return_when=asyncio.FIRST_COMPLETED)
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+    if sender in done:
+        sender.result()
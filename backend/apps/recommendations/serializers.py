@@ -4,7 +4,7 @@ Serializers for recommendations app.
 
 from rest_framework import serializers
 from .models import Recommendation, ListingInteraction
-from apps.animals.serializers import AnimalListingSerializer
+from apps.animals.row_serializers import ListingRowSerializer, NestedField, RowField, RowSerializer
 
 
 class RecommendationSerializer(serializers.ModelSerializer):
@@ -38,10 +38,13 @@ class ListingInteractionSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at']
 
 
-class RecommendedListingSerializer(serializers.Serializer):
+class RecommendedListingSerializer(RowSerializer):
     """
     Serializer for dynamic recommendations (calculated on the fly).
+    
+    Items carry the listing as a .values() row (see RecommendationEngine),
+    rendered by ListingRowSerializer.
     """
-    score = serializers.FloatField()
-    reasons = serializers.ListField(child=serializers.CharField())
-    listing = AnimalListingSerializer()
+    score = RowField(transform=float)
+    reasons = RowField(transform=list)
+    listing = NestedField(ListingRowSerializer)
@@ -1,8 +1,10 @@
 import logging
 from datetime import timedelta
-from django.db.models import Q, F, Count, Avg
+from django.db.models import Q, Count, Avg
 from django.utils import timezone
 from apps.animals.models import AnimalListing
+from apps.animals.row_serializers import ListingRowSerializer
+from apps.animals.view_counter import view_counter
 from apps.accounts.models import User
 from .models import ListingInteraction
 
@@ -67,6 +69,9 @@ class RecommendationEngine:
     def _generate_candidates(self, user, target_city, exclude_ids):
         """
         Fetch active listings to be scored.
+        
+        Returns .values() rows carrying every ListingRowSerializer column,
+        so the ranked listings are rendered without model instances.
         """
         # Base filter: Active listings only
         queryset = AnimalListing.objects.filter(is_active=True)
@@ -93,7 +98,9 @@ class RecommendationEngine:
             queryset = queryset.filter(created_at__gte=timezone.now() - timedelta(days=60))
             
         # Limit candidate pool size for performance (score max 200 items)
-        return queryset.select_related('seller').order_by('-created_at')[:200]
+        return queryset.with_image_summary().order_by('-created_at').values(
+            *ListingRowSerializer.columns()
+        )[:200]
 
     def _score_listing(self, listing, user, target_city, target_district):
         """
@@ -104,23 +111,23 @@ class RecommendationEngine:
         reasons = []
         
         # 1. Location Match
-        if target_city and listing.city and listing.city.lower() == target_city.lower():
+        if target_city and listing['city'] and listing['city'].lower() == target_city.lower():
             score += self.weights['location_city']
             reasons.append('SAME_CITY')
             
-            if target_district and listing.district and listing.district.lower() == target_district.lower():
+            if target_district and listing['district'] and listing['district'].lower() == target_district.lower():
                 score += self.weights['location_district']
                 reasons.append('SAME_DISTRICT')
 
         # 2. Recency (New Listing)
         # Is created in last 7 days?
-        if listing.created_at >= timezone.now() - timedelta(days=7):
+        if listing['created_at'] >= timezone.now() - timedelta(days=7):
             score += self.weights['recency']
             reasons.append('NEW_LISTING')
             
         # 3. Popularity (View Count)
         # Simple normalization: cap at 100 views -> max boost
-        views = listing.view_count
+        views = listing['view_count']
         popularity_boost = min(views / 100.0, 1.0) * self.weights['popularity']
         if popularity_boost > 0.05: # Threshold to mention
             score += popularity_boost
@@ -142,7 +149,7 @@ class RecommendationEngine:
         adjusted_list = []
         
         for item in scored_listings:
-            seller_id = item['listing'].seller_id
+            seller_id = item['listing']['seller']
             count = seller_counts.get(seller_id, 0)
             
             if count > 0:
@@ -162,20 +169,20 @@ class RecommendationEngine:
     def log_interaction(self, user, listing_id, interaction_type, ip_address=None):
         """
         Log user interaction.
+        
+        VIEW interactions go through the shared view pipeline (same dedup and
+        batched writes as the listing detail endpoint), which also bumps
+        view_count. Other interactions are stored directly.
         """
-        try:
-            listing = AnimalListing.objects.get(id=listing_id)
-            ListingInteraction.objects.create(
-                user=user if user and user.is_authenticated else None,
-                listing=listing,
-                interaction_type=interaction_type,
-                ip_address=ip_address
-            )
-            
-            # Update view count directly on listing for simple tracking
-            if interaction_type == ListingInteraction.VIEW:
-                listing.view_count = F('view_count') + 1
-                listing.save(update_fields=['view_count'])
-                
-        except AnimalListing.DoesNotExist:
-            pass
+        user_id = user.pk if user and user.is_authenticated else None
+        
+        if interaction_type == ListingInteraction.VIEW:
+            view_counter.record_view(listing_id, user_id=user_id, ip_address=ip_address)
+            return
+        
+        ListingInteraction.objects.create(
+            user_id=user_id,
+            listing_id=listing_id,
+            interaction_type=interaction_type,
+            ip_address=ip_address
+        )
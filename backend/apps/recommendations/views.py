@@ -86,9 +86,9 @@ class ListingRecommendationViewSet(viewsets.ViewSet):
         )
         
         # Serialize
-        serializer = RecommendedListingSerializer(results, many=True)
+        serializer = RecommendedListingSerializer(context={'request': request})
         return Response({
-            'items': serializer.data
+            'items': serializer.serialize(results)
         })
 
 
@@ -105,6 +105,7 @@ class ListingInteractionViewSet(viewsets.ViewSet):
         """
         from .serializers import ListingInteractionSerializer
         from .services import RecommendationEngine
+        from apps.animals.view_counter import get_client_ip
         
         serializer = ListingInteractionSerializer(data=request.data)
         if serializer.is_valid():
@@ -116,18 +117,11 @@ class ListingInteractionViewSet(viewsets.ViewSet):
             listing = serializer.validated_data['listing']
             interaction_type = serializer.validated_data['interaction_type']
             
-            # Get IP for anon users
-            x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-            if x_forwarded_for:
-                ip = x_forwarded_for.split(',')[0]
-            else:
-                ip = request.META.get('REMOTE_ADDR')
-                
             engine.log_interaction(
                 user=request.user,
                 listing_id=listing.id,
                 interaction_type=interaction_type,
-                ip_address=ip
+                ip_address=get_client_ip(request)
             )
             
             return Response({'status': 'logged'}, status=status.HTTP_201_CREATED)
@@ -13,4 +13,14 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.dev')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported after Django is set up
+from apps.realtime.websocket import websocket_application  # noqa: E402
+
+
+async def application(scope, receive, send):
+    """Django for HTTP; the push endpoint (apps.realtime.websocket) for WebSocket."""
+    if scope['type'] == 'websocket':
+        return await websocket_application(scope, receive, send)
+    return await django_application(scope, receive, send)
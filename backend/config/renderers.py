@@ -0,0 +1,147 @@
+"""
+JSON rendering for API responses.
+
+FastJSONRenderer produces the same bytes as DRF's JSONRenderer. It uses
+orjson when installed. Decimal and datetime values left in the data are
+still handed to DRF's encoder, so their formats don't change. Without
+orjson it reuses one compiled stdlib encoder instead of building one per
+response.
+
+StreamingJSONResponse writes a JSON array chunk by chunk from an iterator.
+Combined with stream_serialized() over queryset.iterator(), memory stays
+flat however many rows an unpaginated endpoint returns. Under ASGI the
+iterator is wrapped by streaming_content(): Django 4.2 would otherwise
+collect a sync iterator into a list before sending anything.
+"""
+
+from itertools import islice
+from typing import AsyncIterator, Callable, Iterable, Iterator, Union
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # Optional: pip install orjson for faster rendering
+    orjson = None
+
+STREAM_CHUNK_SIZE = 500
+
+_encoder = JSONEncoder(
+    ensure_ascii=JSONRenderer.ensure_ascii,
+    allow_nan=not JSONRenderer.strict,
+    separators=(',', ':') if JSONRenderer.compact else (', ', ': ')
+)
+
+# orjson always writes compact UTF-8, so it is only used when DRF's settings
+# ask for the same. It writes NaN/Infinity (which DRF rejects) as null.
+_use_orjson = orjson is not None and not JSONRenderer.ensure_ascii and JSONRenderer.compact
+_ORJSON_OPTIONS = (
+    orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+    if orjson is not None else 0
+)
+
+
+def encode_json(data) -> bytes:
+    """`data` as compact JSON bytes, identical to JSONRenderer's output."""
+    if _use_orjson:
+        try:
+            content = orjson.dumps(data, default=_encoder.default, option=_ORJSON_OPTIONS)
+        except TypeError:
+            # Types orjson can't take even through default() (e.g. ints over
+            # 64 bits); the stdlib path decides
+            pass
+        else:
+            return content.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+    # Same escaping as JSONRenderer: U+2028/U+2029 are invalid in JavaScript strings
+    text = _encoder.encode(data)
+    return text.replace('\u2028', '\\u2028').replace('\u2029', '\\u2029').encode()
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    Drop-in JSONRenderer using encode_json().
+
+    Indented output (?indent= in the Accept header) goes through DRF.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        return encode_json(data)
+
+
+def iter_json_array(items: Iterable, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+    """Encode `items` as one JSON array, yielding a chunk per `chunk_size` items."""
+    yield b'['
+    items = iter(items)
+    first = True
+    while True:
+        chunk = list(islice(items, chunk_size))
+        if not chunk:
+            break
+        encoded = b','.join(encode_json(item) for item in chunk)
+        yield encoded if first else b',' + encoded
+        first = False
+    yield b']'
+
+
+def stream_serialized(queryset, serializer: Callable, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator:
+    """
+    Serialized rows of `queryset`, one chunk of instances in memory at a time.
+
+    `serializer` is called as serializer(instances, many=True), e.g. a
+    view's get_serializer. Rows are read with queryset.iterator(), so the
+    queryset result cache is never filled.
+    """
+    rows = queryset.iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        yield from serializer(chunk, many=True).data
+
+
+_EXHAUSTED = object()
+
+
+async def _iterate_in_thread(iterator: Iterator) -> AsyncIterator:
+    # thread_sensitive (the default): the iterator's DB cursor belongs to
+    # the thread the sync view ran in
+    next_chunk = sync_to_async(next)
+    while True:
+        chunk = await next_chunk(iterator, _EXHAUSTED)
+        if chunk is _EXHAUSTED:
+            break
+        yield chunk
+
+
+def streaming_content(request, content: Iterable) -> Union[Iterable, AsyncIterator]:
+    """
+    StreamingHttpResponse content for `request` that is really streamed.
+
+    Under ASGI, Django 4.2 consumes a sync iterator with
+    sync_to_async(list), buffering the whole body; it gets an async
+    iterator that advances the sync one a chunk at a time instead.
+    """
+    # DRF's Request wraps the HttpRequest
+    if isinstance(getattr(request, '_request', request), ASGIRequest):
+        return _iterate_in_thread(iter(content))
+    return content
+
+
+class StreamingJSONResponse(StreamingHttpResponse):
+    """
+    A JSON array response written incrementally from an iterator of items.
+
+    Pass the request so the stream also stays incremental under ASGI.
+    """
+
+    def __init__(self, items: Iterable, chunk_size: int = STREAM_CHUNK_SIZE, request=None, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(streaming_content(request, iter_json_array(items, chunk_size)), **kwargs)
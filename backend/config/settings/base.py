@@ -33,11 +33,13 @@ INSTALLED_APPS = [
     'apps.favorites',
     'apps.messages',
     'apps.notifications',
+    'apps.realtime',
     'apps.partnerships',
     'apps.butchers',
     'apps.reviews',
     'apps.recommendations',
     'apps.reports',
+    'apps.locations',
     'apps.logs',
 ]
 
@@ -114,6 +116,10 @@ MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
 
+# Background workers rendering resized image variants (apps.animals.image_processing)
+IMAGE_PROCESSING_WORKERS = 2
+
+
 # Custom User Model
 AUTH_USER_MODEL = 'accounts.User'
 
@@ -127,7 +133,8 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ),
     'DEFAULT_RENDERER_CLASSES': (
-        'rest_framework.renderers.JSONRenderer',
+        # Same output as rest_framework.renderers.JSONRenderer, faster
+        'config.renderers.FastJSONRenderer',
     ),
 }
 
@@ -142,6 +149,31 @@ SIMPLE_JWT = {
 }
 
 
+# Listing view ingestion (apps.animals.view_counter)
+# 'local' buffers per process, 'cache' shares pending counts via the cache backend
+VIEW_COUNT_BUFFER = 'local'
+VIEW_COUNT_FLUSH_INTERVAL = 10  # seconds
+VIEW_DEDUP_WINDOW = 30 * 60  # repeat views by the same user/IP are ignored (seconds)
+
+
+# Listing archive (apps.animals.archive): listings created this long ago
+# move out of the live table. One Kurban Bayramı season by default.
+LISTING_ARCHIVE_AFTER_DAYS = 365
+
+# Push of messages and notifications (apps.realtime)
+# 'local' delivers within one process; 'redis' spans all workers via REALTIME_REDIS_URL
+REALTIME_BROKER = 'local'
+REALTIME_REDIS_URL = 'redis://localhost:6379/0'
+REALTIME_HEARTBEAT_INTERVAL = 25  # seconds
+# Django's ASGI handler doesn't notice a closed SSE tab, so each stream
+# ends after this many seconds and the browser reconnects
+REALTIME_SSE_MAX_AGE = 300
+
+# Long-poll sync (/api/sync/, apps.realtime.sync)
+SYNC_LONG_POLL_TIMEOUT = 25  # seconds a request waits for a change
+SYNC_MAX_CHANGES = 500  # changes per response; the rest come with `more: true`
+SYNC_CHANGE_LOG_RETENTION_DAYS = 7  # older entries are pruned (manage.py prune_change_log)
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 CORS_ALLOW_ALL_ORIGINS = True
@@ -21,6 +21,7 @@ from apps.accounts.views import (
     CustomTokenObtainPairView, RegisterView, MeAPIView,
     RequestOTPView, VerifyOTPView
 )
+from apps.realtime.views import SyncView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -47,6 +48,12 @@ urlpatterns = [
     # Notifications API
     path('api/notifications/', include('apps.notifications.urls')),
     
+    # Push of new messages and notifications (SSE; WebSocket is /ws/events/, see config.asgi)
+    path('api/realtime/', include('apps.realtime.urls')),
+    
+    # Long-poll "changes since" fallback for clients without a socket
+    path('api/sync/', SyncView.as_view(), name='sync'),
+    
     # Recommendations API
     path('api/recommendations/', include('apps.recommendations.urls')),
     
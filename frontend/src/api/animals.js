@@ -3,11 +3,19 @@ import apiClient from './axios';
 // Fetch animals with support for filters
 export const fetchAnimals = async (params = {}) => {
     // params can be { page, animal_type, min_price, max_price, location, ... }
+    // view: 'card' (or fields: 'id,title,price') returns only what cards need
     const queryString = new URLSearchParams(params).toString();
     const response = await apiClient.get(`/api/animals/?${queryString}`);
     return response.data;  // Returns { count, next, previous, results }
 };
 
+// Fetch sidebar facet counts for the same filters as fetchAnimals
+export const fetchAnimalFacets = async (params = {}) => {
+    const queryString = new URLSearchParams(params).toString();
+    const response = await apiClient.get(`/api/animals/facets/?${queryString}`);
+    return response.data;  // Returns { total, animal_type, city, district, gender, price, age }
+};
+
 // Fetch ALL animals by following pagination
 export const fetchAllAnimals = async () => {
     let allAnimals = [];
@@ -48,3 +56,34 @@ export const reorderAnimalImages = async (listingId, orders) => {
     );
     return response.data;
 };
+
+// Saved searches: notified via NEW_LISTING_MATCH instead of polling the list
+export const fetchSavedSearches = async () => {
+    const response = await apiClient.get('/api/animals/saved-searches/');
+    return response.data;
+};
+
+export const createSavedSearch = async (search) => {
+    // search uses the list filter names: { name, animal_type, city, max_price, ... }
+    const response = await apiClient.post('/api/animals/saved-searches/', search);
+    return response.data;
+};
+
+export const deleteSavedSearch = async (searchId) => {
+    const response = await apiClient.delete(`/api/animals/saved-searches/${searchId}/`);
+    return response.data;
+};
+
+// Bulk import from a .csv or .json file; returns { created, failed, errors: [{ row, errors }], ... }
+export const importAnimals = async (file, { dryRun = false } = {}) => {
+    const formData = new FormData();
+    formData.append('file', file);
+    const response = await apiClient.post(`/api/animals/import/${dryRun ? '?dry_run=true' : ''}`, formData);
+    return response.data;
+};
+
+// fileFormat: 'csv' | 'xlsx'; resolves to a Blob to save
+export const exportAnimals = async (fileFormat = 'csv') => {
+    const response = await apiClient.get(`/api/animals/export/${fileFormat}/`, { responseType: 'blob' });
+    return response.data;
+};
@@ -25,10 +25,14 @@ export const fetchConversations = async () => {
 };
 
 /**
- * Fetch messages for a specific conversation
+ * Fetch a page of messages for a specific conversation
+ * Returns { previous, next, results }: the latest messages by default;
+ * pass { before_id } for older ones or { after_id } for newer ones
  */
-export const fetchConversationMessages = async (conversationId) => {
-    const response = await apiClient.get(`/api/messages/?conversation=${conversationId}`);
+export const fetchConversationMessages = async (conversationId, cursor = {}) => {
+    const response = await apiClient.get('/api/messages/', {
+        params: { conversation: conversationId, ...cursor }
+    });
     return response.data;
 };
 
@@ -62,18 +66,22 @@ export const createConversation = async (listingId) => {
 };
 
 /**
- * Fetch unified inbox (direct + group conversations)
+ * Fetch a page of the unified inbox (direct + group conversations)
+ * Returns { next, results }; pass `next` back in to load the following page
  */
-export const fetchInbox = async () => {
-    const response = await apiClient.get('/api/messages/inbox/');
+export const fetchInbox = async (nextUrl = null) => {
+    const response = await apiClient.get(nextUrl || '/api/messages/inbox/');
     return response.data;
 };
 
 /**
- * Fetch group conversation messages
+ * Fetch a page of group conversation messages
+ * Same paging as fetchConversationMessages
  */
-export const fetchGroupMessages = async (groupId) => {
-    const response = await apiClient.get(`/api/messages/groups/${groupId}/messages/`);
+export const fetchGroupMessages = async (groupId, cursor = {}) => {
+    const response = await apiClient.get(`/api/messages/groups/${groupId}/messages/`, {
+        params: cursor
+    });
     return response.data;
 };
 
@@ -0,0 +1,197 @@
+/**
+ * Push channel for new messages and notifications.
+ *
+ * One shared connection per tab: a WebSocket to /ws/events/, or Server-Sent
+ * Events from /api/realtime/events/ when WebSocket isn't available or
+ * can't connect, or as a last resort long-polling /api/sync/. A stream
+ * that doesn't open within OPEN_TIMEOUT counts as unavailable: under a
+ * WSGI server (e.g. runserver) neither stream works, and only polling
+ * delivers events. Events look
+ * like { type, data } with type 'message', 'group_message' or
+ * 'notification'; data is the same object the REST API returns.
+ *
+ * Listeners also get { type: 'resync' } after a reconnect (or when the
+ * server dropped events for a slow connection): anything may have been
+ * missed, so they refetch.
+ */
+
+const API_URL = 'http://localhost:8000';
+const WS_URL = API_URL.replace(/^http/, 'ws');
+
+const MAX_RETRY_DELAY = 30000;
+const OPEN_TIMEOUT = 10000;
+
+const listeners = new Set();
+let socket = null;
+let eventSource = null;
+// 'ws', then 'sse', then 'poll' when a transport never connects
+let mode = typeof WebSocket === 'undefined' ? 'sse' : 'ws';
+let polling = false;
+let syncToken = null;
+let retryDelay = 1000;
+let retryTimer = null;
+let openTimer = null;
+let connectedBefore = false;
+
+const dispatch = (event) => {
+    if (event.type === 'ping') return;
+    if (event.type === 'ready') {
+        retryDelay = 1000;
+        // The first connection needs no resync: components load on mount
+        if (!connectedBefore) {
+            connectedBefore = true;
+            return;
+        }
+        event = { type: 'resync' };
+    }
+    listeners.forEach(listener => listener(event));
+};
+
+const handleFrame = (text) => {
+    try {
+        dispatch(JSON.parse(text));
+    } catch (error) {
+        console.error('Invalid realtime event', error);
+    }
+};
+
+const scheduleReconnect = () => {
+    if (retryTimer || listeners.size === 0) return;
+    retryTimer = setTimeout(() => {
+        retryTimer = null;
+        connect();
+    }, retryDelay);
+    retryDelay = Math.min(retryDelay * 2, MAX_RETRY_DELAY);
+};
+
+// Call onTimeout unless the stream opens (clearOpenTimer) within OPEN_TIMEOUT
+const startOpenTimer = (onTimeout) => {
+    clearTimeout(openTimer);
+    openTimer = setTimeout(() => {
+        openTimer = null;
+        onTimeout();
+    }, OPEN_TIMEOUT);
+};
+
+const clearOpenTimer = () => {
+    clearTimeout(openTimer);
+    openTimer = null;
+};
+
+const connectSse = (token) => {
+    let opened = false;
+    const source = new EventSource(`${API_URL}/api/realtime/events/?token=${encodeURIComponent(token)}`);
+    const fail = () => {
+        // Reconnect ourselves so an expired token is replaced by the current one
+        clearOpenTimer();
+        source.close();
+        if (eventSource === source) eventSource = null;
+        if (!opened) mode = 'poll';
+        scheduleReconnect();
+    };
+    eventSource = source;
+    source.onopen = () => {
+        opened = true;
+        clearOpenTimer();
+    };
+    source.onmessage = (e) => handleFrame(e.data);
+    source.onerror = fail;
+    startOpenTimer(fail);
+};
+
+// Long-poll /api/sync/ until the last listener leaves; changes become events
+const poll = async () => {
+    polling = true;
+    try {
+        while (listeners.size > 0) {
+            const token = localStorage.getItem('access_token');
+            if (!token) break;
+            const query = syncToken ? `?since=${encodeURIComponent(syncToken)}` : '';
+            const response = await fetch(`${API_URL}/api/sync/${query}`, {
+                headers: { Authorization: `Bearer ${token}` }
+            });
+            if (!response.ok) throw new Error(`Sync failed: ${response.status}`);
+            const data = await response.json();
+            const first = syncToken === null;
+            syncToken = data.token;
+            retryDelay = 1000;
+            if (data.reset) {
+                // Nothing to catch up on at first start; after a transport switch or expiry, refetch
+                if (!first || connectedBefore) listeners.forEach(listener => listener({ type: 'resync' }));
+                connectedBefore = true;
+                continue;
+            }
+            data.messages.forEach(message => dispatch({ type: 'message', data: message }));
+            data.group_messages.forEach(message => dispatch({ type: 'group_message', data: message }));
+            data.notifications.forEach(notification => dispatch({ type: 'notification', data: notification }));
+        }
+    } catch (error) {
+        console.error('Realtime sync failed', error);
+        polling = false;
+        scheduleReconnect();
+        return;
+    }
+    polling = false;
+};
+
+const connectWebSocket = (token) => {
+    let opened = false;
+    socket = new WebSocket(`${WS_URL}/ws/events/?token=${encodeURIComponent(token)}`);
+    socket.onopen = () => {
+        opened = true;
+        clearOpenTimer();
+    };
+    socket.onmessage = (e) => handleFrame(e.data);
+    socket.onclose = () => {
+        clearOpenTimer();
+        socket = null;
+        // Never opened (e.g. blocked by a proxy): fall back to SSE
+        if (!opened) mode = 'sse';
+        scheduleReconnect();
+    };
+    // Closing a socket that is still connecting fires onclose above
+    const connecting = socket;
+    startOpenTimer(() => connecting.close());
+};
+
+const connect = () => {
+    const token = localStorage.getItem('access_token');
+    if (!token || socket || eventSource || polling) return;
+    if (mode === 'poll') {
+        poll();
+    } else if (mode === 'sse') {
+        connectSse(token);
+    } else {
+        connectWebSocket(token);
+    }
+};
+
+const disconnect = () => {
+    clearTimeout(retryTimer);
+    retryTimer = null;
+    clearOpenTimer();
+    if (socket) {
+        socket.onclose = null;
+        socket.close();
+        socket = null;
+    }
+    if (eventSource) {
+        eventSource.close();
+        eventSource = null;
+    }
+    connectedBefore = false;
+    syncToken = null;
+};
+
+/**
+ * Call `listener` with every pushed event; returns the unsubscribe function.
+ * The connection is opened with the first listener and closed with the last.
+ */
+export const subscribeRealtime = (listener) => {
+    listeners.add(listener);
+    connect();
+    return () => {
+        listeners.delete(listener);
+        if (listeners.size === 0) disconnect();
+    };
+};
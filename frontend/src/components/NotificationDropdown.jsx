@@ -1,6 +1,7 @@
 import React, { useState, useEffect, useRef } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { fetchNotifications, markNotificationRead, markAllRead } from '../api/notifications';
+import { subscribeRealtime } from '../api/realtime';
 import { useAuth } from '../auth/AuthContext';
 import './NotificationDropdown.css';
 import { Bell, MessageCircle, Heart, Calendar, CheckCircle2, X } from '../ui/icons';
@@ -14,13 +15,19 @@ const NotificationDropdown = () => {
     const [loading, setLoading] = useState(false);
     const dropdownRef = useRef(null);
 
-    // Initial load and polling
+    // Initial load, then new notifications arrive through subscribeRealtime
+    // (pushed under ASGI, long-polled from /api/sync/ otherwise)
     useEffect(() => {
         if (user) {
             loadNotifications();
-            // Optional: Poll every 30s
-            const interval = setInterval(loadNotifications, 30000);
-            return () => clearInterval(interval);
+            return subscribeRealtime(event => {
+                if (event.type === 'notification') {
+                    setNotifications(prev => [event.data, ...prev.filter(n => n.id !== event.data.id)].slice(0, 5));
+                    setUnreadCount(prev => prev + 1);
+                } else if (event.type === 'resync') {
+                    loadNotifications();
+                }
+            });
         }
     }, [user]);
 
@@ -1,6 +1,5 @@
 import React, { useState, useEffect } from 'react';
 import { recommendationService } from '../../api/recommendations';
-import { fetchAnimalImages } from '../../api/animals';
 import ListingCard from '../ListingCard';
 import './RecommendedListings.css';
 
@@ -17,17 +16,11 @@ const RecommendedListings = () => {
                 const recItems = data.items || [];
                 setItems(recItems);
 
-                // Fetch images for each listing
+                // Primary image comes inline with each listing (thumbnail_url)
                 const imageMap = {};
                 for (const item of recItems) {
-                    try {
-                        const imgs = await fetchAnimalImages(item.listing.id);
-                        const primary = imgs.find(img => img.is_primary) || imgs[0];
-                        if (primary) {
-                            imageMap[item.listing.id] = primary;
-                        }
-                    } catch (e) {
-                        // Ignore image fetch errors
+                    if (item.listing.thumbnail_url) {
+                        imageMap[item.listing.id] = { image_url: item.listing.thumbnail_url };
                     }
                 }
                 setImages(imageMap);
@@ -2,6 +2,7 @@ import React, { useState, useEffect, useRef } from 'react';
 import { useNavigate, useLocation } from 'react-router-dom';
 import { useAuth } from '../../auth/AuthContext';
 import { fetchInbox, fetchConversationMessages, fetchGroupMessages, sendMessage, sendGroupMessage, markAllRead, markGroupAllRead } from '../../api/messages';
+import { subscribeRealtime } from '../../api/realtime';
 import { MessageCircle, Maximize2, X, ArrowLeft, Send } from '../../ui/icons';
 import './MessagesWidget.css';
 
@@ -18,6 +19,7 @@ const MessagesWidget = () => {
     const [sending, setSending] = useState(false);
     const widgetRef = useRef(null);
     const messagesEndRef = useRef(null);
+    const selectedRef = useRef(null);
 
     // Calculate total unread count
     const totalUnread = conversations.reduce((sum, conv) => sum + (conv.unread_count || 0), 0);
@@ -29,6 +31,38 @@ const MessagesWidget = () => {
         }
     }, [isOpen]);
 
+    useEffect(() => {
+        selectedRef.current = selectedConversation;
+    }, [selectedConversation]);
+
+    // Pushed messages go to the open thread and the loaded conversation list
+    useEffect(() => {
+        if (!user) return undefined;
+        return subscribeRealtime(event => {
+            if (event.type !== 'message' && event.type !== 'group_message') return;
+            const message = event.data;
+            const type = event.type === 'group_message' ? 'GROUP' : 'DIRECT';
+            const current = selectedRef.current;
+            const isOpen = current && current.type === type && current.id === message.conversation;
+            const isMine = message.sender === user.id;
+            if (isOpen) {
+                setMessages(prev => (prev.some(m => m.id === message.id) ? prev : [...prev, message]));
+            }
+            setConversations(prev =>
+                prev.map(conv =>
+                    conv.type === type && conv.id === message.conversation
+                        ? {
+                            ...conv,
+                            last_message: { ...message },
+                            updated_at: message.created_at,
+                            unread_count: isOpen || isMine ? conv.unread_count : (conv.unread_count || 0) + 1
+                        }
+                        : conv
+                )
+            );
+        });
+    }, [user]);
+
     // Scroll to bottom when messages change
     useEffect(() => {
         scrollToBottom();
@@ -55,8 +89,8 @@ const MessagesWidget = () => {
     const loadConversations = async () => {
         setLoading(true);
         try {
-            const data = await fetchInbox(); // Use unified inbox
-            setConversations(data);
+            const data = await fetchInbox(); // Use unified inbox (most recent page)
+            setConversations(data.results);
         } catch (error) {
             console.error('Failed to load conversations:', error);
         } finally {
@@ -75,7 +109,7 @@ const MessagesWidget = () => {
                 data = await fetchConversationMessages(conversation.id);
                 await markAllRead(conversation.id);
             }
-            setMessages(data);
+            setMessages(data.results);
 
             // Update local unread count
             setConversations(prev =>
@@ -124,7 +158,7 @@ const MessagesWidget = () => {
             } else {
                 newMessage = await sendMessage(selectedConversation.id, messageInput.trim());
             }
-            setMessages(prev => [...prev, newMessage]);
+            setMessages(prev => (prev.some(m => m.id === newMessage.id) ? prev : [...prev, newMessage]));
             setMessageInput('');
 
             // Update last message in conversations list
@@ -2,7 +2,7 @@ import { useState, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { useAuth } from '../auth/AuthContext';
 import { useFavorites } from '../context/FavoritesContext';
-import { fetchAnimals, fetchAnimalImages } from '../api/animals';
+import { fetchAnimals } from '../api/animals';
 import NotificationDropdown from '../components/NotificationDropdown';
 import './AnimalsList.css';
 import { MessageCircle, Bell, User, Calendar } from '../ui/icons';
@@ -33,21 +33,10 @@ const AnimalsList = () => {
             setCurrentPage(page);
             setTotalPages(Math.ceil(paginatedData.count / 10));  // Backend page_size = 10
 
-            // Fetch images for all listings
-            const imagePromises = data.map(listing =>
-                fetchAnimalImages(listing.id)
-                    .then(images => ({ listingId: listing.id, images }))
-                    .catch(() => ({ listingId: listing.id, images: [] }))
-            );
-
-            const allImages = await Promise.all(imagePromises);
-
-            // Build images map
+            // Primary image comes inline with each listing (thumbnail_url)
             const imagesMap = {};
-            allImages.forEach(({ listingId, images }) => {
-                // Find primary image or use first image
-                const primaryImage = images.find(img => img.is_primary);
-                imagesMap[listingId] = primaryImage || images[0] || null;
+            data.forEach(listing => {
+                imagesMap[listing.id] = listing.thumbnail_url ? { image_url: listing.thumbnail_url } : null;
             });
 
             setListingImages(imagesMap);
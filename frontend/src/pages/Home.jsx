@@ -4,7 +4,7 @@ import FeaturedSection from '../components/home/FeaturedSection';
 import HomeSidebar from '../components/home/HomeSidebar';
 import RecommendedListings from '../components/home/RecommendedListings';
 import SEO from '../components/SEO';
-import { fetchAnimals, fetchAnimalImages } from '../api/animals';
+import { fetchAnimals } from '../api/animals';
 import { useAuth } from '../auth/AuthContext';
 import './Home.css';
 
@@ -33,16 +33,10 @@ const Home = () => {
                 const data = await fetchAnimals({ page: 1, ...filters });
                 setFeaturedListings(data.results || []);
 
-                // Fetch images
+                // Primary image comes inline with each listing (thumbnail_url)
                 const imageMap = {};
                 for (const listing of (data.results || [])) {
-                    try {
-                        const imgs = await fetchAnimalImages(listing.id);
-                        const primary = imgs.find(img => img.is_primary) || imgs[0];
-                        if (primary) imageMap[listing.id] = primary;
-                    } catch (e) {
-                        // Ignore individual image errors
-                    }
+                    if (listing.thumbnail_url) imageMap[listing.id] = { image_url: listing.thumbnail_url };
                 }
                 setImages(imageMap);
             } catch (error) {
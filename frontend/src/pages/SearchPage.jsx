@@ -3,7 +3,7 @@ import { useSearchParams } from 'react-router-dom';
 // Navbar removed - using global Header
 import SearchFilters from '../components/search/SearchFilters';
 import ListingCard from '../components/ListingCard';
-import { fetchAnimals, fetchAnimalImages } from '../api/animals';
+import { fetchAnimals } from '../api/animals';
 import './SearchPage.css';
 
 const SearchPage = () => {
@@ -57,16 +57,10 @@ const SearchPage = () => {
             setCurrentPage(parseInt(page));
             setTotalPages(Math.ceil(data.count / 10));
 
-            // Fetch images
+            // Primary image comes inline with each listing (thumbnail_url)
             const imageMap = {};
             for (const listing of results) {
-                try {
-                    const imgs = await fetchAnimalImages(listing.id);
-                    const primary = imgs.find(img => img.is_primary) || imgs[0];
-                    if (primary) imageMap[listing.id] = primary;
-                } catch (e) {
-                    // Ignore
-                }
+                if (listing.thumbnail_url) imageMap[listing.id] = { image_url: listing.thumbnail_url };
             }
             setImages(imageMap);
 
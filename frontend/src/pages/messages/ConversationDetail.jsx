@@ -32,7 +32,7 @@ const ConversationDetail = () => {
 
         try {
             const data = await fetchConversationMessages(conversationId);
-            setMessages(data);
+            setMessages(data.results);
         } catch (err) {
             console.error('Failed to load messages:', err);
             setError('Mesajlar yüklenemedi');
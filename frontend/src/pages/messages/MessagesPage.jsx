@@ -10,6 +10,7 @@ import {
   markAllRead,
   markGroupAllRead
 } from '../../api/messages';
+import { subscribeRealtime } from '../../api/realtime';
 import { Send, User as UserIcon, Users as UsersIcon, ArrowLeft } from '../../ui/icons';
 import './MessagesPage.css';
 
@@ -18,13 +19,19 @@ const MessagesPage = () => {
   const [searchParams, setSearchParams] = useSearchParams();
   const navigate = useNavigate();
   const [conversations, setConversations] = useState([]);
+  const [nextInboxUrl, setNextInboxUrl] = useState(null);
   const [selectedConversation, setSelectedConversation] = useState(null);
   const [messages, setMessages] = useState([]);
+  const [hasOlderMessages, setHasOlderMessages] = useState(false);
+  const [olderLoading, setOlderLoading] = useState(false);
   const [messageInput, setMessageInput] = useState('');
   const [loading, setLoading] = useState(false);
   const [messagesLoading, setMessagesLoading] = useState(false);
   const [sending, setSending] = useState(false);
   const messagesEndRef = useRef(null);
+  const keepScrollRef = useRef(false);
+  const selectedRef = useRef(null);
+  const conversationsRef = useRef([]);
   const [isMobileView, setIsMobileView] = useState(window.innerWidth < 768);
 
   // Handle window resize for mobile detection
@@ -36,11 +43,18 @@ const MessagesPage = () => {
     return () => window.removeEventListener('resize', handleResize);
   }, []);
 
-  // Load conversations on mount
+  // Load conversations on mount; new messages arrive by push
   useEffect(() => {
     loadConversations();
+    return subscribeRealtime(handleRealtimeEvent);
   }, []);
 
+  // Current values for the push handler
+  useEffect(() => {
+    selectedRef.current = selectedConversation;
+    conversationsRef.current = conversations;
+  }, [selectedConversation, conversations]);
+
   // Handle URL params
   useEffect(() => {
     if (conversations.length > 0) {
@@ -67,8 +81,12 @@ const MessagesPage = () => {
     }
   }, [searchParams, conversations]);
 
-  // Scroll to bottom when messages change
+  // Scroll to bottom when messages change (not when older ones are prepended)
   useEffect(() => {
+    if (keepScrollRef.current) {
+      keepScrollRef.current = false;
+      return;
+    }
     scrollToBottom();
   }, [messages]);
 
@@ -76,11 +94,13 @@ const MessagesPage = () => {
     messagesEndRef.current?.scrollIntoView({ behavior: 'smooth' });
   };
 
-  const loadConversations = async () => {
+  // The inbox is paginated by most recent activity; `more` appends the next page
+  const loadConversations = async (more = false) => {
     setLoading(true);
     try {
-      const data = await fetchInbox();
-      setConversations(data);
+      const data = await fetchInbox(more ? nextInboxUrl : null);
+      setConversations(prev => (more ? [...prev, ...data.results] : data.results));
+      setNextInboxUrl(data.next);
     } catch (error) {
       console.error('Failed to load conversations:', error);
     } finally {
@@ -99,7 +119,8 @@ const MessagesPage = () => {
         data = await fetchConversationMessages(conversation.id);
         await markAllRead(conversation.id);
       }
-      setMessages(data);
+      setMessages(data.results);
+      setHasOlderMessages(Boolean(data.previous));
 
       // Update local unread count
       setConversations(prev =>
@@ -116,6 +137,75 @@ const MessagesPage = () => {
     }
   };
 
+  // History is paginated newest first; prepend the page before the oldest loaded message
+  const loadOlderMessages = async () => {
+    if (!selectedConversation || messages.length === 0) return;
+    setOlderLoading(true);
+    try {
+      const cursor = { before_id: messages[0].id };
+      const data = selectedConversation.type === 'GROUP'
+        ? await fetchGroupMessages(selectedConversation.id, cursor)
+        : await fetchConversationMessages(selectedConversation.id, cursor);
+      keepScrollRef.current = true;
+      setMessages(prev => [...data.results, ...prev]);
+      setHasOlderMessages(Boolean(data.previous));
+    } catch (error) {
+      console.error('Failed to load older messages:', error);
+    } finally {
+      setOlderLoading(false);
+    }
+  };
+
+  // Pushed messages may race the response of our own send; keep one copy
+  const appendMessage = (message) => {
+    setMessages(prev => (prev.some(m => m.id === message.id) ? prev : [...prev, message]));
+  };
+
+  const handleRealtimeEvent = (event) => {
+    if (event.type === 'resync') {
+      loadConversations();
+      if (selectedRef.current) loadMessages(selectedRef.current);
+      return;
+    }
+    if (event.type !== 'message' && event.type !== 'group_message') return;
+
+    const message = event.data;
+    const type = event.type === 'group_message' ? 'GROUP' : 'DIRECT';
+    const senderId = typeof message.sender === 'object' ? message.sender.id : message.sender;
+    const isMine = senderId === user?.id;
+    const current = selectedRef.current;
+    const isOpen = current && current.type === type && current.id === message.conversation;
+
+    if (isOpen) {
+      appendMessage(message);
+      if (!isMine) {
+        (type === 'GROUP' ? markGroupAllRead : markAllRead)(message.conversation).catch(console.error);
+      }
+    }
+
+    if (!conversationsRef.current.some(c => c.type === type && c.id === message.conversation)) {
+      // A conversation we haven't loaded (e.g. a new one): refetch the first page
+      loadConversations();
+      return;
+    }
+    setConversations(prev => {
+      const conv = prev.find(c => c.type === type && c.id === message.conversation);
+      if (!conv) return prev;
+      const updated = {
+        ...conv,
+        last_message: {
+          content: message.content,
+          sender_id: senderId,
+          sender_username: message.sender_username,
+          created_at: message.created_at
+        },
+        updated_at: message.created_at,
+        unread_count: isOpen || isMine ? conv.unread_count : (conv.unread_count || 0) + 1
+      };
+      return [updated, ...prev.filter(c => c !== conv)];
+    });
+  };
+
   const handleConversationSelect = (conversation, updateUrl = true) => {
     setSelectedConversation(conversation);
     loadMessages(conversation);
@@ -134,6 +224,7 @@ const MessagesPage = () => {
   const handleBackToList = () => {
     setSelectedConversation(null);
     setMessages([]);
+    setHasOlderMessages(false);
     setSearchParams({});
   };
 
@@ -150,7 +241,7 @@ const MessagesPage = () => {
         newMessage = await sendMessage(selectedConversation.id, messageInput.trim());
       }
 
-      setMessages(prev => [...prev, newMessage]);
+      appendMessage(newMessage);
       setMessageInput('');
 
       // Update last message in conversations list
@@ -239,6 +330,16 @@ const MessagesPage = () => {
                 </div>
               ))
             )}
+            {nextInboxUrl && (
+              <button
+                type="button"
+                className="messages-sidebar__more"
+                onClick={() => loadConversations(true)}
+                disabled={loading}
+              >
+                {loading ? 'Yükleniyor...' : 'Daha fazla göster'}
+              </button>
+            )}
           </div>
         </div>
 
@@ -269,7 +370,18 @@ const MessagesPage = () => {
                 {messagesLoading ? (
                   <div className="messages-main__loading">Yükleniyor...</div>
                 ) : (
-                  messages.map(msg => {
+                  <>
+                  {hasOlderMessages && (
+                    <button
+                      type="button"
+                      className="messages-main__older"
+                      onClick={loadOlderMessages}
+                      disabled={olderLoading}
+                    >
+                      {olderLoading ? 'Yükleniyor...' : 'Önceki mesajlar'}
+                    </button>
+                  )}
+                  {messages.map(msg => {
                     const isMine = (msg.sender === user.id) || (msg.sender?.id === user.id) || (selectedConversation.type === 'DIRECT' && !msg.sender_username); // simplistic check
                     // Adjust sender check based on API response structure
                     // For unified structure, direct messages might have sender as ID, group as Object or ID.
@@ -310,7 +422,8 @@ const MessagesPage = () => {
                         </div>
                       </div>
                     );
-                  })
+                  })}
+                  </>
                 )}
                 <div ref={messagesEndRef} />
               </div>